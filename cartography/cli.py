@@ -3,12 +3,14 @@ import getpass
 import logging
 import os
 import sys
+import time
 from typing import Optional
 
 import cartography.config
 import cartography.sync
 import cartography.util
 from cartography.intel.aws.util.common import parse_and_validate_aws_requested_syncs
+from cartography.intel.gcp.util.enabled_services_cache import EnabledServicesCache
 from cartography.intel.semgrep.dependencies import parse_and_validate_semgrep_ecosystems
 
 
@@ -211,6 +213,16 @@ class CLI:
                 'The name of environment variable containing Azure Client Secret for Service Principal Authentication.'
             ),
         )
+        parser.add_argument(
+            '--azure-subscription-workers',
+            type=int,
+            default=1,
+            help=(
+                'The number of Azure subscriptions synced concurrently. API calls of different subscriptions run in '
+                'parallel while the data of each subscription is still loaded in order. Defaults to 1, which syncs '
+                'one subscription at a time.'
+            ),
+        )
         parser.add_argument(
             '--aws-requested-syncs',
             type=str,
@@ -270,6 +282,46 @@ class CLI:
                 'Required if you are using the GitHub intel module. Ignored otherwise.'
             ),
         )
+        parser.add_argument(
+            '--github-org-workers',
+            type=int,
+            default=1,
+            help=(
+                'The number of GitHub organizations synced concurrently. GraphQL requests made with the same token are '
+                'paced to stay within its rate limit. Defaults to 1, which syncs one organization at a time.'
+            ),
+        )
+        parser.add_argument(
+            '--github-repo-state-path',
+            type=str,
+            default=None,
+            help=(
+                'The path to a SQLite file in which the newest updatedAt and pushedAt of the repos of each GitHub '
+                'organization are kept between syncs. If set, only the repos updated or pushed to since the previous '
+                'sync are fetched, and all repos are only fetched on the first sync and every '
+                '--github-full-sync-interval seconds.'
+            ),
+        )
+        parser.add_argument(
+            '--github-full-sync-interval',
+            type=int,
+            default=86400,
+            help=(
+                'The number of seconds between two full syncs of the repos of a GitHub organization when '
+                '--github-repo-state-path is set. Deleted repos, and changes to collaborators that do not update a '
+                'repo, are only picked up by full syncs. Defaults to 86400 (one day).'
+            ),
+        )
+        parser.add_argument(
+            '--github-manifest-cache-path',
+            type=str,
+            default=None,
+            help=(
+                'The path to a SQLite file in which the requirements parsed from the requirements.txt and setup.cfg '
+                'files of GitHub repos are kept between syncs, by git object ID. If set, files that did not change '
+                'since a previous sync are neither downloaded nor parsed again.'
+            ),
+        )
         parser.add_argument(
             '--digitalocean-token-env-var',
             type=str,
@@ -288,6 +340,104 @@ class CLI:
                 'If omitted the default permission relationships will be created'
             ),
         )
+        parser.add_argument(
+            '--permission-relationships-workers',
+            type=int,
+            default=1,
+            help=(
+                'The number of worker processes used to evaluate AWS permission relationships. '
+                'Defaults to 1, which evaluates them in the main process.'
+            ),
+        )
+        parser.add_argument(
+            '--aws-s3-parse-workers',
+            type=int,
+            default=1,
+            help=(
+                'The number of worker processes used to parse S3 bucket policies, ACLs and public access blocks. '
+                'Defaults to 1, which parses them in the main process.'
+            ),
+        )
+        parser.add_argument(
+            '--aws-ecr-incremental-sync',
+            action='store_true',
+            help=(
+                'Only merge ECR images pushed since the previous sync into the graph. Repositories whose previously '
+                'synced images are unchanged have those images refreshed in bulk instead of merged again.'
+            ),
+        )
+        parser.add_argument(
+            '--aws-metadata-cache-path',
+            type=str,
+            default=None,
+            help=(
+                'The path to a SQLite file in which metadata of rarely changing AWS resources, such as available AMIs, '
+                'is cached across syncs so that it is not described again. If omitted no cache is used.'
+            ),
+        )
+        parser.add_argument(
+            '--aws-metadata-cache-max-entries',
+            type=int,
+            default=100000,
+            help=(
+                'The maximum number of entries kept in the AWS metadata cache. The least recently used entries are '
+                'evicted first. Ignored if --aws-metadata-cache-path is not set.'
+            ),
+        )
+        parser.add_argument(
+            '--aws-metadata-cache-ttl',
+            type=int,
+            default=86400,
+            help=(
+                'The number of seconds for which entries of the AWS metadata cache are used before the resources are '
+                'described again. Defaults to 86400 (one day). Ignored if --aws-metadata-cache-path is not set.'
+            ),
+        )
+        parser.add_argument(
+            '--gcp-project-workers',
+            type=int,
+            default=1,
+            help=(
+                'The number of GCP projects synced concurrently. API calls of different projects run in parallel '
+                'while the data of each project is still loaded in order. Defaults to 1, which syncs one project '
+                'at a time.'
+            ),
+        )
+        parser.add_argument(
+            '--gcp-serviceusage-cache-path',
+            type=str,
+            default=None,
+            help=(
+                'The path to a SQLite file in which the services enabled on each GCP project are cached across syncs, '
+                'so that serviceusage is not called for every project on every sync. If omitted no cache is used.'
+            ),
+        )
+        parser.add_argument(
+            '--gcp-serviceusage-cache-ttl',
+            type=int,
+            default=86400,
+            help=(
+                'The number of seconds for which the enabled services of a GCP project are cached. Entries older than '
+                'half of this are refreshed in the background. Defaults to 86400 (one day).'
+            ),
+        )
+        parser.add_argument(
+            '--gcp-serviceusage-cache-inspect',
+            action='store_true',
+            help=(
+                'Log the projects in the GCP enabled services cache at --gcp-serviceusage-cache-path, with the age '
+                'and services of each entry, then exit without syncing.'
+            ),
+        )
+        parser.add_argument(
+            '--gcp-serviceusage-cache-invalidate',
+            type=str,
+            default=None,
+            help=(
+                'Comma-separated list of GCP project IDs to remove from the enabled services cache at '
+                '--gcp-serviceusage-cache-path, or "all" to clear it, then exit without syncing.'
+            ),
+        )
         parser.add_argument(
             '--jamf-base-uri',
             type=str,
@@ -341,6 +491,43 @@ class CLI:
                 'The path to kubeconfig file specifying context to access K8s cluster(s).'
             ),
         )
+        parser.add_argument(
+            '--k8s-cluster-workers',
+            type=int,
+            default=1,
+            help=(
+                'The number of K8s clusters synced concurrently. A cluster that fails to sync does not stop the '
+                'others. Defaults to 1, which syncs one cluster at a time.'
+            ),
+        )
+        parser.add_argument(
+            '--k8s-cluster-timeout',
+            type=int,
+            default=None,
+            help=(
+                'The maximum number of seconds spent syncing a single K8s cluster. A cluster that takes longer is '
+                'reported as failed. Defaults to no timeout.'
+            ),
+        )
+        parser.add_argument(
+            '--k8s-watch-state-path',
+            type=str,
+            default=None,
+            help=(
+                'The path to a SQLite file in which the resourceVersion of each K8s cluster is kept between syncs. '
+                'If set, pods are synced incrementally by watching the changes made since the previous sync, and are '
+                'only listed in full on the first sync or when that resourceVersion has expired.'
+            ),
+        )
+        parser.add_argument(
+            '--k8s-watch-timeout',
+            type=int,
+            default=10,
+            help=(
+                'The number of seconds for which the changes of each K8s cluster are watched in incremental mode. '
+                'Defaults to 10.'
+            ),
+        )
         parser.add_argument(
             '--nist-cve-url',
             type=str,
@@ -604,6 +791,14 @@ class CLI:
             # No need to store the returned value; we're using this for input validation.
             parse_and_validate_aws_requested_syncs(config.aws_requested_syncs)
 
+        # GCP config
+        if config.gcp_serviceusage_cache_inspect or config.gcp_serviceusage_cache_invalidate:
+            if not config.gcp_serviceusage_cache_path:
+                logger.error("--gcp-serviceusage-cache-path is required to inspect or invalidate the cache.")
+                return cartography.util.STATUS_FAILURE
+            _manage_gcp_enabled_services_cache(config)
+            return cartography.util.STATUS_SUCCESS
+
         # Azure config
         if config.azure_sp_auth and config.azure_client_secret_env_var:
             logger.debug(
@@ -784,6 +979,27 @@ class CLI:
             return cartography.util.STATUS_KEYBOARD_INTERRUPT
 
 
+def _manage_gcp_enabled_services_cache(config: argparse.Namespace) -> None:
+    """
+    Invalidates and/or logs the entries of the GCP enabled services cache, as requested on the command line.
+    """
+    cache = EnabledServicesCache(config.gcp_serviceusage_cache_path, ttl=config.gcp_serviceusage_cache_ttl)
+    try:
+        if config.gcp_serviceusage_cache_invalidate:
+            invalidate = config.gcp_serviceusage_cache_invalidate
+            project_ids = None if invalidate == 'all' else [p.strip() for p in invalidate.split(',') if p.strip()]
+            removed = cache.invalidate(project_ids)
+            logger.info(f"Removed {removed} projects from the GCP enabled services cache.")
+        if config.gcp_serviceusage_cache_inspect:
+            now = time.time()
+            for project_id, services, fetched_at in cache.entries():
+                age = int(now - fetched_at)
+                state = 'fresh' if age < cache.ttl else 'expired'
+                logger.info(f"{project_id}\t{age}s\t{state}\t{','.join(services)}")
+    finally:
+        cache.close()
+
+
 def main(argv=None):
     """
     Entrypoint for the default cartography command line interface.
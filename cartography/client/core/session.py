@@ -0,0 +1,202 @@
+import logging
+import re
+import threading
+import time
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+import neo4j
+
+logger = logging.getLogger(__name__)
+
+ROW_VARIABLE = 'coalesced_row'
+ROWS_PARAMETER = 'coalesced_rows'
+
+# Clauses whose meaning changes once the rows of several calls share one query, or that produce results.
+_NOT_COALESCABLE = re.compile(r'\b(RETURN|CALL|UNION|LIMIT|SKIP|ORDER\s+BY|PERIODIC|YIELD)\b', re.IGNORECASE)
+# String literals are matched first so that nothing inside them gets rewritten.
+_TOKENS = re.compile(
+    r"""'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|\b(?:STARTS|ENDS)\s+WITH\b|\bWITH(?:\s+DISTINCT)?\b(?!\s*\*)|\$(\w+)""",
+    re.IGNORECASE,
+)
+
+
+def rewrite_as_unwind(query: str, parameters: List[str]) -> Optional[str]:
+    """
+    Rewrites a query that is run once per item into a query that is run once for a list of items passed as
+    $coalesced_rows. Each given parameter becomes a field of the row, and the row is carried through every WITH clause
+    so that it stays in scope. Returns None if the query cannot be rewritten safely.
+    """
+    if _NOT_COALESCABLE.search(query):
+        return None
+    parameter_names = set(parameters)
+
+    def _rewrite_token(match: 're.Match[str]') -> str:
+        token = match.group(0)
+        parameter = match.group(1)
+        if parameter is not None:
+            return f'{ROW_VARIABLE}.{parameter}' if parameter in parameter_names else token
+        if token[0] in '\'"' or re.match(r'(STARTS|ENDS)\s', token, re.IGNORECASE):
+            return token
+        return f'{token} {ROW_VARIABLE},'
+
+    return f'UNWIND ${ROWS_PARAMETER} AS {ROW_VARIABLE}\n' + _TOKENS.sub(_rewrite_token, query)
+
+
+class _BufferedResult:
+    """
+    Stands in for the result of a buffered call. Coalesced queries never return records.
+    """
+
+    def consume(self) -> None:
+        return None
+
+    def single(self) -> None:
+        return None
+
+    def data(self) -> List[Dict[str, Any]]:
+        return []
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter([])
+
+
+class CoalescingSession:
+    """
+    Wraps a neo4j.Session so that repeated `run()` calls with the same write query are buffered and sent as a single
+    `UNWIND` query, instead of one auto-commit transaction per call. Queries that cannot be rewritten (e.g. because they
+    RETURN something) and calls to any other session method first flush the buffered writes, so they observe every
+    write made before them.
+
+    Buffered queries are flushed in the order in which they were first run, once any of them holds `max_rows` rows,
+    on the first `run()` call made once the oldest buffered call is `max_delay` seconds old (there is no timer), or when
+    the session is flushed or closed. Leaving the `with` block because of an exception discards the buffered writes,
+    so that they cannot hide the original error. Writes of
+    different queries are therefore reordered relative to each other, which is fine for the usual load loops where
+    each query only depends on the queries run before it for the same item.
+
+    Example usage:
+        with CoalescingSession(neo4j_session) as session:
+            for droplet in droplets:
+                session.run(query, DropletId=droplet['id'], ...)
+    """
+
+    def __init__(self, session: neo4j.Session, max_rows: int = 1000, max_delay: float = 5.0):
+        self._session = session
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self._buffers: Dict[str, List[Dict[str, Any]]] = {}
+        self._rewritten: Dict[str, Optional[str]] = {}
+        self._oldest: Optional[float] = None
+
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs: Any) -> Any:
+        row = {**(parameters or {}), **kwargs}
+        rewritten = self._rewrite(query, row) if row else None
+        if rewritten is None:
+            self.flush()
+            return self._session.run(query, row)
+
+        self._buffers.setdefault(rewritten, []).append(row)
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        if len(self._buffers[rewritten]) >= self.max_rows or time.monotonic() - self._oldest >= self.max_delay:
+            self.flush()
+        return _BufferedResult()
+
+    def _rewrite(self, query: str, row: Dict[str, Any]) -> Optional[str]:
+        key = query + '\0' + ','.join(sorted(row))
+        if key not in self._rewritten:
+            self._rewritten[key] = rewrite_as_unwind(query, list(row))
+        return self._rewritten[key]
+
+    def flush(self) -> None:
+        """
+        Sends all buffered calls to the database, one transaction per query.
+        """
+        buffers, self._buffers, self._oldest = self._buffers, {}, None
+        for query, rows in buffers.items():
+            logger.debug(f"Writing {len(rows)} coalesced rows.")
+            self._session.write_transaction(_run_coalesced_tx, query, rows)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> 'CoalescingSession':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if exc_info[0] is not None:
+            if self._buffers:
+                logger.warning(
+                    f"Discarding {sum(len(rows) for rows in self._buffers.values())} coalesced rows after an error.",
+                )
+            self._buffers, self._oldest = {}, None
+            return
+        self.close()
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('__'):
+            raise AttributeError(name)
+        # Anything else (read_transaction, write_transaction, ...) must see the buffered writes first.
+        self.flush()
+        return getattr(self._session, name)
+
+
+def _run_coalesced_tx(tx: neo4j.Transaction, query: str, rows: List[Dict[str, Any]]) -> None:
+    tx.run(query, {ROWS_PARAMETER: rows}).consume()
+
+
+class _FetchedResult:
+    """
+    Holds the records and summary of a result that was fully fetched while the session was locked.
+    """
+
+    def __init__(self, records: List[neo4j.Record], summary: neo4j.ResultSummary):
+        self._records = records
+        self._summary = summary
+
+    def consume(self) -> neo4j.ResultSummary:
+        return self._summary
+
+    def single(self) -> Optional[neo4j.Record]:
+        return self._records[0] if self._records else None
+
+    def data(self) -> List[Dict[str, Any]]:
+        return [record.data() for record in self._records]
+
+    def __iter__(self) -> Iterator[neo4j.Record]:
+        return iter(self._records)
+
+
+class SerializedSession:
+    """
+    Wraps a neo4j.Session so that it can be shared by several threads. Calls are made one at a time, and the records of
+    `run()` are fetched before the session is handed to the next caller, so each thread sees its own writes in the
+    order in which it made them while the threads themselves are free to interleave.
+
+    Example usage:
+        session = SerializedSession(neo4j_session)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda project: sync_project(session, project), projects))
+    """
+
+    def __init__(self, session: neo4j.Session):
+        self._session = session
+        self._lock = threading.Lock()
+
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs: Any) -> _FetchedResult:
+        with self._lock:
+            result = self._session.run(query, parameters, **kwargs)
+            records = list(result)
+            return _FetchedResult(records, result.consume())
+
+    def read_transaction(self, transaction_function: Any, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            return self._session.read_transaction(transaction_function, *args, **kwargs)
+
+    def write_transaction(self, transaction_function: Any, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            return self._session.write_transaction(transaction_function, *args, **kwargs)
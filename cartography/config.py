@@ -41,6 +41,8 @@ class Config:
     :param azure_client_id: Client Id for connecting in a Service Principal Authentication approach. Optional.
     :type azure_client_secret: str
     :param azure_client_secret: Client Secret for connecting in a Service Principal Authentication approach. Optional.
+    :type azure_subscription_workers: int
+    :param azure_subscription_workers: Number of Azure subscriptions synced concurrently. Optional.
     :type aws_requested_syncs: str
     :param aws_requested_syncs: Comma-separated list of AWS resources to sync. Optional.
     :type analysis_job_directory: str
@@ -55,10 +57,37 @@ class Config:
     :param okta_saml_role_regex: The regex used to map okta groups to AWS roles. Optional.
     :type github_config: str
     :param github_config: Base64 encoded config object for GitHub ingestion. Optional.
+    :type github_org_workers: int
+    :param github_org_workers: Number of GitHub organizations synced concurrently. Optional.
+    :type github_repo_state_path: str
+    :param github_repo_state_path: Path to the SQLite file holding the state of incremental GitHub repo syncs. Optional.
+    :type github_full_sync_interval: int
+    :param github_full_sync_interval: Seconds between full syncs of the repos of a GitHub organization. Optional.
+    :type github_manifest_cache_path: str
+    :param github_manifest_cache_path: Path to the SQLite file caching requirements parsed from GitHub repos. Optional.
     :type digitalocean_token: str
     :param digitalocean_token: DigitalOcean access token. Optional.
     :type permission_relationships_file: str
     :param permission_relationships_file: File path for the resource permission relationships file. Optional.
+    :type permission_relationships_workers: int
+    :param permission_relationships_workers: Number of worker processes used to evaluate AWS permission relationships.
+        Optional.
+    :type aws_s3_parse_workers: int
+    :param aws_s3_parse_workers: Number of worker processes used to parse S3 bucket details. Optional.
+    :type aws_ecr_incremental_sync: bool
+    :param aws_ecr_incremental_sync: If True, only merge ECR images pushed since the previous sync. Optional.
+    :type aws_metadata_cache_path: str
+    :param aws_metadata_cache_path: Path of the SQLite file caching metadata of immutable AWS resources. Optional.
+    :type aws_metadata_cache_max_entries: int
+    :param aws_metadata_cache_max_entries: Maximum number of entries kept in the AWS metadata cache. Optional.
+    :type aws_metadata_cache_ttl: int
+    :param aws_metadata_cache_ttl: Seconds for which entries of the AWS metadata cache are used. Optional.
+    :type gcp_project_workers: int
+    :param gcp_project_workers: Number of GCP projects synced concurrently. Optional.
+    :type gcp_serviceusage_cache_path: str
+    :param gcp_serviceusage_cache_path: Path of the SQLite file caching the services enabled on GCP projects. Optional.
+    :type gcp_serviceusage_cache_ttl: int
+    :param gcp_serviceusage_cache_ttl: Seconds for which the enabled services of a GCP project are cached. Optional.
     :type jamf_base_uri: string
     :param jamf_base_uri: Jamf data provider base URI, e.g. https://example.com/JSSResource. Optional.
     :type jamf_user: string
@@ -79,6 +108,14 @@ class Config:
     :param statsd_port: If statsd_enabled is True, send metrics to this port on statsd_host. Optional.
     :type: k8s_kubeconfig: str
     :param k8s_kubeconfig: Path to kubeconfig file for kubernetes cluster(s). Optional
+    :type: k8s_cluster_workers: int
+    :param k8s_cluster_workers: Number of kubernetes clusters synced concurrently. Optional.
+    :type: k8s_cluster_timeout: int
+    :param k8s_cluster_timeout: Maximum number of seconds spent syncing a single kubernetes cluster. Optional.
+    :type: k8s_watch_state_path: str
+    :param k8s_watch_state_path: Path to the SQLite file holding the state of incremental kubernetes syncs. Optional.
+    :type: k8s_watch_timeout: int
+    :param k8s_watch_timeout: Seconds for which each kubernetes cluster is watched in incremental syncs. Optional.
     :type: pagerduty_api_key: str
     :param pagerduty_api_key: API authentication key for pagerduty. Optional.
     :type: pagerduty_request_timeout: int
@@ -133,6 +170,7 @@ class Config:
         azure_tenant_id=None,
         azure_client_id=None,
         azure_client_secret=None,
+        azure_subscription_workers=None,
         aws_requested_syncs=None,
         analysis_job_directory=None,
         oci_sync_all_profiles=None,
@@ -140,8 +178,21 @@ class Config:
         okta_api_key=None,
         okta_saml_role_regex=None,
         github_config=None,
+        github_org_workers=None,
+        github_repo_state_path=None,
+        github_full_sync_interval=None,
+        github_manifest_cache_path=None,
         digitalocean_token=None,
         permission_relationships_file=None,
+        permission_relationships_workers=None,
+        aws_s3_parse_workers=None,
+        aws_ecr_incremental_sync=False,
+        aws_metadata_cache_path=None,
+        aws_metadata_cache_max_entries=None,
+        aws_metadata_cache_ttl=None,
+        gcp_project_workers=None,
+        gcp_serviceusage_cache_path=None,
+        gcp_serviceusage_cache_ttl=None,
         jamf_base_uri=None,
         jamf_user=None,
         jamf_password=None,
@@ -149,6 +200,10 @@ class Config:
         kandji_tenant_id=None,
         kandji_token=None,
         k8s_kubeconfig=None,
+        k8s_cluster_workers=1,
+        k8s_cluster_timeout=None,
+        k8s_watch_state_path=None,
+        k8s_watch_timeout=10,
         statsd_enabled=False,
         statsd_prefix=None,
         statsd_host=None,
@@ -191,6 +246,7 @@ class Config:
         self.azure_tenant_id = azure_tenant_id
         self.azure_client_id = azure_client_id
         self.azure_client_secret = azure_client_secret
+        self.azure_subscription_workers = azure_subscription_workers
         self.aws_requested_syncs = aws_requested_syncs
         self.analysis_job_directory = analysis_job_directory
         self.oci_sync_all_profiles = oci_sync_all_profiles
@@ -198,8 +254,21 @@ class Config:
         self.okta_api_key = okta_api_key
         self.okta_saml_role_regex = okta_saml_role_regex
         self.github_config = github_config
+        self.github_org_workers = github_org_workers
+        self.github_repo_state_path = github_repo_state_path
+        self.github_full_sync_interval = github_full_sync_interval
+        self.github_manifest_cache_path = github_manifest_cache_path
         self.digitalocean_token = digitalocean_token
         self.permission_relationships_file = permission_relationships_file
+        self.permission_relationships_workers = permission_relationships_workers
+        self.aws_s3_parse_workers = aws_s3_parse_workers
+        self.aws_ecr_incremental_sync = aws_ecr_incremental_sync
+        self.aws_metadata_cache_path = aws_metadata_cache_path
+        self.aws_metadata_cache_max_entries = aws_metadata_cache_max_entries
+        self.aws_metadata_cache_ttl = aws_metadata_cache_ttl
+        self.gcp_project_workers = gcp_project_workers
+        self.gcp_serviceusage_cache_path = gcp_serviceusage_cache_path
+        self.gcp_serviceusage_cache_ttl = gcp_serviceusage_cache_ttl
         self.jamf_base_uri = jamf_base_uri
         self.jamf_user = jamf_user
         self.jamf_password = jamf_password
@@ -207,6 +276,10 @@ class Config:
         self.kandji_tenant_id = kandji_tenant_id
         self.kandji_token = kandji_token
         self.k8s_kubeconfig = k8s_kubeconfig
+        self.k8s_cluster_workers = k8s_cluster_workers
+        self.k8s_cluster_timeout = k8s_cluster_timeout
+        self.k8s_watch_state_path = k8s_watch_state_path
+        self.k8s_watch_timeout = k8s_watch_timeout
         self.statsd_enabled = statsd_enabled
         self.statsd_prefix = statsd_prefix
         self.statsd_host = statsd_host
@@ -257,6 +257,12 @@ def start_aws_ingestion(neo4j_session: neo4j.Session, config: Config) -> None:
     common_job_parameters = {
         "UPDATE_TAG": config.update_tag,
         "permission_relationships_file": config.permission_relationships_file,
+        "permission_relationships_workers": config.permission_relationships_workers,
+        "aws_s3_parse_workers": config.aws_s3_parse_workers,
+        "aws_ecr_incremental_sync": config.aws_ecr_incremental_sync,
+        "aws_metadata_cache_path": config.aws_metadata_cache_path,
+        "aws_metadata_cache_max_entries": config.aws_metadata_cache_max_entries,
+        "aws_metadata_cache_ttl": config.aws_metadata_cache_ttl,
     }
     try:
         boto3_session = boto3.Session()
@@ -2,6 +2,7 @@ import logging
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
 
 import boto3
 import neo4j
@@ -11,12 +12,18 @@ from cartography.client.core.tx import load
 from cartography.graph.job import GraphJob
 from cartography.intel.aws.ec2 import get_ec2_regions
 from cartography.intel.aws.ec2.util import get_botocore_config
+from cartography.intel.aws.util.metadata_cache import get_metadata_cache
+from cartography.intel.aws.util.metadata_cache import MetadataCache
 from cartography.models.aws.ec2.images import EC2ImageSchema
 from cartography.util import aws_handle_regions
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# Namespace of AMI descriptions in the metadata cache. Each account and region gets its own namespace, since an
+# account may only be allowed to describe some images.
+AMI_CACHE_NAMESPACE = 'ec2:image:{account_id}:{region}'
+
 
 @timeit
 def get_images_in_use(neo4j_session: neo4j.Session, region: str, current_aws_account_id: str) -> List[str]:
@@ -42,18 +49,39 @@ def get_images_in_use(neo4j_session: neo4j.Session, region: str, current_aws_acc
 
 @timeit
 @aws_handle_regions
-def get_images(boto3_session: boto3.session.Session, region: str, image_ids: List[str]) -> List[Dict]:
+def get_images(
+    boto3_session: boto3.session.Session,
+    region: str,
+    image_ids: List[str],
+    metadata_cache: Optional[MetadataCache] = None,
+    current_aws_account_id: str = '',
+) -> List[Dict]:
+    """
+    Returns the images owned by the account and the images with the given ids. If a metadata cache is given, the
+    given images are looked up there first and only the ones missing from it are described. Only available images are
+    cached, since pending images still change state.
+    """
+    cache_namespace = AMI_CACHE_NAMESPACE.format(account_id=current_aws_account_id, region=region)
     client = boto3_session.client('ec2', region_name=region, config=get_botocore_config())
     images = []
+    # Images served from the cache are not stored again, so that they still expire when they keep being looked up
+    cached_images: Dict[str, Dict] = {}
+    self_ids: List[str] = []
     try:
         self_images = client.describe_images(Owners=['self'])['Images']
         images.extend(self_images)
+        self_ids = [image['ImageId'] for image in self_images]
     except ClientError as e:
         logger.warning(f"Failed to retrieve private images for region - {region}. Error - {e}")
     try:
         if image_ids:
             image_ids = [image_id for image_id in image_ids if image_id is not None]
-            images_in_use = client.describe_images(ImageIds=image_ids)['Images']
+            cached_images = metadata_cache.get_many(cache_namespace, image_ids) if metadata_cache else {}
+            uncached_ids = [image_id for image_id in image_ids if image_id not in cached_images]
+            images_in_use = list(cached_images.values())
+            if uncached_ids:
+                described_images = client.describe_images(ImageIds=uncached_ids)['Images']
+                images_in_use.extend(described_images)
             # Ensure we're not adding duplicates
             _ids = [image["ImageId"] for image in images]
             for image in images_in_use:
@@ -78,6 +106,15 @@ def get_images(boto3_session: boto3.session.Session, region: str, image_ids: Lis
                             logger.warning(f"Image {id} could not be found at region - {other_region}. Error - {e}")
     except ClientError as e:
         logger.warning(f"Failed to retrieve public images for region - {region}. Error - {e}")
+    if metadata_cache and image_ids:
+        requested_ids = set(image_ids) - (set(cached_images) - set(self_ids))
+        metadata_cache.put_many(
+            cache_namespace,
+            {
+                image['ImageId']: image for image in images
+                if image['ImageId'] in requested_ids and image.get('State') == 'available'
+            },
+        )
     return images
 
 
@@ -113,9 +150,14 @@ def sync_ec2_images(
         neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, regions: List[str],
         current_aws_account_id: str, update_tag: int, common_job_parameters: Dict,
 ) -> None:
-    for region in regions:
-        logger.info("Syncing images for region '%s' in account '%s'.", region, current_aws_account_id)
-        images_in_use = get_images_in_use(neo4j_session, region, current_aws_account_id)
-        data = get_images(boto3_session, region, images_in_use)
-        load_images(neo4j_session, data, region, current_aws_account_id, update_tag)
+    metadata_cache = get_metadata_cache(common_job_parameters)
+    try:
+        for region in regions:
+            logger.info("Syncing images for region '%s' in account '%s'.", region, current_aws_account_id)
+            images_in_use = get_images_in_use(neo4j_session, region, current_aws_account_id)
+            data = get_images(boto3_session, region, images_in_use, metadata_cache, current_aws_account_id)
+            load_images(neo4j_session, data, region, current_aws_account_id, update_tag)
+    finally:
+        if metadata_cache:
+            metadata_cache.close()
     cleanup_images(neo4j_session, common_job_parameters)
@@ -2,11 +2,13 @@ import logging
 from string import Template
 from typing import Dict
 from typing import List
+from typing import Tuple
 
 import boto3
 import neo4j
 
 from .util import get_botocore_config
+from cartography.client.core.tx import load_graph_data
 from cartography.graph.job import GraphJob
 from cartography.models.aws.ec2.securitygroup_instance import EC2SecurityGroupInstanceSchema
 from cartography.util import aws_handle_regions
@@ -28,78 +30,77 @@ def get_ec2_security_group_data(boto3_session: boto3.session.Session, region: st
 
 
 @timeit
-def load_ec2_security_group_rule(neo4j_session: neo4j.Session, group: Dict, rule_type: str, update_tag: int) -> None:
+def transform_ec2_security_group_rules(data: List[Dict]) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """
+    Flatten the rules of the given security groups so that each kind can be written with one batched query.
+    :param data: The security groups as returned by describe_security_groups
+    :return: A tuple of (inbound rules, egress rules, ip range to rule pairs). Each rule carries the id of its group.
+    """
+    inbound_rules: List[Dict] = []
+    egress_rules: List[Dict] = []
+    ranges: List[Dict] = []
+    for group in data:
+        group_id = group["GroupId"]
+        for rule_type, rules in (("IpPermissions", inbound_rules), ("IpPermissionsEgress", egress_rules)):
+            for rule in group.get(rule_type) or []:
+                protocol = rule.get("IpProtocol", "all")
+                from_port = rule.get("FromPort")
+                to_port = rule.get("ToPort")
+                ruleid = f"{group_id}/{rule_type}/{from_port}{to_port}{protocol}"
+                rules.append({
+                    'RuleId': ruleid,
+                    'GroupId': group_id,
+                    'FromPort': from_port,
+                    'ToPort': to_port,
+                    'Protocol': protocol,
+                })
+                for ip_range in rule.get("IpRanges", []):
+                    ranges.append({'RangeId': ip_range["CidrIp"], 'RuleId': ruleid})
+    return inbound_rules, egress_rules, ranges
+
+
+@timeit
+def load_ec2_security_group_rules(
+    neo4j_session: neo4j.Session, rules: List[Dict], rule_label: str, update_tag: int,
+) -> None:
     INGEST_RULE_TEMPLATE = Template("""
-    MERGE (rule:$rule_label{ruleid: $RuleId})
-    ON CREATE SET rule :IpRule, rule.firstseen = timestamp(), rule.fromport = $FromPort, rule.toport = $ToPort,
-    rule.protocol = $Protocol
+    UNWIND $DictList as rule_data
+    MERGE (rule:$rule_label{ruleid: rule_data.RuleId})
+    ON CREATE SET rule :IpRule, rule.firstseen = timestamp(), rule.fromport = rule_data.FromPort,
+    rule.toport = rule_data.ToPort, rule.protocol = rule_data.Protocol
     SET rule.lastupdated = $update_tag
-    WITH rule
-    MATCH (group:EC2SecurityGroup{groupid: $GroupId})
-    MERGE (group)<-[r:MEMBER_OF_EC2_SECURITY_GROUP]-(rule)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $update_tag;
-    """)
-
-    ingest_rule_group_pair = """
-    MERGE (group:EC2SecurityGroup{id: $GroupId})
-    ON CREATE SET group.firstseen = timestamp(), group.groupid = $GroupId
+    WITH rule, rule_data
+    MERGE (group:EC2SecurityGroup{id: rule_data.GroupId})
+    ON CREATE SET group.firstseen = timestamp(), group.groupid = rule_data.GroupId
     SET group.lastupdated = $update_tag
-    WITH group
-    MATCH (inbound:IpRule{ruleid: $RuleId})
-    MERGE (inbound)-[r:MEMBER_OF_EC2_SECURITY_GROUP]->(group)
+    MERGE (rule)-[r:MEMBER_OF_EC2_SECURITY_GROUP]->(group)
     ON CREATE SET r.firstseen = timestamp()
     SET r.lastupdated = $update_tag
-    """
+    """)
+    # NOTE Cypher query syntax is incompatible with Python string formatting, so we have to do this awkward
+    # NOTE manual formatting instead.
+    load_graph_data(
+        neo4j_session,
+        INGEST_RULE_TEMPLATE.safe_substitute(rule_label=rule_label),
+        rules,
+        update_tag=update_tag,
+    )
+
 
+@timeit
+def load_ec2_security_group_ranges(neo4j_session: neo4j.Session, ranges: List[Dict], update_tag: int) -> None:
     ingest_range = """
-    MERGE (range:IpRange{id: $RangeId})
-    ON CREATE SET range.firstseen = timestamp(), range.range = $RangeId
+    UNWIND $DictList as range_data
+    MERGE (range:IpRange{id: range_data.RangeId})
+    ON CREATE SET range.firstseen = timestamp(), range.range = range_data.RangeId
     SET range.lastupdated = $update_tag
-    WITH range
-    MATCH (rule:IpRule{ruleid: $RuleId})
+    WITH range, range_data
+    MATCH (rule:IpRule{ruleid: range_data.RuleId})
     MERGE (rule)<-[r:MEMBER_OF_IP_RULE]-(range)
     ON CREATE SET r.firstseen = timestamp()
     SET r.lastupdated = $update_tag
     """
-
-    group_id = group["GroupId"]
-    rule_type_map = {"IpPermissions": "IpPermissionInbound", "IpPermissionsEgress": "IpPermissionEgress"}
-
-    if group.get(rule_type):
-        for rule in group[rule_type]:
-            protocol = rule.get("IpProtocol", "all")
-            from_port = rule.get("FromPort")
-            to_port = rule.get("ToPort")
-
-            ruleid = f"{group_id}/{rule_type}/{from_port}{to_port}{protocol}"
-            # NOTE Cypher query syntax is incompatible with Python string formatting, so we have to do this awkward
-            # NOTE manual formatting instead.
-            neo4j_session.run(
-                INGEST_RULE_TEMPLATE.safe_substitute(rule_label=rule_type_map[rule_type]),
-                RuleId=ruleid,
-                FromPort=from_port,
-                ToPort=to_port,
-                Protocol=protocol,
-                GroupId=group_id,
-                update_tag=update_tag,
-            )
-
-            neo4j_session.run(
-                ingest_rule_group_pair,
-                GroupId=group_id,
-                RuleId=ruleid,
-                update_tag=update_tag,
-            )
-
-            for ip_range in rule["IpRanges"]:
-                range_id = ip_range["CidrIp"]
-                neo4j_session.run(
-                    ingest_range,
-                    RangeId=range_id,
-                    RuleId=ruleid,
-                    update_tag=update_tag,
-                )
+    load_graph_data(neo4j_session, ingest_range, ranges, update_tag=update_tag)
 
 
 @timeit
@@ -108,37 +109,43 @@ def load_ec2_security_groupinfo(
     current_aws_account_id: str, update_tag: int,
 ) -> None:
     ingest_security_group = """
-    MERGE (group:EC2SecurityGroup{id: $GroupId})
-    ON CREATE SET group.firstseen = timestamp(), group.groupid = $GroupId
-    SET group.name = $GroupName, group.description = $Description, group.region = $Region,
+    UNWIND $DictList as group_data
+    MERGE (group:EC2SecurityGroup{id: group_data.GroupId})
+    ON CREATE SET group.firstseen = timestamp(), group.groupid = group_data.GroupId
+    SET group.name = group_data.GroupName, group.description = group_data.Description, group.region = $Region,
     group.lastupdated = $update_tag
-    WITH group
+    WITH group, group_data
     MATCH (aa:AWSAccount{id: $AWS_ACCOUNT_ID})
     MERGE (aa)-[r:RESOURCE]->(group)
     ON CREATE SET r.firstseen = timestamp()
     SET r.lastupdated = $update_tag
-    WITH group
-    MATCH (vpc:AWSVpc{id: $VpcId})
+    WITH group, group_data
+    MATCH (vpc:AWSVpc{id: group_data.VpcId})
     MERGE (vpc)-[rg:MEMBER_OF_EC2_SECURITY_GROUP]->(group)
     ON CREATE SET rg.firstseen = timestamp()
     """
 
-    for group in data:
-        group_id = group["GroupId"]
+    load_graph_data(
+        neo4j_session,
+        ingest_security_group,
+        [
+            {
+                'GroupId': group["GroupId"],
+                'GroupName': group.get("GroupName"),
+                'Description': group.get("Description"),
+                'VpcId': group.get("VpcId"),
+            }
+            for group in data
+        ],
+        Region=region,
+        AWS_ACCOUNT_ID=current_aws_account_id,
+        update_tag=update_tag,
+    )
 
-        neo4j_session.run(
-            ingest_security_group,
-            GroupId=group_id,
-            GroupName=group.get("GroupName"),
-            Description=group.get("Description"),
-            VpcId=group.get("VpcId", None),
-            Region=region,
-            AWS_ACCOUNT_ID=current_aws_account_id,
-            update_tag=update_tag,
-        )
-
-        load_ec2_security_group_rule(neo4j_session, group, "IpPermissions", update_tag)
-        load_ec2_security_group_rule(neo4j_session, group, "IpPermissionsEgress", update_tag)
+    inbound_rules, egress_rules, ranges = transform_ec2_security_group_rules(data)
+    load_ec2_security_group_rules(neo4j_session, inbound_rules, "IpPermissionInbound", update_tag)
+    load_ec2_security_group_rules(neo4j_session, egress_rules, "IpPermissionEgress", update_tag)
+    load_ec2_security_group_ranges(neo4j_session, ranges, update_tag)
 
 
 @timeit
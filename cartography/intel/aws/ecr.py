@@ -1,7 +1,10 @@
+import hashlib
+import json
 import logging
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
 
 import boto3
 import neo4j
@@ -40,6 +43,127 @@ def get_ecr_repository_images(boto3_session: boto3.session.Session, region: str,
     return ecr_repository_images
 
 
+@timeit
+@aws_handle_regions
+def get_ecr_repository_image_details(
+    boto3_session: boto3.session.Session, region: str, repository_name: str,
+) -> List[Dict]:
+    logger.debug("Getting ECR image details in repository '%s' for region '%s'.", repository_name, region)
+    client = boto3_session.client('ecr', region_name=region)
+    paginator = client.get_paginator('describe_images')
+    ecr_repository_image_details: List[Dict] = []
+    for page in paginator.paginate(repositoryName=repository_name):
+        ecr_repository_image_details.extend(page['imageDetails'])
+    return ecr_repository_image_details
+
+
+def transform_ecr_image_details(image_details: List[Dict]) -> List[Dict]:
+    """
+    Convert describe_images results to the shape returned by list_images (one entry per image tag, untagged images
+    have no imageTag), keeping the push time of each image as a UNIX timestamp.
+    """
+    repo_images = []
+    for detail in image_details:
+        pushed_at = detail['imagePushedAt'].timestamp() if detail.get('imagePushedAt') else 0.0
+        for tag in detail.get('imageTags') or [None]:
+            img = {'imageDigest': detail.get('imageDigest'), 'imagePushedAt': pushed_at}
+            if tag is not None:
+                img['imageTag'] = tag
+            repo_images.append(img)
+    return repo_images
+
+
+def get_ecr_images_watermark(repo_images: List[Dict]) -> Dict[str, Any]:
+    """
+    Returns the high-water mark of a repository's images: the latest push time, the number of distinct digests, and a
+    fingerprint of the (digest, tag) pairs pushed at or before that time.
+    """
+    pushed_at = max((img['imagePushedAt'] for img in repo_images), default=0.0)
+    return {
+        'image_pushed_at_watermark': pushed_at,
+        'image_digest_count': len({img['imageDigest'] for img in repo_images}),
+        'images_fingerprint': _get_ecr_images_fingerprint(repo_images),
+    }
+
+
+def _get_ecr_images_fingerprint(repo_images: List[Dict]) -> str:
+    pairs = sorted((img['imageDigest'] or '', img.get('imageTag') or '') for img in repo_images)
+    return hashlib.sha256(json.dumps(pairs).encode('utf8')).hexdigest()
+
+
+def get_new_ecr_images(repo_images: List[Dict], watermark: Optional[Dict[str, Any]]) -> Optional[List[Dict]]:
+    """
+    Returns the images pushed after the stored watermark if the images at or before it are exactly the ones seen on
+    the previous sync, or None if the repository has to be reloaded in full.
+    """
+    if not watermark or watermark.get('image_pushed_at_watermark') is None:
+        return None
+    previous_images = []
+    new_images = []
+    for img in repo_images:
+        if img['imagePushedAt'] > watermark['image_pushed_at_watermark']:
+            new_images.append(img)
+        else:
+            previous_images.append(img)
+    if len({img['imageDigest'] for img in previous_images}) != watermark['image_digest_count']:
+        return None
+    if _get_ecr_images_fingerprint(previous_images) != watermark['images_fingerprint']:
+        return None
+    return new_images
+
+
+@timeit
+def get_ecr_repository_watermarks(
+    neo4j_session: neo4j.Session, region: str, current_aws_account_id: str,
+) -> Dict[str, Dict[str, Any]]:
+    query = """
+    MATCH (:AWSAccount{id: $AWS_ACCOUNT_ID})-[:RESOURCE]->(repo:ECRRepository{region: $Region})
+    WHERE repo.images_fingerprint IS NOT NULL
+    RETURN repo.id AS arn, repo.image_pushed_at_watermark AS image_pushed_at_watermark,
+        repo.image_digest_count AS image_digest_count, repo.images_fingerprint AS images_fingerprint
+    """
+    results = neo4j_session.run(query, Region=region, AWS_ACCOUNT_ID=current_aws_account_id)
+    return {
+        record['arn']: {
+            'image_pushed_at_watermark': record['image_pushed_at_watermark'],
+            'image_digest_count': record['image_digest_count'],
+            'images_fingerprint': record['images_fingerprint'],
+        }
+        for record in results
+    }
+
+
+@timeit
+def load_ecr_repository_watermarks(neo4j_session: neo4j.Session, watermarks: List[Dict], aws_update_tag: int) -> None:
+    query = """
+    UNWIND $Watermarks as watermark
+        MATCH (repo:ECRRepository{id: watermark.arn})
+        SET repo.image_pushed_at_watermark = watermark.image_pushed_at_watermark,
+            repo.image_digest_count = watermark.image_digest_count,
+            repo.images_fingerprint = watermark.images_fingerprint,
+            repo.lastupdated = $aws_update_tag
+    """
+    neo4j_session.run(query, Watermarks=watermarks, aws_update_tag=aws_update_tag).consume()
+
+
+@timeit
+def refresh_ecr_repository_images(neo4j_session: neo4j.Session, repo_arns: List[str], aws_update_tag: int) -> None:
+    """
+    Bump lastupdated on the already loaded images of repositories whose previous images did not change, instead of
+    merging them again.
+    """
+    query = """
+    UNWIND $RepoArns as repo_arn
+        MATCH (:ECRRepository{id: repo_arn})-[r2:REPO_IMAGE]->(ri:ECRRepositoryImage)-[r1:IMAGE]->(img:ECRImage)
+        SET r2.lastupdated = $aws_update_tag,
+            ri.lastupdated = $aws_update_tag,
+            r1.lastupdated = $aws_update_tag,
+            img.lastupdated = $aws_update_tag
+    """
+    logger.info(f"Refreshing images of {len(repo_arns)} unchanged ECR repositories.")
+    neo4j_session.run(query, RepoArns=repo_arns, aws_update_tag=aws_update_tag).consume()
+
+
 @timeit
 def load_ecr_repositories(
     neo4j_session: neo4j.Session, repos: List[Dict], region: str, current_aws_account_id: str,
@@ -146,16 +270,26 @@ def _get_image_data(
     boto3_session: boto3.session.Session,
     region: str,
     repositories: List[Dict[str, Any]],
+    with_push_times: bool = False,
 ) -> Dict[str, Any]:
     '''
     Given a list of repositories, get the image data for each repository,
-    return as a mapping from repositoryUri to image object
+    return as a mapping from repositoryUri to image object.
+    If with_push_times is set, the images are described instead of listed so that each one carries its imagePushedAt.
     '''
     image_data = {}
 
     async def async_get_images(repo: Dict[str, Any]) -> None:
-        repo_image_obj = await to_asynchronous(get_ecr_repository_images, boto3_session, region, repo['repositoryName'])
-        image_data[repo['repositoryUri']] = repo_image_obj
+        if with_push_times:
+            image_details = await to_asynchronous(
+                get_ecr_repository_image_details, boto3_session, region, repo['repositoryName'],
+            )
+            image_data[repo['repositoryUri']] = transform_ecr_image_details(image_details)
+        else:
+            repo_image_obj = await to_asynchronous(
+                get_ecr_repository_images, boto3_session, region, repo['repositoryName'],
+            )
+            image_data[repo['repositoryUri']] = repo_image_obj
     to_synchronous(*[async_get_images(repo) for repo in repositories])
 
     return image_data
@@ -166,12 +300,51 @@ def sync(
     neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, regions: List[str], current_aws_account_id: str,
     update_tag: int, common_job_parameters: Dict,
 ) -> None:
+    incremental = bool(common_job_parameters.get("aws_ecr_incremental_sync"))
     for region in regions:
         logger.info("Syncing ECR for region '%s' in account '%s'.", region, current_aws_account_id)
         image_data = {}
         repositories = get_ecr_repositories(boto3_session, region)
-        image_data = _get_image_data(boto3_session, region, repositories)
+        image_data = _get_image_data(boto3_session, region, repositories, with_push_times=incremental)
         load_ecr_repositories(neo4j_session, repositories, region, current_aws_account_id, update_tag)
+        watermarks: List[Dict] = []
+        if incremental:
+            watermarks = _sync_incremental_image_data(
+                neo4j_session, repositories, image_data, region, current_aws_account_id, update_tag,
+            )
         repo_images_list = transform_ecr_repository_images(image_data)
         load_ecr_repository_images(neo4j_session, repo_images_list, region, update_tag)
+        if incremental:
+            load_ecr_repository_watermarks(neo4j_session, watermarks, update_tag)
     cleanup(neo4j_session, common_job_parameters)
+
+
+def _sync_incremental_image_data(
+    neo4j_session: neo4j.Session,
+    repositories: List[Dict[str, Any]],
+    image_data: Dict[str, Any],
+    region: str,
+    current_aws_account_id: str,
+    update_tag: int,
+) -> List[Dict]:
+    '''
+    Compare each repository's images to the watermark stored on the previous sync. Repositories whose previous images
+    are unchanged get their loaded images refreshed in bulk and only their newer images left in image_data to be
+    merged. Returns the new watermarks to store once the images are loaded.
+    '''
+    stored_watermarks = get_ecr_repository_watermarks(neo4j_session, region, current_aws_account_id)
+    unchanged_repo_arns = []
+    watermarks = []
+    for repo in repositories:
+        repo_images = image_data.get(repo['repositoryUri'], [])
+        watermarks.append({'arn': repo['repositoryArn'], **get_ecr_images_watermark(repo_images)})
+        new_images = get_new_ecr_images(repo_images, stored_watermarks.get(repo['repositoryArn']))
+        if new_images is not None:
+            unchanged_repo_arns.append(repo['repositoryArn'])
+            image_data[repo['repositoryUri']] = new_images
+    logger.info(
+        f"{len(unchanged_repo_arns)} of {len(repositories)} ECR repositories in {region} "
+        "only need their newer images loaded.",
+    )
+    refresh_ecr_repository_images(neo4j_session, unchanged_repo_arns, update_tag)
+    return watermarks
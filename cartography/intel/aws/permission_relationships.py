@@ -1,22 +1,50 @@
+import hashlib
+import json
 import logging
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from string import Template
 from typing import Any
 from typing import Dict
+from typing import FrozenSet
+from typing import Iterator
 from typing import List
+from typing import NamedTuple
 from typing import Pattern
+from typing import Set
 from typing import Tuple
 
 import boto3
 import neo4j
 import yaml
 
+from cartography.client.core.tx import load_graph_data
 from cartography.graph.statement import GraphStatement
+from cartography.util import batch
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# Characters that end the literal part of a clause once it has been translated by compile_regex()
+_REGEX_SPECIAL_CHARS = frozenset('.^$*+?{}[]()|\\')
+# Characters that can make an earlier part of a translated clause optional
+_REGEX_OPTIONAL_CHARS = frozenset('|+{}')
+# Number of resource arns evaluated per worker task when evaluating with a process pool
+_EVALUATION_CHUNK_SIZE = 1000
+# Number of allowed mappings buffered per rule before they are written to the graph
+_MAPPING_BATCH_SIZE = 10000
+
+
+class CompiledStatement(NamedTuple):
+    principal_arn: str
+    policy_id: str
+    effect: str
+    # Indices into the evaluated permissions list that the statement's action/notaction clauses cover
+    permissions: FrozenSet[int]
+    resource: List[Pattern]
+    notresource: List[Pattern]
+
 
 def evaluate_clause(clause: str, match: str) -> bool:
     """ Evaluates the a clause in IAM. Clauses can be AWS [not]actions and [not]resources
@@ -176,14 +204,205 @@ def calculate_permission_relationships(
     Returns:
         [dict] -- The allowed mappings
     """
+    evaluator = PermissionEvaluator(principals, permissions)
+    return _get_allowed_mappings(evaluator, resource_arns)
+
+
+def _get_allowed_mappings(evaluator: "PermissionEvaluator", resource_arns: List[str]) -> List[Dict]:
     allowed_mappings: List[Dict] = []
     for resource_arn in resource_arns:
-        for principal_arn, policies in principals.items():
-            if principal_allowed_on_resource(policies, resource_arn, permissions):
-                allowed_mappings.append({"principal_arn": principal_arn, "resource_arn": resource_arn})
+        for principal_arn in evaluator.get_allowed_principals(resource_arn):
+            allowed_mappings.append({"principal_arn": principal_arn, "resource_arn": resource_arn})
     return allowed_mappings
 
 
+# Evaluators shipped to each worker process once, by _init_evaluation_worker()
+_worker_evaluators: List[Tuple["PermissionEvaluator", "PermissionEvaluator"]] = []
+
+
+def _init_evaluation_worker(evaluators: List[Tuple["PermissionEvaluator", "PermissionEvaluator"]]) -> None:
+    global _worker_evaluators
+    _worker_evaluators = evaluators
+
+
+def _get_rule_mappings(
+    evaluators: List[Tuple["PermissionEvaluator", "PermissionEvaluator"]], resources: List[Tuple[str, bool]],
+) -> List[List[Dict]]:
+    resource_arns = [resource_arn for resource_arn, _ in resources]
+    new_resource_arns = [resource_arn for resource_arn, is_new in resources if is_new]
+    return [
+        _get_allowed_mappings(changed, resource_arns) + _get_allowed_mappings(unchanged, new_resource_arns)
+        for changed, unchanged in evaluators
+    ]
+
+
+def _evaluate_in_worker(resources: List[Tuple[str, bool]]) -> List[List[Dict]]:
+    return _get_rule_mappings(_worker_evaluators, resources)
+
+
+def iter_permission_relationships(
+    evaluators: List[Tuple["PermissionEvaluator", "PermissionEvaluator"]],
+    resources: List[Tuple[str, bool]],
+    workers: int = 1,
+) -> Iterator[List[List[Dict]]]:
+    """ Evaluate several rules against the same resources in one sweep, yielding the allowed mappings in batches.
+    See calculate_permission_relationships() for what is evaluated.
+
+    Arguments:
+        evaluators {[(PermissionEvaluator, PermissionEvaluator)]} -- One pair of evaluators per rule. The first is
+            evaluated against every resource, the second only against new resources.
+        resources {[(str, bool)]} -- The resource arns to test the permissions against, and whether they are new
+        workers {int} -- Number of worker processes to shard the resources across. 1 evaluates in this process.
+
+    Returns:
+        [[[dict]]] -- For each chunk of resources, the allowed mappings of each rule
+    """
+    chunks = batch(resources, size=_EVALUATION_CHUNK_SIZE)
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield _get_rule_mappings(evaluators, chunk)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_evaluation_worker,
+        initargs=(evaluators,),
+    ) as executor:
+        yield from executor.map(_evaluate_in_worker, chunks)
+
+
+def get_clause_literal_prefix(clause: Any) -> str:
+    """ Get the lowercased literal prefix that any value matched by the clause must start with.
+
+    Arguments:
+        clause {str, re.Pattern} -- The resource clause
+
+    Returns:
+        [str] -- The prefix, or empty string if the clause can match anything or is too complex to reason about.
+        Only ASCII characters are considered since case insensitive matching can fold non-ASCII characters onto
+        ASCII ones.
+    """
+    pattern = compile_regex(clause).pattern
+    if any(c in _REGEX_OPTIONAL_CHARS for c in pattern):
+        return ""
+    prefix: List[str] = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\" and pattern[i + 1:i + 2] == ".":
+            prefix.append(".")
+            i += 2
+            continue
+        if c in _REGEX_SPECIAL_CHARS or not c.isascii():
+            break
+        prefix.append(c)
+        i += 1
+    return "".join(prefix).lower()
+
+
+class PermissionEvaluator:
+    """ Compiled form of principal_allowed_on_resource() for a fixed list of permissions.
+
+    Statement actions are resolved against the permissions once at construction, so only the resource clauses are
+    left to check per resource. Statements are then bucketed by the literal prefix of their resource clauses so that
+    a resource ARN is only tested against statements that could match it. Principals without any statement allowing
+    one of the permissions are dropped up front, along with their deny statements.
+
+    The results are identical to calling principal_allowed_on_resource() for every principal and resource.
+    """
+
+    def __init__(self, principals: Dict, permissions: List[str]) -> None:
+        if not isinstance(permissions, list):
+            raise ValueError("permissions is not a list")
+        self.permissions = permissions
+        self.statements: List[CompiledStatement] = []
+        self._by_prefix: Dict[str, List[int]] = {}
+        for principal_arn, policies in principals.items():
+            compiled = self._compile_principal(principal_arn, policies)
+            if not any(statement.effect == "Allow" for statement in compiled):
+                continue
+            for statement in compiled:
+                index = len(self.statements)
+                self.statements.append(statement)
+                prefixes = {get_clause_literal_prefix(clause) for clause in statement.resource}
+                if "" in prefixes:
+                    prefixes = {""}
+                for prefix in prefixes:
+                    self._by_prefix.setdefault(prefix, []).append(index)
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._by_prefix})
+
+    def _compile_principal(self, principal_arn: str, policies: Dict) -> List[CompiledStatement]:
+        compiled: List[CompiledStatement] = []
+        for policy_id, statements in policies.items():
+            for statement in statements:
+                if statement["effect"] not in ("Allow", "Deny") or "resource" not in statement:
+                    continue
+                applicable = frozenset(
+                    i for i, permission in enumerate(self.permissions)
+                    if not evaluate_notaction_for_permission(statement, permission)
+                    and evaluate_action_for_permission(statement, permission)
+                )
+                if not applicable:
+                    continue
+                compiled.append(
+                    CompiledStatement(
+                        principal_arn=principal_arn,
+                        policy_id=policy_id,
+                        effect=statement["effect"],
+                        permissions=applicable,
+                        resource=[compile_regex(clause) for clause in statement["resource"]],
+                        notresource=[compile_regex(clause) for clause in statement.get("notresource", [])],
+                    ),
+                )
+        return compiled
+
+    def _get_candidate_statements(self, resource_arn: str) -> List[int]:
+        if not resource_arn.isascii():
+            return list(range(len(self.statements)))
+        resource_arn_lower = resource_arn.lower()
+        candidates: Set[int] = set()
+        for length in self._prefix_lengths:
+            if length > len(resource_arn_lower):
+                break
+            candidates.update(self._by_prefix.get(resource_arn_lower[:length], []))
+        return sorted(candidates)
+
+    def get_allowed_principals(self, resource_arn: str) -> List[str]:
+        """ Get the principals whose policies allow any of the permissions on the resource
+
+        Arguments:
+            resource_arn {str} -- The resource to test the permissions against
+
+        Returns:
+            [str] -- The allowed principal arns, in the order the principals were given
+        """
+        matched: Dict[str, Dict[str, List[CompiledStatement]]] = {}
+        for index in self._get_candidate_statements(resource_arn):
+            statement = self.statements[index]
+            if not any(clause.fullmatch(resource_arn) for clause in statement.resource):
+                continue
+            if any(clause.fullmatch(resource_arn) for clause in statement.notresource):
+                continue
+            matched.setdefault(statement.principal_arn, {}).setdefault(statement.policy_id, []).append(statement)
+        return [
+            principal_arn for principal_arn, policies in matched.items()
+            if self._evaluate_matched_policies(policies)
+        ]
+
+    def _evaluate_matched_policies(self, policies: Dict[str, List[CompiledStatement]]) -> bool:
+        # Mirrors evaluate_policy_for_permissions(): within a policy the first permission that is denied or allowed
+        # decides the outcome of that policy, and an explicit deny in any policy overrides every allow.
+        granted = False
+        for statements in policies.values():
+            for i in range(len(self.permissions)):
+                if any(s.effect == "Deny" and i in s.permissions for s in statements):
+                    return False
+                if any(s.effect == "Allow" and i in s.permissions for s in statements):
+                    granted = True
+                    break
+        return granted
+
+
 def parse_statement_node(node_group: List[Any]) -> List[Any]:
     """ Parse a dict from group of Neo4J node
 
@@ -243,14 +462,17 @@ def compile_statement(statements: List[Any]) -> List[Any]:
 
 
 def get_principals_for_account(neo4j_session: neo4j.Session, account_id: str) -> Dict:
+    # Return one row per statement with only the fields used for evaluation, instead of collecting whole nodes
     get_policy_query = """
     MATCH
     (acc:AWSAccount{id:$AccountId})-[:RESOURCE]->
     (principal:AWSPrincipal)-[:POLICY]->
     (policy:AWSPolicy)-[:STATEMENT]->
-    (statements:AWSPolicyStatement)
+    (statement:AWSPolicyStatement)
     RETURN
-    DISTINCT principal.arn as principal_arn, policy.id as policy_id, collect(statements) as statements
+    principal.arn as principal_arn, policy.id as policy_id, statement.effect as effect,
+    statement.action as action, statement.notaction as notaction,
+    statement.resource as resource, statement.notresource as notresource
     """
     results = neo4j_session.run(
         get_policy_query,
@@ -258,27 +480,90 @@ def get_principals_for_account(neo4j_session: neo4j.Session, account_id: str) ->
     )
     principals: Dict[Any, Any] = {}
     for r in results:
-        principal_arn = r["principal_arn"]
-        policy_id = r["policy_id"]
-        statements = r["statements"]
-        if principal_arn not in principals:
-            principals[principal_arn] = {}
-        principals[principal_arn][policy_id] = compile_statement(parse_statement_node(statements))
+        statement = {
+            field: r[field] for field in ['effect', 'action', 'notaction', 'resource', 'notresource']
+            if r[field] is not None
+        }
+        policies = principals.setdefault(r["principal_arn"], {})
+        policies.setdefault(r["policy_id"], []).extend(compile_statement([statement]))
     return principals
 
 
-def get_resource_arns(neo4j_session: neo4j.Session, account_id: str, node_label: str) -> List[Any]:
+def get_rules_fingerprint(relationship_mapping: List[Any]) -> str:
+    """ Fingerprint the permission relationship rules, so that any change to them invalidates earlier evaluations
+
+    Arguments:
+        relationship_mapping {[dict]} -- The parsed permission relationships file
+
+    Returns:
+        [str] -- The fingerprint
+    """
+    return hashlib.sha256(json.dumps(relationship_mapping, sort_keys=True).encode()).hexdigest()
+
+
+def _get_canonical_statement(statement: Dict) -> Dict:
+    canonical: Dict[str, Any] = {"effect": statement.get("effect")}
+    for statement_property in ['action', 'resource', 'notresource', 'notaction']:
+        if statement_property in statement:
+            canonical[statement_property] = sorted(
+                compile_regex(clause).pattern for clause in statement[statement_property]
+            )
+    return canonical
+
+
+def get_principal_fingerprint(policies: Dict, rules_fingerprint: str) -> str:
+    """ Fingerprint a principal's policies as evaluated under the given rules. Only the statement fields that take
+    part in evaluation are used, so the fingerprint does not change when the same policies are re-synced.
+
+    Arguments:
+        policies {[dict]} -- The principal's policies, as returned by get_principals_for_account()
+        rules_fingerprint {str} -- The fingerprint of the permission relationship rules
+
+    Returns:
+        [str] -- The fingerprint
+    """
+    canonical_policies = {
+        policy_id: sorted(json.dumps(_get_canonical_statement(statement), sort_keys=True) for statement in statements)
+        for policy_id, statements in policies.items()
+    }
+    canonical = rules_fingerprint + json.dumps(canonical_policies, sort_keys=True)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def get_principal_fingerprints(neo4j_session: neo4j.Session, account_id: str) -> Dict[str, str]:
+    get_fingerprint_query = """
+    MATCH (acc:AWSAccount{id:$AccountId})-[:RESOURCE]->(principal:AWSPrincipal)
+    WHERE principal.permission_relationships_fingerprint IS NOT NULL
+    RETURN principal.arn as arn, principal.permission_relationships_fingerprint as fingerprint
+    """
+    results = neo4j_session.run(
+        get_fingerprint_query,
+        AccountId=account_id,
+    )
+    return {r["arn"]: r["fingerprint"] for r in results}
+
+
+def get_resources_for_evaluation(
+    neo4j_session: neo4j.Session, account_id: str, node_label: str, rules_fingerprint: str,
+) -> List[Tuple[str, bool]]:
+    """
+    Get the arns of the account's resources with the given label, along with whether each one is new, i.e. has not
+    been evaluated against the current permission relationship rules yet. The result is materialized rather than
+    streamed, since the evaluation is sharded into chunks across worker processes and the new arns are fingerprinted
+    only after every rule of the label has been written.
+    """
     get_resource_query = Template("""
     MATCH (acc:AWSAccount{id:$AccountId})-[:RESOURCE]->(resource:$node_label)
-    return resource.arn as arn
+    RETURN resource.arn as arn,
+    coalesce(resource.permission_relationships_rules_fingerprint, '') <> $Fingerprint as is_new
     """)
     get_resource_query_template = get_resource_query.safe_substitute(node_label=node_label)
     results = neo4j_session.run(
         get_resource_query_template,
         AccountId=account_id,
+        Fingerprint=rules_fingerprint,
     )
-    arns = [r["arn"] for r in results]
-    return arns
+    return [(r["arn"], r["is_new"]) for r in results]
 
 
 def load_principal_mappings(
@@ -286,7 +571,7 @@ def load_principal_mappings(
     relationship_name: str, update_tag: int,
 ) -> None:
     map_policy_query = Template("""
-    UNWIND $Mapping as mapping
+    UNWIND $DictList as mapping
     MATCH (principal:AWSPrincipal{arn:mapping.principal_arn})
     MATCH (resource:$node_label{arn:mapping.resource_arn})
     MERGE (principal)-[r:$relationship_name]->(resource)
@@ -298,13 +583,93 @@ def load_principal_mappings(
         node_label=node_label,
         relationship_name=relationship_name,
     )
-    neo4j_session.run(
+    load_graph_data(
+        neo4j_session,
         map_policy_query_template,
-        Mapping=principal_mappings,
+        principal_mappings,
+        aws_update_tag=update_tag,
+    )
+
+
+def refresh_principal_mappings(
+    neo4j_session: neo4j.Session, principal_arns: List[str], node_label: str,
+    relationship_name: str, update_tag: int, current_aws_id: str,
+) -> None:
+    """
+    Bump lastupdated on the existing relationships of principals whose evaluation is known to be unchanged, so that
+    cleanup_rpr() keeps them without having to re-evaluate and re-MERGE them.
+    """
+    refresh_query = Template("""
+    MATCH (:AWSAccount{id: $AWS_ID})-[:RESOURCE]->(principal:AWSPrincipal)-[r:$relationship_name]->
+    (resource:$node_label)
+    WHERE principal.arn IN $PrincipalArns
+    SET r.lastupdated = $aws_update_tag
+    """)
+    if not principal_arns:
+        return
+    refresh_query_template = refresh_query.safe_substitute(
+        node_label=node_label,
+        relationship_name=relationship_name,
+    )
+    neo4j_session.run(
+        refresh_query_template,
+        PrincipalArns=principal_arns,
+        AWS_ID=current_aws_id,
         aws_update_tag=update_tag,
     )
 
 
+def load_principal_fingerprints(neo4j_session: neo4j.Session, fingerprints: Dict[str, str]) -> None:
+    load_fingerprint_query = """
+    UNWIND $Fingerprints as fingerprint
+    MATCH (principal:AWSPrincipal{arn:fingerprint.arn})
+    SET principal.permission_relationships_fingerprint = fingerprint.fingerprint
+    """
+    if not fingerprints:
+        return
+    neo4j_session.run(
+        load_fingerprint_query,
+        Fingerprints=[{"arn": arn, "fingerprint": fingerprint} for arn, fingerprint in fingerprints.items()],
+    )
+
+
+def cleanup_principal_fingerprints(
+    neo4j_session: neo4j.Session, principal_arns: List[str], current_aws_id: str,
+) -> None:
+    """
+    Remove the fingerprints of the account's principals that no longer have any policies. Their relationships are
+    removed by cleanup_rpr(), so they must be fully re-evaluated if the same policies are attached again.
+    """
+    cleanup_fingerprint_query = """
+    MATCH (:AWSAccount{id: $AWS_ID})-[:RESOURCE]->(principal:AWSPrincipal)
+    WHERE principal.permission_relationships_fingerprint IS NOT NULL AND NOT principal.arn IN $PrincipalArns
+    REMOVE principal.permission_relationships_fingerprint
+    """
+    neo4j_session.run(
+        cleanup_fingerprint_query,
+        PrincipalArns=principal_arns,
+        AWS_ID=current_aws_id,
+    )
+
+
+def load_resource_fingerprints(
+    neo4j_session: neo4j.Session, resource_arns: List[str], node_label: str, rules_fingerprint: str,
+) -> None:
+    load_fingerprint_query = Template("""
+    UNWIND $Arns as arn
+    MATCH (resource:$node_label{arn:arn})
+    SET resource.permission_relationships_rules_fingerprint = $Fingerprint
+    """)
+    if not resource_arns:
+        return
+    load_fingerprint_query_template = load_fingerprint_query.safe_substitute(node_label=node_label)
+    neo4j_session.run(
+        load_fingerprint_query_template,
+        Arns=resource_arns,
+        Fingerprint=rules_fingerprint,
+    )
+
+
 def cleanup_rpr(
     neo4j_session: neo4j.Session, node_label: str, relationship_name: str, update_tag: int,
     current_aws_id: str,
@@ -372,20 +737,75 @@ def sync(
         )
         return
     relationship_mapping = parse_permission_relationships_file(pr_file)
+    workers = common_job_parameters.get("permission_relationships_workers") or 1
+
+    # Only principals whose policies (or the rules) changed since their last evaluation are evaluated against every
+    # resource. The others are only evaluated against resources that have not been evaluated yet, and keep their
+    # existing relationships to everything else.
+    rules_fingerprint = get_rules_fingerprint(relationship_mapping)
+    cleanup_principal_fingerprints(neo4j_session, list(principals), current_aws_account_id)
+    previous_fingerprints = get_principal_fingerprints(neo4j_session, current_aws_account_id)
+    changed_fingerprints: Dict[str, str] = {}
+    changed_principals: Dict[str, Dict] = {}
+    unchanged_principals: Dict[str, Dict] = {}
+    for principal_arn, policies in principals.items():
+        fingerprint = get_principal_fingerprint(policies, rules_fingerprint)
+        if previous_fingerprints.get(principal_arn) == fingerprint:
+            unchanged_principals[principal_arn] = policies
+        else:
+            changed_principals[principal_arn] = policies
+            changed_fingerprints[principal_arn] = fingerprint
+    logger.info(
+        "%d of %d principals in account '%s' changed since their permission relationships were last evaluated.",
+        len(changed_principals), len(principals), current_aws_account_id,
+    )
+
+    # Rules are grouped by target label so that each label's resources are read and swept once for all its rules
+    rules_by_label: Dict[str, List[Dict]] = {}
     for rpr in relationship_mapping:
         if not is_valid_rpr(rpr):
             raise ValueError("""
         Resource permission relationship is missing fields.
         Required fields: permissions, relationship_name, target_label"
         """)
-        permissions = rpr["permissions"]
-        relationship_name = rpr["relationship_name"]
-        target_label = rpr["target_label"]
-        resource_arns = get_resource_arns(neo4j_session, current_aws_account_id, target_label)
-        logger.info("Syncing relationship '%s' for node label '%s'", relationship_name, target_label)
-        allowed_mappings = calculate_permission_relationships(principals, resource_arns, permissions)
-        load_principal_mappings(
-            neo4j_session, allowed_mappings,
-            target_label, relationship_name, update_tag,
+        rules_by_label.setdefault(rpr["target_label"], []).append(rpr)
+
+    new_resource_arns_by_label: Dict[str, List[str]] = {}
+    for target_label, rules in rules_by_label.items():
+        resources = get_resources_for_evaluation(
+            neo4j_session, current_aws_account_id, target_label, rules_fingerprint,
+        )
+        new_resource_arns_by_label[target_label] = [resource_arn for resource_arn, is_new in resources if is_new]
+        logger.info(
+            "Syncing relationships %s for node label '%s'",
+            [rpr["relationship_name"] for rpr in rules], target_label,
         )
-        cleanup_rpr(neo4j_session, target_label, relationship_name, update_tag, current_aws_account_id)
+        for rpr in rules:
+            refresh_principal_mappings(
+                neo4j_session, list(unchanged_principals),
+                target_label, rpr["relationship_name"], update_tag, current_aws_account_id,
+            )
+        evaluators = [
+            (
+                PermissionEvaluator(changed_principals, rpr["permissions"]),
+                PermissionEvaluator(unchanged_principals, rpr["permissions"]),
+            )
+            for rpr in rules
+        ]
+        pending_mappings: List[List[Dict]] = [[] for _ in rules]
+        for rule_mappings in iter_permission_relationships(evaluators, resources, workers):
+            for rpr, pending, allowed_mappings in zip(rules, pending_mappings, rule_mappings):
+                pending.extend(allowed_mappings)
+                if len(pending) >= _MAPPING_BATCH_SIZE:
+                    load_principal_mappings(
+                        neo4j_session, pending, target_label, rpr["relationship_name"], update_tag,
+                    )
+                    pending.clear()
+        for rpr, pending in zip(rules, pending_mappings):
+            load_principal_mappings(neo4j_session, pending, target_label, rpr["relationship_name"], update_tag)
+            cleanup_rpr(neo4j_session, target_label, rpr["relationship_name"], update_tag, current_aws_account_id)
+
+    # Fingerprints are only recorded once every relationship has been written, so a failed sync is fully re-evaluated
+    load_principal_fingerprints(neo4j_session, changed_fingerprints)
+    for target_label, new_resource_arns in new_resource_arns_by_label.items():
+        load_resource_fingerprints(neo4j_session, new_resource_arns, target_label, rules_fingerprint)
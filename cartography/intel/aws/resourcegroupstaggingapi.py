@@ -2,6 +2,7 @@ import logging
 from string import Template
 from typing import Dict
 from typing import List
+from typing import Optional
 
 import boto3
 import neo4j
@@ -11,6 +12,8 @@ from cartography.util import aws_handle_regions
 from cartography.util import batch
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
+from cartography.util import to_asynchronous
+from cartography.util import to_synchronous
 
 logger = logging.getLogger(__name__)
 
@@ -116,30 +119,75 @@ TAG_RESOURCE_TYPE_MAPPINGS: Dict = {
 }
 
 
+def get_resource_type_from_arn(
+    arn: str, tag_resource_type_mappings: Dict = TAG_RESOURCE_TYPE_MAPPINGS,
+) -> Optional[str]:
+    """
+    Return the key in tag_resource_type_mappings that the given ARN belongs to, or None if it is not supported.
+    For example, for "arn:aws:ec2:us-east-1:test_account:instance/i-1337", return 'ec2:instance', and for
+    "arn:aws:elasticloadbalancing:us-east-1:test_account:loadbalancer/app/foo/ab123", return
+    'elasticloadbalancing:loadbalancer/app'.
+    :param arn: The ARN
+    :param tag_resource_type_mappings: The supported resource types
+    :return: The resource type
+    """
+    service = arn.split(':')[2]
+    if service in tag_resource_type_mappings:
+        # e.g. S3 buckets and SQS queues are identified by their service alone
+        return service
+    resource_path = arn.split(':', 5)[-1].split(':')[0].split('/')
+    # Prefer the most specific type, e.g. 'loadbalancer/app' over 'loadbalancer'
+    for i in range(len(resource_path), 0, -1):
+        resource_type = f"{service}:{'/'.join(resource_path[:i])}"
+        if resource_type in tag_resource_type_mappings:
+            return resource_type
+    return None
+
+
 @timeit
 @aws_handle_regions
-def get_tags(boto3_session: boto3.session.Session, resource_type: str, region: str) -> List[Dict]:
+def get_tags(boto3_session: boto3.session.Session, resource_types: List[str], region: str) -> List[Dict]:
     """
-    Create boto3 client and retrieve tag data.
+    Create boto3 client and retrieve tag data for all of the given resource types in one paginated call.
     """
-    # this is a temporary workaround to populate AWS tags for IAM roles.
-    # resourcegroupstaggingapi does not support IAM roles and no ETA is provided
-    # TODO: when resourcegroupstaggingapi supports iam:role, remove this condition block
-    if resource_type == 'iam:role':
-        return get_role_tags(boto3_session)
-
     client = boto3_session.client('resourcegroupstaggingapi', region_name=region)
     paginator = client.get_paginator('get_resources')
     resources: List[Dict] = []
     for page in paginator.paginate(
         # Only ingest tags for resources that Cartography supports.
         # This is just a starting list; there may be others supported by this API.
-        ResourceTypeFilters=[resource_type],
+        ResourceTypeFilters=resource_types,
     ):
         resources.extend(page['ResourceTagMappingList'])
     return resources
 
 
+@timeit
+@aws_handle_regions
+def get_iam_role_tags(boto3_session: boto3.session.Session) -> List[Dict]:
+    """
+    resourcegroupstaggingapi does not support IAM roles and no ETA is provided, so retrieve their tags from IAM.
+    TODO: when resourcegroupstaggingapi supports iam:role, remove this workaround
+    """
+    return get_role_tags(boto3_session)
+
+
+def partition_tags_by_resource_type(
+    tag_data: List[Dict], tag_resource_type_mappings: Dict = TAG_RESOURCE_TYPE_MAPPINGS,
+) -> Dict[str, List[Dict]]:
+    """
+    Split the tag data returned by get_tags() into lists per supported resource type.
+    """
+    tags_by_resource_type: Dict[str, List[Dict]] = {}
+    for tag_mapping in tag_data:
+        resource_type = get_resource_type_from_arn(tag_mapping['ResourceARN'], tag_resource_type_mappings)
+        if resource_type is None:
+            logger.debug(f"Skipping tags for unsupported resource {tag_mapping['ResourceARN']}")
+            continue
+        tags_by_resource_type.setdefault(resource_type, []).append(tag_mapping)
+    return tags_by_resource_type
+
+
 def _load_tags_tx(
     tx: neo4j.Transaction,
     tag_data: Dict,
@@ -191,7 +239,7 @@ def load_tags(
     if len(tag_data) == 0:
         # If there is no data to load, save some time.
         return
-    for tag_data_batch in batch(tag_data, size=100):
+    for tag_data_batch in batch(tag_data):
         neo4j_session.write_transaction(
             _load_tags_tx,
             tag_data=tag_data_batch,
@@ -231,15 +279,23 @@ def sync(
     common_job_parameters: Dict,
     tag_resource_type_mappings: Dict = TAG_RESOURCE_TYPE_MAPPINGS,
 ) -> None:
-    for region in regions:
-        logger.info(f"Syncing AWS tags for account {current_aws_account_id} and region {region}")
-        for resource_type in tag_resource_type_mappings.keys():
-            tag_data = get_tags(boto3_session, resource_type, region)
-            transform_tags(tag_data, resource_type)  # type: ignore
-            logger.info(f"Loading {len(tag_data)} tags for resource type {resource_type}")
+    resource_types = [resource_type for resource_type in tag_resource_type_mappings if resource_type != 'iam:role']
+    logger.info(f"Syncing AWS tags for account {current_aws_account_id} and regions {regions}")
+    region_tag_data = to_synchronous(
+        *[to_asynchronous(get_tags, boto3_session, resource_types, region) for region in regions],
+    )
+    for region, tag_data in zip(regions, region_tag_data):
+        tags_by_resource_type = partition_tags_by_resource_type(tag_data, tag_resource_type_mappings)
+        # IAM is global, so role tags are only fetched once, and loaded with the last region as they were when they
+        # were fetched once per region.
+        if region == regions[-1] and 'iam:role' in tag_resource_type_mappings:
+            tags_by_resource_type['iam:role'] = get_iam_role_tags(boto3_session)
+        for resource_type, resource_tag_data in tags_by_resource_type.items():
+            transform_tags(resource_tag_data, resource_type)  # type: ignore
+            logger.info(f"Loading {len(resource_tag_data)} tags for resource type {resource_type} in region {region}")
             load_tags(
                 neo4j_session=neo4j_session,
-                tag_data=tag_data,  # type: ignore
+                tag_data=resource_tag_data,  # type: ignore
                 resource_type=resource_type,
                 region=region,
                 current_aws_account_id=current_aws_account_id,
@@ -1,5 +1,8 @@
 import logging
+from collections import defaultdict
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Tuple
@@ -8,50 +11,71 @@ import boto3
 import botocore
 import neo4j
 
+from cartography.client.core.tx import load_graph_data
+from cartography.client.core.tx import read_list_of_tuples_tx
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# Number of DNS records written to the graph at a time, across zones
+DNS_RECORD_BATCH_SIZE = 10000
+# Labels and properties of the nodes that DNS records can point to by DNS name
+DNS_POINTS_TO_TARGETS = [
+    ('LoadBalancer', 'dnsname'),
+    ('LoadBalancerV2', 'dnsname'),
+    ('EC2Instance', 'publicdnsname'),
+]
+
 
 @timeit
 def link_aws_resources(neo4j_session: neo4j.Session, update_tag: int) -> None:
-    # find records that point to other records
-    link_records = """
-    MATCH (n:AWSDNSRecord) WITH n MATCH (v:AWSDNSRecord{value: n.name})
-    WHERE NOT n = v
-    MERGE (v)-[p:DNS_POINTS_TO]->(n)
-    ON CREATE SET p.firstseen = timestamp()
-    SET p.lastupdated = $update_tag
-    """
-    neo4j_session.run(link_records, update_tag=update_tag)
-
-    # find records that point to AWS LoadBalancers
-    link_elb = """
-    MATCH (n:AWSDNSRecord) WITH n MATCH (l:LoadBalancer{dnsname: n.value})
-    MERGE (n)-[p:DNS_POINTS_TO]->(l)
-    ON CREATE SET p.firstseen = timestamp()
-    SET p.lastupdated = $update_tag
     """
-    neo4j_session.run(link_elb, update_tag=update_tag)
-
-    # find records that point to AWS LoadBalancersV2
-    link_elbv2 = """
-    MATCH (n:AWSDNSRecord) WITH n MATCH (l:LoadBalancerV2{dnsname: n.value})
-    MERGE (n)-[p:DNS_POINTS_TO]->(l)
-    ON CREATE SET p.firstseen = timestamp()
-    SET p.lastupdated = $update_tag
+    Link DNS records to the records, load balancers and EC2 instances that they point to. Rather than matching every
+    record against every resource in Cypher, the names are read once and joined in memory on their normalized form,
+    and only the resulting pairs are written.
     """
-    neo4j_session.run(link_elbv2, update_tag=update_tag)
-
-    # find records that point to AWS EC2 Instances
-    link_ec2 = """
-    MATCH (n:AWSDNSRecord) WITH n MATCH (e:EC2Instance{publicdnsname: n.value})
-    MERGE (n)-[p:DNS_POINTS_TO]->(e)
-    ON CREATE SET p.firstseen = timestamp()
-    SET p.lastupdated = $update_tag
+    records = neo4j_session.read_transaction(
+        read_list_of_tuples_tx,
+        "MATCH (n:AWSDNSRecord) RETURN id(n), n.name, n.value",
+    )
+    records_by_value: Dict[str, List[int]] = defaultdict(list)
+    for record_id, _, value in records:
+        if value:
+            records_by_value[_normalize_dns_name(value)].append(record_id)
+
+    pairs: List[Dict[str, int]] = []
+    # find records that point to other records
+    for record_id, name, _ in records:
+        if name:
+            pairs.extend(
+                {'source': source_id, 'target': record_id}
+                for source_id in records_by_value.get(_normalize_dns_name(name), [])
+                if source_id != record_id
+            )
+
+    # find records that point to AWS LoadBalancers, LoadBalancersV2 and EC2 Instances
+    for label, dns_property in DNS_POINTS_TO_TARGETS:
+        targets = neo4j_session.read_transaction(
+            read_list_of_tuples_tx,
+            f"MATCH (l:{label}) WHERE l.{dns_property} IS NOT NULL RETURN id(l), l.{dns_property}",
+        )
+        for target_id, dns_name in targets:
+            pairs.extend(
+                {'source': source_id, 'target': target_id}
+                for source_id in records_by_value.get(_normalize_dns_name(dns_name), [])
+            )
+
+    link_query = """
+    UNWIND $DictList AS pair
+        MATCH (source) WHERE id(source) = pair.source
+        MATCH (target) WHERE id(target) = pair.target
+        MERGE (source)-[p:DNS_POINTS_TO]->(target)
+        ON CREATE SET p.firstseen = timestamp()
+        SET p.lastupdated = $update_tag
     """
-    neo4j_session.run(link_ec2, update_tag=update_tag)
+    logger.info(f"Linking {len(pairs)} DNS records to the resources they point to.")
+    load_graph_data(neo4j_session, link_query, pairs, update_tag=update_tag)
 
 
 @timeit
@@ -132,27 +156,30 @@ def load_cname_records(neo4j_session: neo4j.Session, records: List[Dict], update
 
 @timeit
 def load_zone(neo4j_session: neo4j.Session, zone: Dict, current_aws_id: str, update_tag: int) -> None:
+    load_zones(neo4j_session, [zone], current_aws_id, update_tag)
+
+
+@timeit
+def load_zones(neo4j_session: neo4j.Session, zones: List[Dict], current_aws_id: str, update_tag: int) -> None:
     ingest_z = """
-    MERGE (zone:DNSZone:AWSDNSZone{zoneid:$ZoneId})
-    ON CREATE SET
-        zone.firstseen = timestamp(),
-        zone.name = $ZoneName
-    SET
-        zone.lastupdated = $update_tag,
-        zone.comment = $Comment,
-        zone.privatezone = $PrivateZone
-    WITH zone
-    MATCH (aa:AWSAccount{id: $AWS_ACCOUNT_ID})
-    MERGE (aa)-[r:RESOURCE]->(zone)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $update_tag
+    UNWIND $zones as z
+        MERGE (zone:DNSZone:AWSDNSZone{zoneid: z.zoneid})
+        ON CREATE SET
+            zone.firstseen = timestamp(),
+            zone.name = z.zonename
+        SET
+            zone.lastupdated = $update_tag,
+            zone.comment = z.comment,
+            zone.privatezone = z.privatezone
+        WITH zone
+        MATCH (aa:AWSAccount{id: $AWS_ACCOUNT_ID})
+        MERGE (aa)-[r:RESOURCE]->(zone)
+        ON CREATE SET r.firstseen = timestamp()
+        SET r.lastupdated = $update_tag
     """
     neo4j_session.run(
         ingest_z,
-        ZoneName=zone['name'][:-1],
-        ZoneId=zone['zoneid'],
-        Comment=zone['comment'],
-        PrivateZone=zone['privatezone'],
+        zones=[{**zone, 'zonename': zone['name'][:-1]} for zone in zones],
         AWS_ACCOUNT_ID=current_aws_id,
         update_tag=update_tag,
     )
@@ -160,6 +187,12 @@ def load_zone(neo4j_session: neo4j.Session, zone: Dict, current_aws_id: str, upd
 
 @timeit
 def load_ns_records(neo4j_session: neo4j.Session, records: List[Dict], zone_name: str, update_tag: int) -> None:
+    _load_ns_records(neo4j_session, records, update_tag)
+    # Map the official name servers for a domain.
+    _load_zone_name_servers(neo4j_session, [record for record in records if record['name'] == zone_name], update_tag)
+
+
+def _load_ns_records(neo4j_session: neo4j.Session, records: List[Dict], update_tag: int) -> None:
     ingest_records = """
     UNWIND $records as record
         MERGE (a:DNSRecord:AWSDNSRecord{id: record.id})
@@ -191,22 +224,24 @@ def load_ns_records(neo4j_session: neo4j.Session, records: List[Dict], zone_name
         update_tag=update_tag,
     )
 
-    # Map the official name servers for a domain.
+
+def _load_zone_name_servers(neo4j_session: neo4j.Session, records: List[Dict], update_tag: int) -> None:
+    """
+    Link zones to the name servers of their apex NS records.
+    """
     map_ns_records = """
-    UNWIND $servers as server
+    UNWIND $records as record
+        UNWIND record.servers as server
         MATCH (ns:NameServer{id:server})
-        MATCH (zone:AWSDNSZone{zoneid:$zoneid})
+        MATCH (zone:AWSDNSZone{zoneid: record.zoneid})
         MERGE (ns)<-[r:NAMESERVER]-(zone)
         SET r.lastupdated = $update_tag
     """
-    for record in records:
-        if zone_name == record["name"]:
-            neo4j_session.run(
-                map_ns_records,
-                servers=record["servers"],
-                zoneid=record["zoneid"],
-                update_tag=update_tag,
-            )
+    neo4j_session.run(
+        map_ns_records,
+        records=records,
+        update_tag=update_tag,
+    )
 
 
 @timeit
@@ -328,7 +363,7 @@ def transform_zone(zone: Dict) -> Dict:
 
 @timeit
 def load_dns_details(
-    neo4j_session: neo4j.Session, dns_details: List[Tuple[Dict, List[Dict]]], current_aws_id: str,
+    neo4j_session: neo4j.Session, dns_details: Iterable[Tuple[Dict, Iterable[Dict]]], current_aws_id: str,
     update_tag: int,
 ) -> None:
     """
@@ -337,65 +372,95 @@ def load_dns_details(
     (:AWSDNSZone)--(:NameServer),
     (:AWSDNSRecord{type:"NS"})-[:DNS_POINTS_TO]->(:NameServer),
     (:AWSDNSRecord)-[:DNS_POINTS_TO]->(:AWSDNSRecord).
+
+    Records are collected across zones and written once DNS_RECORD_BATCH_SIZE of them are pending, after the zones
+    they belong to.
     """
+    pending = _PendingDNSDetails()
     for zone, zone_record_sets in dns_details:
-        zone_a_records = []
-        zone_alias_records = []
-        zone_cname_records = []
-        zone_ns_records = []
         parsed_zone = transform_zone(zone)
-
-        load_zone(neo4j_session, parsed_zone, current_aws_id, update_tag)
+        zone_name = parsed_zone['name'][:-1]
+        pending.zones.append(parsed_zone)
 
         for record_set in zone_record_sets:
             if record_set['Type'] == 'A' or record_set['Type'] == 'CNAME':
                 record = transform_record_set(record_set, zone['Id'], record_set['Name'][:-1])
 
                 if record['type'] == 'A':
-                    zone_a_records.append(record)
+                    pending.a_records.append(record)
                 elif record['type'] == 'ALIAS':
-                    zone_alias_records.append(record)
+                    pending.alias_records.append(record)
                 elif record['type'] == 'CNAME':
-                    zone_cname_records.append(record)
+                    pending.cname_records.append(record)
 
             if record_set['Type'] == 'NS':
                 record = transform_ns_record_set(record_set, zone['Id'])
-                zone_ns_records.append(record)
-        if zone_a_records:
-            load_a_records(neo4j_session, zone_a_records, update_tag)
-
-        if zone_alias_records:
-            load_alias_records(neo4j_session, zone_alias_records, update_tag)
-
-        if zone_cname_records:
-            load_cname_records(neo4j_session, zone_cname_records, update_tag)
-        if zone_ns_records:
-            load_ns_records(neo4j_session, zone_ns_records, parsed_zone['name'][:-1], update_tag)
+                if record is not None:
+                    pending.ns_records.append(record)
+                    if record['name'] == zone_name:
+                        pending.zone_ns_records.append(record)
+
+            if pending.record_count() >= DNS_RECORD_BATCH_SIZE:
+                pending.flush(neo4j_session, current_aws_id, update_tag)
+    pending.flush(neo4j_session, current_aws_id, update_tag)
     link_aws_resources(neo4j_session, update_tag)
 
 
-@timeit
-def get_zone_record_sets(client: botocore.client.BaseClient, zone_id: str) -> List[Dict]:
-    resource_record_sets: List[Dict] = []
+class _PendingDNSDetails:
+    """
+    DNS zones and records that have been transformed but not yet written to the graph.
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.zones: List[Dict] = []
+        self.a_records: List[Dict] = []
+        self.alias_records: List[Dict] = []
+        self.cname_records: List[Dict] = []
+        self.ns_records: List[Dict] = []
+        self.zone_ns_records: List[Dict] = []
+
+    def record_count(self) -> int:
+        return len(self.a_records) + len(self.alias_records) + len(self.cname_records) + len(self.ns_records)
+
+    def flush(self, neo4j_session: neo4j.Session, current_aws_id: str, update_tag: int) -> None:
+        # Zones go first so that the records can be attached to them
+        if self.zones:
+            load_zones(neo4j_session, self.zones, current_aws_id, update_tag)
+        if self.a_records:
+            load_a_records(neo4j_session, self.a_records, update_tag)
+        if self.alias_records:
+            load_alias_records(neo4j_session, self.alias_records, update_tag)
+        if self.cname_records:
+            load_cname_records(neo4j_session, self.cname_records, update_tag)
+        if self.ns_records:
+            _load_ns_records(neo4j_session, self.ns_records, update_tag)
+        if self.zone_ns_records:
+            _load_zone_name_servers(neo4j_session, self.zone_ns_records, update_tag)
+        self.clear()
+
+
+def get_zone_record_sets(client: botocore.client.BaseClient, zone_id: str) -> Iterator[Dict]:
     paginator = client.get_paginator('list_resource_record_sets')
     pages = paginator.paginate(HostedZoneId=zone_id)
     for page in pages:
-        resource_record_sets.extend(page['ResourceRecordSets'])
-    return resource_record_sets
+        yield from page['ResourceRecordSets']
 
 
-@timeit
-def get_zones(client: botocore.client.BaseClient) -> List[Tuple[Dict, List[Dict]]]:
+def get_zones(client: botocore.client.BaseClient) -> Iterator[Tuple[Dict, Iterator[Dict]]]:
+    """
+    Yields each hosted zone with an iterator over its record sets, so that the record sets are fetched page by page
+    while they are being loaded.
+    """
     paginator = client.get_paginator('list_hosted_zones')
     hosted_zones: List[Dict] = []
     for page in paginator.paginate():
         hosted_zones.extend(page['HostedZones'])
 
-    results: List[Tuple[Dict, List[Dict]]] = []
     for hosted_zone in hosted_zones:
-        record_sets = get_zone_record_sets(client, hosted_zone['Id'])
-        results.append((hosted_zone, record_sets))
-    return results
+        yield hosted_zone, get_zone_record_sets(client, hosted_zone['Id'])
 
 
 def _create_dns_record_id(zoneid: str, name: str, record_type: str) -> str:
@@ -406,6 +471,11 @@ def _normalize_dns_address(address: str) -> str:
     return address.rstrip('.')
 
 
+def _normalize_dns_name(name: str) -> str:
+    # DNS names are case insensitive
+    return _normalize_dns_address(name).lower()
+
+
 @timeit
 def cleanup_route53(neo4j_session: neo4j.Session, current_aws_id: str, update_tag: int) -> None:
     run_cleanup_job(
@@ -2,6 +2,9 @@ import asyncio
 import hashlib
 import json
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from typing import Any
 from typing import Dict
 from typing import Generator
@@ -27,6 +30,23 @@ from cartography.util import to_synchronous
 logger = logging.getLogger(__name__)
 stat_handler = get_stats_client(__name__)
 
+# Maximum number of buckets whose details are fetched concurrently
+S3_DETAILS_MAX_IN_FLIGHT = 50
+# Number of buckets whose parsed details are written to the graph at a time
+S3_DETAILS_CHUNK_SIZE = 1000
+# Number of buckets parsed per task when parsing is spread across worker processes
+S3_PARSE_CHUNK_SIZE = 100
+# Number of distinct policy documents whose analysis is memoized
+S3_POLICY_CACHE_SIZE = 4096
+S3_PARSED_DETAIL_KEYS = (
+    'acls',
+    'policies',
+    'statements',
+    'encryption_configs',
+    'versioning_configs',
+    'public_access_block_configs',
+)
+
 
 @timeit
 def get_s3_bucket_list(boto3_session: boto3.session.Session) -> List[Dict]:
@@ -50,24 +70,21 @@ def get_s3_bucket_list(boto3_session: boto3.session.Session) -> List[Dict]:
 def get_s3_bucket_details(
         boto3_session: boto3.session.Session,
         bucket_data: Dict,
+        max_in_flight: int = S3_DETAILS_MAX_IN_FLIGHT,
 ) -> Generator[Tuple[str, Dict, Dict, Dict, Dict, Dict], None, None]:
     """
     Iterates over all S3 buckets. Yields bucket name (string), S3 bucket policies (JSON), ACLs (JSON),
     default encryption policy (JSON), Versioning (JSON), and Public Access Block (JSON)
+
+    At most `max_in_flight` buckets are fetched at a time, so that the number of concurrent API calls and the
+    number of bucket details held in memory stay bounded regardless of how many buckets the account has.
     """
     # a local store for s3 clients so that we may re-use clients for an AWS region
     s3_regional_clients: Dict[Any, Any] = {}
 
     BucketDetail = Tuple[str, Dict[str, Any], Dict[str, Any], Dict[str, Any], Dict[str, Any], Dict[str, Any]]
 
-    async def _get_bucket_detail(bucket: Dict[str, Any]) -> BucketDetail:
-        # Note: bucket['Region'] is sometimes None because
-        # client.get_bucket_location() does not return a location constraint for buckets
-        # in us-east-1 region
-        client = s3_regional_clients.get(bucket['Region'])
-        if not client:
-            client = boto3_session.client('s3', bucket['Region'])
-            s3_regional_clients[bucket['Region']] = client
+    async def _get_bucket_detail(bucket: Dict[str, Any], client: botocore.client.BaseClient) -> BucketDetail:
         (
             acl,
             policy,
@@ -83,8 +100,20 @@ def get_s3_bucket_details(
         )
         return bucket['Name'], acl, policy, encryption, versioning, public_access_block
 
-    bucket_details = to_synchronous(*[_get_bucket_detail(bucket) for bucket in bucket_data['Buckets']])
-    yield from bucket_details
+    buckets = iter(bucket_data['Buckets'])
+    while True:
+        window = list(islice(buckets, max_in_flight))
+        if not window:
+            break
+        for bucket in window:
+            # Note: bucket['Region'] is sometimes None because
+            # client.get_bucket_location() does not return a location constraint for buckets
+            # in us-east-1 region
+            if bucket['Region'] not in s3_regional_clients:
+                s3_regional_clients[bucket['Region']] = boto3_session.client('s3', bucket['Region'])
+        yield from to_synchronous(
+            *[_get_bucket_detail(bucket, s3_regional_clients[bucket['Region']]) for bucket in window],
+        )
 
 
 @timeit
@@ -227,9 +256,11 @@ def _load_s3_acls(
         acls: List[Dict[str, Any]],
         aws_account_id: str,
         update_tag: int,
+        run_acl_analysis: bool = True,
 ) -> None:
     """
-    Ingest S3 ACL into neo4j.
+    Ingest S3 ACL into neo4j. The ACL exposure analysis runs over the whole account, so callers that load ACLs in
+    several chunks should pass run_acl_analysis=False and call _run_s3_acl_analysis() once at the end.
     """
     ingest_acls = """
     UNWIND $acls AS acl
@@ -249,6 +280,11 @@ def _load_s3_acls(
         UpdateTag=update_tag,
     )
 
+    if run_acl_analysis:
+        _run_s3_acl_analysis(neo4j_session, aws_account_id)
+
+
+def _run_s3_acl_analysis(neo4j_session: neo4j.Session, aws_account_id: str) -> None:
     # implement the acl permission
     # https://docs.aws.amazon.com/AmazonS3/latest/dev/acl-overview.html#permissions
     run_analysis_job(
@@ -401,52 +437,96 @@ def _set_default_values(neo4j_session: neo4j.Session, aws_account_id: str) -> No
 @timeit
 def load_s3_details(
     neo4j_session: neo4j.Session, s3_details_iter: Generator[Any, Any, Any], aws_account_id: str,
-    update_tag: int,
+    update_tag: int, chunk_size: int = S3_DETAILS_CHUNK_SIZE, parse_workers: int = 1,
 ) -> None:
     """
-    Create dictionaries for all bucket ACLs and all bucket policies so we can import them in a single query for each
+    Parse the bucket details yielded by s3_details_iter and load them in chunks of `chunk_size` buckets, so that only
+    one chunk of parsed ACLs, policies and statements is held in memory at a time. If `parse_workers` is greater than
+    1 the parsing is spread across that many worker processes.
     """
-    acls: List[Dict] = []
-    policies: List[Dict] = []
-    statements = []
-    encryption_configs: List[Dict] = []
-    versioning_configs: List[Dict] = []
-    public_access_block_configs: List[Dict] = []
-    for bucket, acl, policy, encryption, versioning, public_access_block in s3_details_iter:
+    executor = ProcessPoolExecutor(max_workers=parse_workers) if parse_workers > 1 else None
+    try:
+        s3_details = iter(s3_details_iter)
+        while True:
+            chunk = list(islice(s3_details, chunk_size))
+            if not chunk:
+                break
+            if executor:
+                parsed_details = _parse_s3_details_in_pool(executor, chunk, aws_account_id)
+            else:
+                parsed_details = parse_s3_details(chunk, aws_account_id)
+            # cleanup existing policy properties set on the chunk's S3 Buckets only once their details are fetched,
+            # so that buckets keep their exposure until they are refreshed
+            run_cleanup_job(
+                'aws_s3_details.json',
+                neo4j_session,
+                {
+                    'UPDATE_TAG': update_tag,
+                    'AWS_ID': aws_account_id,
+                    'BUCKET_NAMES': [bucket_name for bucket_name, *_ in chunk],
+                },
+            )
+            _load_parsed_s3_details(neo4j_session, parsed_details, aws_account_id, update_tag)
+    finally:
+        if executor:
+            executor.shutdown()
+
+    _run_s3_acl_analysis(neo4j_session, aws_account_id)
+    _set_default_values(neo4j_session, aws_account_id)
+
+
+def parse_s3_details(s3_details: List[Tuple], aws_account_id: str) -> Dict[str, List[Dict]]:
+    """
+    Create dictionaries for the bucket ACLs and bucket policies of a chunk of buckets so we can import them in a
+    single query for each
+    """
+    parsed_details: Dict[str, List[Dict]] = {key: [] for key in S3_PARSED_DETAIL_KEYS}
+    for bucket, acl, policy, encryption, versioning, public_access_block in s3_details:
         parsed_acls = parse_acl(acl, bucket, aws_account_id)
         if parsed_acls is not None:
-            acls.extend(parsed_acls)
+            parsed_details['acls'].extend(parsed_acls)
         parsed_policy = parse_policy(bucket, policy)
         if parsed_policy is not None:
-            policies.append(parsed_policy)
+            parsed_details['policies'].append(parsed_policy)
         parsed_statements = parse_policy_statements(bucket, policy)
         if parsed_statements is not None:
-            statements.extend(parsed_statements)
+            parsed_details['statements'].extend(parsed_statements)
         parsed_encryption = parse_encryption(bucket, encryption)
         if parsed_encryption is not None:
-            encryption_configs.append(parsed_encryption)
+            parsed_details['encryption_configs'].append(parsed_encryption)
         parsed_versioning = parse_versioning(bucket, versioning)
         if parsed_versioning is not None:
-            versioning_configs.append(parsed_versioning)
+            parsed_details['versioning_configs'].append(parsed_versioning)
         parsed_public_access_block = parse_public_access_block(bucket, public_access_block)
         if parsed_public_access_block is not None:
-            public_access_block_configs.append(parsed_public_access_block)
+            parsed_details['public_access_block_configs'].append(parsed_public_access_block)
+    return parsed_details
 
-    # cleanup existing policy properties set on S3 Buckets
-    run_cleanup_job(
-        'aws_s3_details.json',
-        neo4j_session,
-        {'UPDATE_TAG': update_tag, 'AWS_ID': aws_account_id},
-    )
 
-    _load_s3_acls(neo4j_session, acls, aws_account_id, update_tag)
+def _parse_s3_details_in_pool(
+    executor: ProcessPoolExecutor, s3_details: List[Tuple], aws_account_id: str,
+) -> Dict[str, List[Dict]]:
+    """
+    Parse a chunk of bucket details by submitting it to the executor in smaller pieces. The pieces are merged back in
+    submission order, so the result is the same as calling parse_s3_details() on the whole chunk.
+    """
+    parsed_details: Dict[str, List[Dict]] = {key: [] for key in S3_PARSED_DETAIL_KEYS}
+    pieces = [s3_details[i: i + S3_PARSE_CHUNK_SIZE] for i in range(0, len(s3_details), S3_PARSE_CHUNK_SIZE)]
+    for parsed_piece in executor.map(parse_s3_details, pieces, [aws_account_id] * len(pieces)):
+        for key in S3_PARSED_DETAIL_KEYS:
+            parsed_details[key].extend(parsed_piece[key])
+    return parsed_details
 
-    _load_s3_policies(neo4j_session, policies, update_tag)
-    _load_s3_policy_statements(neo4j_session, statements, update_tag)
-    _load_s3_encryption(neo4j_session, encryption_configs, update_tag)
-    _load_s3_versioning(neo4j_session, versioning_configs, update_tag)
-    _load_s3_public_access_block(neo4j_session, public_access_block_configs, update_tag)
-    _set_default_values(neo4j_session, aws_account_id)
+
+def _load_parsed_s3_details(
+    neo4j_session: neo4j.Session, parsed_details: Dict[str, List[Dict]], aws_account_id: str, update_tag: int,
+) -> None:
+    _load_s3_acls(neo4j_session, parsed_details['acls'], aws_account_id, update_tag, run_acl_analysis=False)
+    _load_s3_policies(neo4j_session, parsed_details['policies'], update_tag)
+    _load_s3_policy_statements(neo4j_session, parsed_details['statements'], update_tag)
+    _load_s3_encryption(neo4j_session, parsed_details['encryption_configs'], update_tag)
+    _load_s3_versioning(neo4j_session, parsed_details['versioning_configs'], update_tag)
+    _load_s3_public_access_block(neo4j_session, parsed_details['public_access_block_configs'], update_tag)
 
 
 @timeit
@@ -491,20 +571,25 @@ def parse_policy(bucket: str, policyDict: Optional[Dict]) -> Optional[Dict]:
     # }
     if policyDict is None:
         return None
-    # get just the policy element and convert to JSON because boto3 returns this as string
-    policy = Policy(json.loads(policyDict['Policy']))
+    internet_accessible, accessible_actions = _get_policy_internet_exposure(policyDict['Policy'])
+    return {
+        "bucket": bucket,
+        "internet_accessible": internet_accessible,
+        "accessible_actions": list(accessible_actions),
+    }
+
+
+@lru_cache(maxsize=S3_POLICY_CACHE_SIZE)
+def _get_policy_internet_exposure(policy_document: str) -> Tuple[bool, Tuple[str, ...]]:
+    """
+    Returns whether the policy document is internet accessible and which actions it exposes. Policy analysis is
+    expensive and many buckets share the same templated policy, so results are memoized by policy document.
+    """
+    # boto3 returns the policy element as a string, so convert it to JSON
+    policy = Policy(json.loads(policy_document))
     if policy.is_internet_accessible():
-        return {
-            "bucket": bucket,
-            "internet_accessible": True,
-            "accessible_actions": list(policy.internet_accessible_actions()),
-        }
-    else:
-        return {
-            "bucket": bucket,
-            "internet_accessible": False,
-            "accessible_actions": [],
-        }
+        return True, tuple(policy.internet_accessible_actions())
+    return False, ()
 
 
 @timeit
@@ -747,7 +832,13 @@ def sync(
     cleanup_s3_buckets(neo4j_session, common_job_parameters)
 
     acl_and_policy_data_iter = get_s3_bucket_details(boto3_session, bucket_data)
-    load_s3_details(neo4j_session, acl_and_policy_data_iter, current_aws_account_id, update_tag)
+    load_s3_details(
+        neo4j_session,
+        acl_and_policy_data_iter,
+        current_aws_account_id,
+        update_tag,
+        parse_workers=common_job_parameters.get("aws_s3_parse_workers") or 1,
+    )
     cleanup_s3_bucket_acl_and_policy(neo4j_session, common_job_parameters)
 
     merge_module_sync_metadata(
@@ -0,0 +1,115 @@
+import json
+import logging
+import sqlite3
+import time
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 100000
+DEFAULT_TTL = 86400
+
+
+class MetadataCache:
+    """
+    On-disk cache for metadata of rarely changing AWS resources (e.g. AMIs), persisted in a SQLite file so that it is
+    shared across syncs. Entries are grouped by namespace and keyed by resource id, and are used for `ttl` seconds after
+    they are stored. Once the cache holds more than `max_entries` entries, the least recently used ones are evicted.
+    """
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: int = DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS metadata_cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                stored_at REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (namespace, key)
+            )
+            """,
+        )
+        # Entries of caches created before entries expired are treated as expired
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(metadata_cache)")]
+        if 'stored_at' not in columns:
+            self._conn.execute("ALTER TABLE metadata_cache ADD COLUMN stored_at REAL NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS metadata_cache_last_used ON metadata_cache (last_used)")
+        self._conn.commit()
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Returns the cached values for the given keys, omitting the keys that are not cached or have expired.
+        """
+        keys = list(set(keys))
+        found: Dict[str, Any] = {}
+        expiry = time.time() - self.ttl
+        # Stay well below SQLite's limit on the number of bound parameters
+        for i in range(0, len(keys), 500):
+            chunk = keys[i: i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT key, value FROM metadata_cache "
+                f"WHERE namespace = ? AND stored_at > ? AND key IN ({placeholders})",
+                [namespace, expiry, *chunk],
+            )
+            for key, value in rows:
+                found[key] = json.loads(value)
+        if found:
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE metadata_cache SET last_used = ? WHERE namespace = ? AND key = ?",
+                [(now, namespace, key) for key in found],
+            )
+            self._conn.commit()
+        return found
+
+    def put_many(self, namespace: str, items: Dict[str, Any]) -> None:
+        """
+        Stores the given values, then evicts the least recently used entries if the cache is over its size.
+        """
+        if not items:
+            return
+        now = time.time()
+        self._conn.executemany(
+            """
+            INSERT OR REPLACE INTO metadata_cache (namespace, key, value, last_used, stored_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [(namespace, key, json.dumps(value, default=str), now, now) for key, value in items.items()],
+        )
+        (size,) = self._conn.execute("SELECT COUNT(*) FROM metadata_cache").fetchone()
+        if size > self.max_entries:
+            logger.debug(f"Evicting {size - self.max_entries} entries from the metadata cache.")
+            self._conn.execute(
+                """
+                DELETE FROM metadata_cache WHERE rowid IN (
+                    SELECT rowid FROM metadata_cache ORDER BY last_used LIMIT ?
+                )
+                """,
+                (size - self.max_entries,),
+            )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def get_metadata_cache(common_job_parameters: Dict[str, Any]) -> Optional[MetadataCache]:
+    """
+    Opens the metadata cache configured for this sync, or returns None if no cache is configured.
+    """
+    path = common_job_parameters.get("aws_metadata_cache_path")
+    if not path:
+        return None
+    return MetadataCache(
+        path,
+        max_entries=common_job_parameters.get("aws_metadata_cache_max_entries") or DEFAULT_MAX_ENTRIES,
+        ttl=common_job_parameters.get("aws_metadata_cache_ttl") or DEFAULT_TTL,
+    )
@@ -1,4 +1,5 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -11,8 +12,10 @@ from . import sql
 from . import storage
 from . import subscription
 from . import tenant
+from .util.clients import get_cached_credential
 from .util.credentials import Authenticator
 from .util.credentials import Credentials
+from cartography.client.core.session import SerializedSession
 from cartography.config import Config
 from cartography.util import timeit
 
@@ -23,10 +26,22 @@ def _sync_one_subscription(
     neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str, update_tag: int,
     common_job_parameters: Dict,
 ) -> None:
-    compute.sync(neo4j_session, credentials.arm_credentials, subscription_id, update_tag, common_job_parameters)
-    cosmosdb.sync(neo4j_session, credentials.arm_credentials, subscription_id, update_tag, common_job_parameters)
-    sql.sync(neo4j_session, credentials.arm_credentials, subscription_id, update_tag, common_job_parameters)
-    storage.sync(neo4j_session, credentials.arm_credentials, subscription_id, update_tag, common_job_parameters)
+    # Every management client of the subscription shares the tokens of the ARM credentials
+    arm_credentials = get_cached_credential(credentials.arm_credentials)
+    compute.sync(neo4j_session, arm_credentials, subscription_id, update_tag, common_job_parameters)
+    cosmosdb.sync(neo4j_session, arm_credentials, subscription_id, update_tag, common_job_parameters)
+    sql.sync(neo4j_session, arm_credentials, subscription_id, update_tag, common_job_parameters)
+    storage.sync(neo4j_session, arm_credentials, subscription_id, update_tag, common_job_parameters)
+
+
+def _sync_subscription(
+    neo4j_session: neo4j.Session, credentials: Credentials, subscription_id: str, update_tag: int,
+    common_job_parameters: Dict,
+) -> None:
+    logger.info("Syncing Azure Subscription with ID '%s'", subscription_id)
+    # Each subscription gets its own parameters, so that concurrent subscriptions do not overwrite each other's ID
+    subscription_job_parameters = {**common_job_parameters, 'AZURE_SUBSCRIPTION_ID': subscription_id}
+    _sync_one_subscription(neo4j_session, credentials, subscription_id, update_tag, subscription_job_parameters)
 
 
 def _sync_tenant(
@@ -41,17 +56,38 @@ def _sync_multiple_subscriptions(
     neo4j_session: neo4j.Session, credentials: Credentials, tenant_id: str, subscriptions: List[Dict],
     update_tag: int, common_job_parameters: Dict,
 ) -> None:
+    """
+    Syncs the given subscriptions. If `azure_subscription_workers` in common_job_parameters is greater than 1, that many
+    subscriptions are synced concurrently. The workers share the Neo4j session one call at a time, so the data of each
+    subscription is still loaded in order.
+    """
     logger.info("Syncing Azure subscriptions")
 
     subscription.sync(neo4j_session, tenant_id, subscriptions, update_tag, common_job_parameters)
 
-    for sub in subscriptions:
-        logger.info("Syncing Azure Subscription with ID '%s'", sub['subscriptionId'])
-        common_job_parameters['AZURE_SUBSCRIPTION_ID'] = sub['subscriptionId']
-
-        _sync_one_subscription(neo4j_session, credentials, sub['subscriptionId'], update_tag, common_job_parameters)
+    workers = common_job_parameters.get('azure_subscription_workers') or 1
+    if workers <= 1:
+        for sub in subscriptions:
+            _sync_subscription(neo4j_session, credentials, sub['subscriptionId'], update_tag, common_job_parameters)
+        return
 
-    del common_job_parameters["AZURE_SUBSCRIPTION_ID"]
+    serialized_session = SerializedSession(neo4j_session)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _sync_subscription,
+                serialized_session, credentials, sub['subscriptionId'], update_tag, common_job_parameters,
+            )
+            for sub in subscriptions
+        ]
+        try:
+            for future in futures:
+                future.result()
+        except Exception:
+            # Fail the sync as the sequential one would, without starting the subscriptions that are still queued.
+            for future in futures:
+                future.cancel()
+            raise
 
 
 @timeit
@@ -59,6 +95,7 @@ def start_azure_ingestion(neo4j_session: neo4j.Session, config: Config) -> None:
     common_job_parameters = {
         "UPDATE_TAG": config.update_tag,
         "permission_relationships_file": config.permission_relationships_file,
+        "azure_subscription_workers": config.azure_subscription_workers,
     }
 
     try:
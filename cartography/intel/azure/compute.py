@@ -6,6 +6,7 @@ import neo4j
 from azure.core.exceptions import HttpResponseError
 from azure.mgmt.compute import ComputeManagementClient
 
+from .util.clients import get_management_client
 from .util.credentials import Credentials
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
@@ -14,7 +15,7 @@ logger = logging.getLogger(__name__)
 
 
 def get_client(credentials: Credentials, subscription_id: str) -> ComputeManagementClient:
-    client = ComputeManagementClient(credentials, subscription_id)
+    client = get_management_client(ComputeManagementClient, credentials, subscription_id)
     return client
 
 
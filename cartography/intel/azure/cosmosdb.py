@@ -1,6 +1,9 @@
 import logging
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import Generator
 from typing import List
@@ -12,22 +15,37 @@ from azure.core.exceptions import HttpResponseError
 from azure.core.exceptions import ResourceNotFoundError
 from azure.mgmt.cosmosdb import CosmosDBManagementClient
 
+from .util.clients import get_management_client
 from .util.credentials import Credentials
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of concurrent ARM requests made while enumerating the resources of the database accounts
+MAX_CONCURRENT_REQUESTS = 10
+
 
 @timeit
 def get_client(credentials: Credentials, subscription_id: str) -> CosmosDBManagementClient:
     """
     Getting the CosmosDB client
     """
-    client = CosmosDBManagementClient(credentials, subscription_id)
+    client = get_management_client(CosmosDBManagementClient, credentials, subscription_id)
     return client
 
 
+def _fetch_concurrently(fetches: List[Callable[[], List[Dict]]]) -> List[List[Dict]]:
+    """
+    Runs the given fetches on a bounded thread pool, and returns their results in the same order.
+    """
+    if not fetches:
+        return []
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(fetches))) as executor:
+        futures = [executor.submit(fetch) for fetch in fetches]
+        return [future.result() for future in futures]
+
+
 @timeit
 def get_database_account_list(credentials: Credentials, subscription_id: str) -> List[Dict]:
     """
@@ -130,122 +148,130 @@ def sync_database_account_data_resources(
     This function calls the load functions for the resources that are present as a part of the database account
     response (like cors policy, failover policy, private endpoint connections, virtual network rules and locations).
     """
-    for database_account in database_account_list:
-        _load_cosmosdb_cors_policy(neo4j_session, database_account, azure_update_tag)
-        _load_cosmosdb_failover_policies(neo4j_session, database_account, azure_update_tag)
-        _load_cosmosdb_private_endpoint_connections(neo4j_session, database_account, azure_update_tag)
-        _load_cosmosdb_virtual_network_rules(neo4j_session, database_account, azure_update_tag)
-        _load_database_account_write_locations(neo4j_session, database_account, azure_update_tag)
-        _load_database_account_read_locations(neo4j_session, database_account, azure_update_tag)
-        _load_database_account_associated_locations(neo4j_session, database_account, azure_update_tag)
+    _load_cosmosdb_cors_policy(neo4j_session, database_account_list, azure_update_tag)
+    _load_cosmosdb_failover_policies(neo4j_session, database_account_list, azure_update_tag)
+    _load_cosmosdb_private_endpoint_connections(neo4j_session, database_account_list, azure_update_tag)
+    _load_cosmosdb_virtual_network_rules(neo4j_session, database_account_list, azure_update_tag)
+    _load_database_account_write_locations(neo4j_session, database_account_list, azure_update_tag)
+    _load_database_account_read_locations(neo4j_session, database_account_list, azure_update_tag)
+    _load_database_account_associated_locations(neo4j_session, database_account_list, azure_update_tag)
+
+
+def _get_database_account_children(database_account_list: List[Dict], key: str) -> List[Dict]:
+    """
+    Collects the items of the given list property of every database account, each with the id of its account, so that
+    they are loaded in a single query.
+    """
+    return [
+        {**item, 'database_account_id': database_account['id']}
+        for database_account in database_account_list
+        for item in database_account.get(key) or []
+    ]
 
 
 @timeit
 def _load_database_account_write_locations(
-        neo4j_session: neo4j.Session, database_account: Dict, azure_update_tag: int,
+        neo4j_session: neo4j.Session, database_account_list: List[Dict], azure_update_tag: int,
 ) -> None:
     """
     Ingest the details of location with write permission enabled.
     """
-    if 'write_locations' in database_account and len(database_account['write_locations']) > 0:
-        database_account_id = database_account['id']
-        write_locations = database_account['write_locations']
-
-        ingest_write_location = """
-        UNWIND $write_locations_list as wl
-        MERGE (loc:AzureCosmosDBLocation{id: wl.id})
-        ON CREATE SET loc.firstseen = timestamp()
-        SET loc.lastupdated = $azure_update_tag,
-        loc.locationname = wl.location_name,
-        loc.documentendpoint = wl.document_endpoint,
-        loc.provisioningstate = wl.provisioning_state,
-        loc.failoverpriority = wl.failover_priority,
-        loc.iszoneredundant = wl.is_zone_redundant
-        WITH loc
-        MATCH (d:AzureCosmosDBAccount{id: $DatabaseAccountId})
-        MERGE (d)-[r:CAN_WRITE_FROM]->(loc)
-        ON CREATE SET r.firstseen = timestamp()
-        SET r.lastupdated = $azure_update_tag
-        """
-
-        neo4j_session.run(
-            ingest_write_location,
-            write_locations_list=write_locations,
-            DatabaseAccountId=database_account_id,
-            azure_update_tag=azure_update_tag,
-        )
+    write_locations = _get_database_account_children(database_account_list, 'write_locations')
+    if not write_locations:
+        return
+
+    ingest_write_location = """
+    UNWIND $write_locations_list as wl
+    MERGE (loc:AzureCosmosDBLocation{id: wl.id})
+    ON CREATE SET loc.firstseen = timestamp()
+    SET loc.lastupdated = $azure_update_tag,
+    loc.locationname = wl.location_name,
+    loc.documentendpoint = wl.document_endpoint,
+    loc.provisioningstate = wl.provisioning_state,
+    loc.failoverpriority = wl.failover_priority,
+    loc.iszoneredundant = wl.is_zone_redundant
+    WITH loc, wl
+    MATCH (d:AzureCosmosDBAccount{id: wl.database_account_id})
+    MERGE (d)-[r:CAN_WRITE_FROM]->(loc)
+    ON CREATE SET r.firstseen = timestamp()
+    SET r.lastupdated = $azure_update_tag
+    """
+
+    neo4j_session.run(
+        ingest_write_location,
+        write_locations_list=write_locations,
+        azure_update_tag=azure_update_tag,
+    )
 
 
 @timeit
 def _load_database_account_read_locations(
-        neo4j_session: neo4j.Session, database_account: Dict, azure_update_tag: int,
+        neo4j_session: neo4j.Session, database_account_list: List[Dict], azure_update_tag: int,
 ) -> None:
     """
     Ingest the details of location with read permission enabled.
     """
-    if 'read_locations' in database_account and len(database_account['read_locations']) > 0:
-        database_account_id = database_account['id']
-        read_locations = database_account['read_locations']
-
-        ingest_read_location = """
-        UNWIND $read_locations_list as rl
-        MERGE (loc:AzureCosmosDBLocation{id: rl.id})
-        ON CREATE SET loc.firstseen = timestamp()
-        SET loc.lastupdated = $azure_update_tag,
-        loc.locationname = rl.location_name,
-        loc.documentendpoint = rl.document_endpoint,
-        loc.provisioningstate = rl.provisioning_state,
-        loc.failoverpriority = rl.failover_priority,
-        loc.iszoneredundant = rl.is_zone_redundant
-        WITH loc
-        MATCH (d:AzureCosmosDBAccount{id: $DatabaseAccountId})
-        MERGE (d)-[r:CAN_READ_FROM]->(loc)
-        ON CREATE SET r.firstseen = timestamp()
-        SET r.lastupdated = $azure_update_tag
-        """
-
-        neo4j_session.run(
-            ingest_read_location,
-            read_locations_list=read_locations,
-            DatabaseAccountId=database_account_id,
-            azure_update_tag=azure_update_tag,
-        )
+    read_locations = _get_database_account_children(database_account_list, 'read_locations')
+    if not read_locations:
+        return
+
+    ingest_read_location = """
+    UNWIND $read_locations_list as rl
+    MERGE (loc:AzureCosmosDBLocation{id: rl.id})
+    ON CREATE SET loc.firstseen = timestamp()
+    SET loc.lastupdated = $azure_update_tag,
+    loc.locationname = rl.location_name,
+    loc.documentendpoint = rl.document_endpoint,
+    loc.provisioningstate = rl.provisioning_state,
+    loc.failoverpriority = rl.failover_priority,
+    loc.iszoneredundant = rl.is_zone_redundant
+    WITH loc, rl
+    MATCH (d:AzureCosmosDBAccount{id: rl.database_account_id})
+    MERGE (d)-[r:CAN_READ_FROM]->(loc)
+    ON CREATE SET r.firstseen = timestamp()
+    SET r.lastupdated = $azure_update_tag
+    """
+
+    neo4j_session.run(
+        ingest_read_location,
+        read_locations_list=read_locations,
+        azure_update_tag=azure_update_tag,
+    )
 
 
 @timeit
 def _load_database_account_associated_locations(
-        neo4j_session: neo4j.Session, database_account: Dict, azure_update_tag: int,
+        neo4j_session: neo4j.Session, database_account_list: List[Dict], azure_update_tag: int,
 ) -> None:
     """
-    Ingest the details of enabled location for the database account.
-    """
-    if 'locations' in database_account and len(database_account['locations']) > 0:
-        database_account_id = database_account['id']
-        associated_locations = database_account['locations']
-
-        ingest_associated_location = """
-        UNWIND $associated_locations_list as al
-        MERGE (loc:AzureCosmosDBLocation{id: al.id})
-        ON CREATE SET loc.firstseen = timestamp()
-        SET loc.lastupdated = $azure_update_tag,
-        loc.locationname = al.location_name,
-        loc.documentendpoint = al.document_endpoint,
-        loc.provisioningstate = al.provisioning_state,
-        loc.failoverpriority = al.failover_priority,
-        loc.iszoneredundant = al.is_zone_redundant
-        WITH loc
-        MATCH (d:AzureCosmosDBAccount{id: $DatabaseAccountId})
-        MERGE (d)-[r:ASSOCIATED_WITH]->(loc)
-        ON CREATE SET r.firstseen = timestamp()
-        SET r.lastupdated = $azure_update_tag
-        """
-
-        neo4j_session.run(
-            ingest_associated_location,
-            associated_locations_list=associated_locations,
-            DatabaseAccountId=database_account_id,
-            azure_update_tag=azure_update_tag,
-        )
+    Ingest the details of enabled location for the database accounts.
+    """
+    associated_locations = _get_database_account_children(database_account_list, 'locations')
+    if not associated_locations:
+        return
+
+    ingest_associated_location = """
+    UNWIND $associated_locations_list as al
+    MERGE (loc:AzureCosmosDBLocation{id: al.id})
+    ON CREATE SET loc.firstseen = timestamp()
+    SET loc.lastupdated = $azure_update_tag,
+    loc.locationname = al.location_name,
+    loc.documentendpoint = al.document_endpoint,
+    loc.provisioningstate = al.provisioning_state,
+    loc.failoverpriority = al.failover_priority,
+    loc.iszoneredundant = al.is_zone_redundant
+    WITH loc, al
+    MATCH (d:AzureCosmosDBAccount{id: al.database_account_id})
+    MERGE (d)-[r:ASSOCIATED_WITH]->(loc)
+    ON CREATE SET r.firstseen = timestamp()
+    SET r.lastupdated = $azure_update_tag
+    """
+
+    neo4j_session.run(
+        ingest_associated_location,
+        associated_locations_list=associated_locations,
+        azure_update_tag=azure_update_tag,
+    )
 
 
 @timeit
@@ -262,141 +288,137 @@ def transform_cosmosdb_cors_policy(database_account: Dict) -> Dict:
 
 @timeit
 def _load_cosmosdb_cors_policy(
-        neo4j_session: neo4j.Session, database_account: Dict, azure_update_tag: int,
+        neo4j_session: neo4j.Session, database_account_list: List[Dict], azure_update_tag: int,
 ) -> None:
     """
-    Ingest the details of the Cors Policy of the database account.
-    """
-    if 'cors' in database_account and len(database_account['cors']) > 0:
-        database_account = transform_cosmosdb_cors_policy(database_account)
-        database_account_id = database_account['id']
-        cors_policies = database_account['cors']
-
-        ingest_cors_policy = """
-        UNWIND $cors_policies_list AS cp
-        MERGE (corspolicy:AzureCosmosDBCorsPolicy{id: cp.cors_policy_unique_id})
-        ON CREATE SET corspolicy.firstseen = timestamp(),
-        corspolicy.allowedorigins = cp.allowed_origins
-        SET corspolicy.lastupdated = $azure_update_tag,
-        corspolicy.allowedmethods = cp.allowed_methods,
-        corspolicy.allowedheaders = cp.allowed_headers,
-        corspolicy.exposedheaders = cp.exposed_headers,
-        corspolicy.maxageinseconds = cp.max_age_in_seconds
-        WITH corspolicy
-        MATCH (d:AzureCosmosDBAccount{id: $DatabaseAccountId})
-        MERGE (d)-[r:CONTAINS]->(corspolicy)
-        ON CREATE SET r.firstseen = timestamp()
-        SET r.lastupdated = $azure_update_tag
-        """
-
-        neo4j_session.run(
-            ingest_cors_policy,
-            cors_policies_list=cors_policies,
-            DatabaseAccountId=database_account_id,
-            azure_update_tag=azure_update_tag,
-        )
+    Ingest the details of the Cors Policy of the database accounts.
+    """
+    for database_account in database_account_list:
+        if 'cors' in database_account:
+            transform_cosmosdb_cors_policy(database_account)
+    cors_policies = _get_database_account_children(database_account_list, 'cors')
+    if not cors_policies:
+        return
+
+    ingest_cors_policy = """
+    UNWIND $cors_policies_list AS cp
+    MERGE (corspolicy:AzureCosmosDBCorsPolicy{id: cp.cors_policy_unique_id})
+    ON CREATE SET corspolicy.firstseen = timestamp(),
+    corspolicy.allowedorigins = cp.allowed_origins
+    SET corspolicy.lastupdated = $azure_update_tag,
+    corspolicy.allowedmethods = cp.allowed_methods,
+    corspolicy.allowedheaders = cp.allowed_headers,
+    corspolicy.exposedheaders = cp.exposed_headers,
+    corspolicy.maxageinseconds = cp.max_age_in_seconds
+    WITH corspolicy, cp
+    MATCH (d:AzureCosmosDBAccount{id: cp.database_account_id})
+    MERGE (d)-[r:CONTAINS]->(corspolicy)
+    ON CREATE SET r.firstseen = timestamp()
+    SET r.lastupdated = $azure_update_tag
+    """
+
+    neo4j_session.run(
+        ingest_cors_policy,
+        cors_policies_list=cors_policies,
+        azure_update_tag=azure_update_tag,
+    )
 
 
 @timeit
 def _load_cosmosdb_failover_policies(
-        neo4j_session: neo4j.Session, database_account: Dict, azure_update_tag: int,
+        neo4j_session: neo4j.Session, database_account_list: List[Dict], azure_update_tag: int,
 ) -> None:
     """
-    Ingest the details of the Failover Policies of the database account.
-    """
-    if 'failover_policies' in database_account and len(database_account['failover_policies']) > 0:
-        database_account_id = database_account['id']
-        failover_policies = database_account['failover_policies']
-
-        ingest_failover_policies = """
-        UNWIND $failover_policies_list AS fp
-        MERGE (fpolicy:AzureCosmosDBAccountFailoverPolicy{id: fp.id})
-        ON CREATE SET fpolicy.firstseen = timestamp()
-        SET fpolicy.lastupdated = $azure_update_tag,
-        fpolicy.locationname = fp.location_name,
-        fpolicy.failoverpriority = fp.failover_priority
-        WITH fpolicy
-        MATCH (d:AzureCosmosDBAccount{id: $DatabaseAccountId})
-        MERGE (d)-[r:CONTAINS]->(fpolicy)
-        ON CREATE SET r.firstseen = timestamp()
-        SET r.lastupdated = $azure_update_tag
-        """
-
-        neo4j_session.run(
-            ingest_failover_policies,
-            failover_policies_list=failover_policies,
-            DatabaseAccountId=database_account_id,
-            azure_update_tag=azure_update_tag,
-        )
+    Ingest the details of the Failover Policies of the database accounts.
+    """
+    failover_policies = _get_database_account_children(database_account_list, 'failover_policies')
+    if not failover_policies:
+        return
+
+    ingest_failover_policies = """
+    UNWIND $failover_policies_list AS fp
+    MERGE (fpolicy:AzureCosmosDBAccountFailoverPolicy{id: fp.id})
+    ON CREATE SET fpolicy.firstseen = timestamp()
+    SET fpolicy.lastupdated = $azure_update_tag,
+    fpolicy.locationname = fp.location_name,
+    fpolicy.failoverpriority = fp.failover_priority
+    WITH fpolicy, fp
+    MATCH (d:AzureCosmosDBAccount{id: fp.database_account_id})
+    MERGE (d)-[r:CONTAINS]->(fpolicy)
+    ON CREATE SET r.firstseen = timestamp()
+    SET r.lastupdated = $azure_update_tag
+    """
+
+    neo4j_session.run(
+        ingest_failover_policies,
+        failover_policies_list=failover_policies,
+        azure_update_tag=azure_update_tag,
+    )
 
 
 @timeit
 def _load_cosmosdb_private_endpoint_connections(
-        neo4j_session: neo4j.Session, database_account: Dict, azure_update_tag: int,
+        neo4j_session: neo4j.Session, database_account_list: List[Dict], azure_update_tag: int,
 ) -> None:
     """
-    Ingest the details of the Private Endpoint Connections of the database account.
-    """
-    if 'private_endpoint_connections' in database_account and len(
-            database_account['private_endpoint_connections'],
-    ) > 0:
-        database_account_id = database_account['id']
-        private_endpoint_connections = database_account['private_endpoint_connections']
-
-        ingest_private_endpoint_connections = """
-        UNWIND $private_endpoint_connections_list AS connection
-        MERGE (pec:AzureCDBPrivateEndpointConnection{id: connection.id})
-        ON CREATE SET pec.firstseen = timestamp()
-        SET pec.lastupdated = $azure_update_tag,
-        pec.name = connection.name,
-        pec.privateendpointid = connection.private_endpoint.id,
-        pec.status = connection.private_link_service_connection_state.status,
-        pec.actionrequired = connection.private_link_service_connection_state.actions_required
-        WITH pec
-        MATCH (d:AzureCosmosDBAccount{id: $DatabaseAccountId})
-        MERGE (d)-[r:CONFIGURED_WITH]->(pec)
-        ON CREATE SET r.firstseen = timestamp()
-        SET r.lastupdated = $azure_update_tag
-        """
-
-        neo4j_session.run(
-            ingest_private_endpoint_connections,
-            private_endpoint_connections_list=private_endpoint_connections,
-            DatabaseAccountId=database_account_id,
-            azure_update_tag=azure_update_tag,
-        )
+    Ingest the details of the Private Endpoint Connections of the database accounts.
+    """
+    private_endpoint_connections = _get_database_account_children(database_account_list, 'private_endpoint_connections')
+    if not private_endpoint_connections:
+        return
+
+    ingest_private_endpoint_connections = """
+    UNWIND $private_endpoint_connections_list AS connection
+    MERGE (pec:AzureCDBPrivateEndpointConnection{id: connection.id})
+    ON CREATE SET pec.firstseen = timestamp()
+    SET pec.lastupdated = $azure_update_tag,
+    pec.name = connection.name,
+    pec.privateendpointid = connection.private_endpoint.id,
+    pec.status = connection.private_link_service_connection_state.status,
+    pec.actionrequired = connection.private_link_service_connection_state.actions_required
+    WITH pec, connection
+    MATCH (d:AzureCosmosDBAccount{id: connection.database_account_id})
+    MERGE (d)-[r:CONFIGURED_WITH]->(pec)
+    ON CREATE SET r.firstseen = timestamp()
+    SET r.lastupdated = $azure_update_tag
+    """
+
+    neo4j_session.run(
+        ingest_private_endpoint_connections,
+        private_endpoint_connections_list=private_endpoint_connections,
+        azure_update_tag=azure_update_tag,
+    )
 
 
 @timeit
 def _load_cosmosdb_virtual_network_rules(
-        neo4j_session: neo4j.Session, database_account: Dict, azure_update_tag: int,
+        neo4j_session: neo4j.Session, database_account_list: List[Dict], azure_update_tag: int,
 ) -> None:
     """
-    Ingest the details of the Virtual Network Rules of the database account.
-    """
-    if 'virtual_network_rules' in database_account and len(database_account['virtual_network_rules']) > 0:
-        database_account_id = database_account['id']
-        virtual_network_rules = database_account['virtual_network_rules']
-
-        ingest_virtual_network_rules = """
-        UNWIND $virtual_network_rules_list AS vnr
-        MERGE (rules:AzureCosmosDBVirtualNetworkRule{id: vnr.id})
-        ON CREATE SET rules.firstseen = timestamp()
-        SET rules.lastupdated = $azure_update_tag,
-        rules.ignoremissingvnetserviceendpoint = vnr.ignore_missing_v_net_service_endpoint
-        WITH rules
-        MATCH (d:AzureCosmosDBAccount{id: $DatabaseAccountId})
-        MERGE (d)-[r:CONFIGURED_WITH]->(rules)
-        ON CREATE SET r.firstseen = timestamp()
-        SET r.lastupdated = $azure_update_tag
-        """
-
-        neo4j_session.run(
-            ingest_virtual_network_rules,
-            virtual_network_rules_list=virtual_network_rules,
-            DatabaseAccountId=database_account_id,
-            azure_update_tag=azure_update_tag,
-        )
+    Ingest the details of the Virtual Network Rules of the database accounts.
+    """
+    virtual_network_rules = _get_database_account_children(database_account_list, 'virtual_network_rules')
+    if not virtual_network_rules:
+        return
+
+    ingest_virtual_network_rules = """
+    UNWIND $virtual_network_rules_list AS vnr
+    MERGE (rules:AzureCosmosDBVirtualNetworkRule{id: vnr.id})
+    ON CREATE SET rules.firstseen = timestamp()
+    SET rules.lastupdated = $azure_update_tag,
+    rules.ignoremissingvnetserviceendpoint = vnr.ignore_missing_v_net_service_endpoint
+    WITH rules, vnr
+    MATCH (d:AzureCosmosDBAccount{id: vnr.database_account_id})
+    MERGE (d)-[r:CONFIGURED_WITH]->(rules)
+    ON CREATE SET r.firstseen = timestamp()
+    SET r.lastupdated = $azure_update_tag
+    """
+
+    neo4j_session.run(
+        ingest_virtual_network_rules,
+        virtual_network_rules_list=virtual_network_rules,
+        azure_update_tag=azure_update_tag,
+    )
 
 
 @timeit
@@ -416,11 +438,16 @@ def get_database_account_details(
     Iterate over the database accounts and return the list of SQL and MongoDB databases, Cassandra keyspaces and
     table resources associated with each database account.
     """
-    for database_account in database_account_list:
-        sql_databases = get_sql_databases(credentials, subscription_id, database_account)
-        cassandra_keyspaces = get_cassandra_keyspaces(credentials, subscription_id, database_account)
-        mongodb_databases = get_mongodb_databases(credentials, subscription_id, database_account)
-        table_resources = get_table_resources(credentials, subscription_id, database_account)
+    getters = [get_sql_databases, get_cassandra_keyspaces, get_mongodb_databases, get_table_resources]
+    results = _fetch_concurrently([
+        partial(getter, credentials, subscription_id, database_account)
+        for database_account in database_account_list
+        for getter in getters
+    ])
+    for i, database_account in enumerate(database_account_list):
+        sql_databases, cassandra_keyspaces, mongodb_databases, table_resources = results[
+            i * len(getters): (i + 1) * len(getters)
+        ]
         yield database_account['id'], database_account['name'], database_account[
             'resourceGroup'
         ], sql_databases, cassandra_keyspaces, mongodb_databases, table_resources
@@ -743,9 +770,11 @@ def get_sql_database_details(
     """
     Iterate over the SQL databases to retrieve the SQL containers in them.
     """
-    for database in sql_databases:
-        containers = get_sql_containers(credentials, subscription_id, database)
-        yield database['id'], containers
+    containers = _fetch_concurrently([
+        partial(get_sql_containers, credentials, subscription_id, database) for database in sql_databases
+    ])
+    for database, database_containers in zip(sql_databases, containers):
+        yield database['id'], database_containers
 
 
 @timeit
@@ -846,9 +875,11 @@ def get_cassandra_keyspace_details(
     """
     Iterate through the Cassandra keyspaces to get the list of tables in each keyspace.
     """
-    for keyspace in cassandra_keyspaces:
-        cassandra_tables = get_cassandra_tables(credentials, subscription_id, keyspace)
-        yield keyspace['id'], cassandra_tables
+    cassandra_tables = _fetch_concurrently([
+        partial(get_cassandra_tables, credentials, subscription_id, keyspace) for keyspace in cassandra_keyspaces
+    ])
+    for keyspace, keyspace_tables in zip(cassandra_keyspaces, cassandra_tables):
+        yield keyspace['id'], keyspace_tables
 
 
 @timeit
@@ -948,9 +979,11 @@ def get_mongodb_databases_details(
     """
     Iterate through the MongoDB Databases to get the list of collections in each mongoDB database.
     """
-    for database in mongodb_databases:
-        collections = get_mongodb_collections(credentials, subscription_id, database)
-        yield database['id'], collections
+    collections = _fetch_concurrently([
+        partial(get_mongodb_collections, credentials, subscription_id, database) for database in mongodb_databases
+    ])
+    for database, database_collections in zip(mongodb_databases, collections):
+        yield database['id'], database_collections
 
 
 @timeit
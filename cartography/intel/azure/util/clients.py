@@ -0,0 +1,78 @@
+import logging
+import threading
+import time
+from typing import Any
+from typing import Dict
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+
+from azure.core.credentials import AccessToken
+
+logger = logging.getLogger(__name__)
+
+# Tokens are acquired again this many seconds before they expire
+TOKEN_REFRESH_MARGIN = 300
+
+ClientT = TypeVar('ClientT')
+
+_lock = threading.Lock()
+_cached_credentials: Dict[int, Tuple[Any, 'CachedTokenCredential']] = {}
+_management_clients: Dict[Tuple[type, str, int], Tuple[Any, Any]] = {}
+
+
+class CachedTokenCredential:
+    """
+    Wraps an azure-core TokenCredential so that the tokens it acquires are shared by every management client built
+    from it, instead of each client acquiring its own tokens. Tokens are reused until they are about to expire.
+    """
+
+    def __init__(self, credential: Any, refresh_margin: int = TOKEN_REFRESH_MARGIN):
+        self._credential = credential
+        self.refresh_margin = refresh_margin
+        self._tokens: Dict[Tuple[Any, ...], AccessToken] = {}
+        self._lock = threading.Lock()
+
+    def get_token(self, *scopes: str, **kwargs: Any) -> AccessToken:
+        if kwargs.get('claims'):
+            # Claims challenges ask for a new token, which is never cached
+            return self._credential.get_token(*scopes, **kwargs)
+        key = (scopes, kwargs.get('tenant_id'))
+        with self._lock:
+            cached = self._tokens.get(key)
+            if cached is not None and cached.expires_on - self.refresh_margin > time.time():
+                return cached
+            logger.debug(f"Acquiring Azure token for {', '.join(scopes)}.")
+            token: AccessToken = self._credential.get_token(*scopes, **kwargs)
+            self._tokens[key] = token
+            return token
+
+
+def get_cached_credential(credential: Any) -> Any:
+    """
+    Returns the process-wide CachedTokenCredential of the given credential. Credentials that do not implement the
+    azure-core `get_token()` protocol (e.g. msrest credentials of the Azure CLI) are returned unchanged.
+    """
+    if not hasattr(credential, 'get_token'):
+        return credential
+    with _lock:
+        # The credential is kept in the entry so that its id cannot be reused by another object
+        entry = _cached_credentials.get(id(credential))
+        if entry is None or entry[0] is not credential:
+            entry = (credential, CachedTokenCredential(credential))
+            _cached_credentials[id(credential)] = entry
+        return entry[1]
+
+
+def get_management_client(client_class: Type[ClientT], credentials: Any, subscription_id: str) -> ClientT:
+    """
+    Returns the process-wide management client of the given class for the given credentials and subscription, building
+    it on first use. Azure SDK clients are safe to share between threads.
+    """
+    key = (client_class, subscription_id, id(credentials))
+    with _lock:
+        entry = _management_clients.get(key)
+        if entry is None or entry[0] is not credentials:
+            entry = (credentials, client_class(credentials, subscription_id))  # type: ignore
+            _management_clients[key] = entry
+        return entry[1]
@@ -4,6 +4,7 @@ from typing import Optional
 import neo4j
 from digitalocean import Manager
 
+from cartography.client.core.session import CoalescingSession
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
@@ -112,29 +113,30 @@ def load_droplets(neo4j_session: neo4j.Session, data: list, digitalocean_update_
         ON CREATE SET r.firstseen = timestamp()
         SET r.lastupdated = $digitalocean_update_tag
         """
-    for droplet in data:
-        neo4j_session.run(
-            query,
-            AccountId=droplet['account_id'],
-            DropletId=droplet['id'],
-            Name=droplet['name'],
-            Locked=droplet['locked'],
-            Status=droplet['status'],
-            Features=droplet['features'],
-            RegionSlug=droplet['region'],
-            CreatedAt=droplet['created_at'],
-            ImageSlug=droplet['image'],
-            SizeSlug=droplet['size'],
-            IpAddress=droplet['ip_address'],
-            PrivateIpAddress=droplet['private_ip_address'],
-            ProjectId=droplet['project_id'],
-            IpV6Address=droplet['ip_v6_address'],
-            Kernel=droplet['kernel'],
-            Tags=droplet['tags'],
-            Volumes=droplet['volumes'],
-            VpcUuid=droplet['vpc_uuid'],
-            digitalocean_update_tag=digitalocean_update_tag,
-        )
+    with CoalescingSession(neo4j_session) as session:
+        for droplet in data:
+            session.run(
+                query,
+                AccountId=droplet['account_id'],
+                DropletId=droplet['id'],
+                Name=droplet['name'],
+                Locked=droplet['locked'],
+                Status=droplet['status'],
+                Features=droplet['features'],
+                RegionSlug=droplet['region'],
+                CreatedAt=droplet['created_at'],
+                ImageSlug=droplet['image'],
+                SizeSlug=droplet['size'],
+                IpAddress=droplet['ip_address'],
+                PrivateIpAddress=droplet['private_ip_address'],
+                ProjectId=droplet['project_id'],
+                IpV6Address=droplet['ip_v6_address'],
+                Kernel=droplet['kernel'],
+                Tags=droplet['tags'],
+                Volumes=droplet['volumes'],
+                VpcUuid=droplet['vpc_uuid'],
+                digitalocean_update_tag=digitalocean_update_tag,
+            )
     return
 
 
@@ -1,8 +1,10 @@
 import json
 import logging
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
 from typing import List
+from typing import Optional
 from typing import Set
 
 import googleapiclient.discovery
@@ -12,17 +14,21 @@ from google.auth.credentials import Credentials as GoogleCredentials
 from google.auth.exceptions import DefaultCredentialsError
 from googleapiclient.discovery import Resource
 
+from cartography.client.core.session import SerializedSession
 from cartography.config import Config
 from cartography.intel.gcp import compute
 from cartography.intel.gcp import crm
 from cartography.intel.gcp import dns
 from cartography.intel.gcp import gke
 from cartography.intel.gcp import storage
+from cartography.intel.gcp.util.enabled_services_cache import DEFAULT_TTL
+from cartography.intel.gcp.util.enabled_services_cache import EnabledServicesCache
+from cartography.util import build_google_api_client
 from cartography.util import run_analysis_job
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
-Resources = namedtuple('Resources', 'compute container crm_v1 crm_v2 dns storage serviceusage')
+Resources = namedtuple('Resources', 'compute container crm_v1 crm_v2 dns storage serviceusage credentials')
 
 # Mapping of service short names to their full names as in docs. See https://developers.google.com/apis-explorer,
 # and https://cloud.google.com/service-usage/docs/reference/rest/v1/services#ServiceConfig
@@ -42,9 +48,7 @@ def _get_crm_resource_v1(credentials: GoogleCredentials) -> Resource:
     :param credentials: The GoogleCredentials object
     :return: A CRM v1 resource object
     """
-    # cache_discovery=False to suppress extra warnings.
-    # See https://github.com/googleapis/google-api-python-client/issues/299#issuecomment-268915510 and related issues
-    return googleapiclient.discovery.build('cloudresourcemanager', 'v1', credentials=credentials, cache_discovery=False)
+    return build_google_api_client('cloudresourcemanager', 'v1', credentials)
 
 
 def _get_crm_resource_v2(credentials: GoogleCredentials) -> Resource:
@@ -54,7 +58,7 @@ def _get_crm_resource_v2(credentials: GoogleCredentials) -> Resource:
     :param credentials: The GoogleCredentials object
     :return: A CRM v2 resource object
     """
-    return googleapiclient.discovery.build('cloudresourcemanager', 'v2', credentials=credentials, cache_discovery=False)
+    return build_google_api_client('cloudresourcemanager', 'v2', credentials)
 
 
 def _get_compute_resource(credentials: GoogleCredentials) -> Resource:
@@ -64,7 +68,7 @@ def _get_compute_resource(credentials: GoogleCredentials) -> Resource:
     :param credentials: The GoogleCredentials object
     :return: A Compute resource object
     """
-    return googleapiclient.discovery.build('compute', 'v1', credentials=credentials, cache_discovery=False)
+    return build_google_api_client('compute', 'v1', credentials)
 
 
 def _get_storage_resource(credentials: GoogleCredentials) -> Resource:
@@ -76,7 +80,7 @@ def _get_storage_resource(credentials: GoogleCredentials) -> Resource:
     :param credentials: The GoogleCredentials object
     :return: A Storage resource object
     """
-    return googleapiclient.discovery.build('storage', 'v1', credentials=credentials, cache_discovery=False)
+    return build_google_api_client('storage', 'v1', credentials)
 
 
 def _get_container_resource(credentials: GoogleCredentials) -> Resource:
@@ -87,7 +91,7 @@ def _get_container_resource(credentials: GoogleCredentials) -> Resource:
     :param credentials: The GoogleCredentials object
     :return: A Container resource object
     """
-    return googleapiclient.discovery.build('container', 'v1', credentials=credentials, cache_discovery=False)
+    return build_google_api_client('container', 'v1', credentials)
 
 
 def _get_dns_resource(credentials: GoogleCredentials) -> Resource:
@@ -98,7 +102,7 @@ def _get_dns_resource(credentials: GoogleCredentials) -> Resource:
     :param credentials: The GoogleCredentials object
     :return: A DNS resource object
     """
-    return googleapiclient.discovery.build('dns', 'v1', credentials=credentials, cache_discovery=False)
+    return build_google_api_client('dns', 'v1', credentials)
 
 
 def _get_serviceusage_resource(credentials: GoogleCredentials) -> Resource:
@@ -109,7 +113,7 @@ def _get_serviceusage_resource(credentials: GoogleCredentials) -> Resource:
     :param credentials: The GoogleCredentials object
     :return: A serviceusage resource object
     """
-    return googleapiclient.discovery.build('serviceusage', 'v1', credentials=credentials, cache_discovery=False)
+    return build_google_api_client('serviceusage', 'v1', credentials)
 
 
 def _initialize_resources(credentials: GoogleCredentials) -> Resource:
@@ -126,6 +130,7 @@ def _initialize_resources(credentials: GoogleCredentials) -> Resource:
         container=None,
         dns=None,
         storage=None,
+        credentials=credentials,
     )
 
 
@@ -162,7 +167,7 @@ def _services_enabled_on_project(serviceusage: Resource, project_id: str) -> Set
 
 def _sync_single_project_compute(
     neo4j_session: neo4j.Session, resources: Resource, project_id: str, gcp_update_tag: int,
-    common_job_parameters: Dict,
+    common_job_parameters: Dict, enabled_services: Set,
 ) -> None:
     """
     Handles graph sync for a single GCP project on Compute resources.
@@ -172,18 +177,17 @@ def _sync_single_project_compute(
     https://cloud.google.com/resource-manager/reference/rest/v1/projects
     :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
     :param common_job_parameters: Other parameters sent to Neo4j
+    :param enabled_services: The services enabled on the project, as returned by `_get_enabled_services()`
     :return: Nothing
     """
-    # Determine the resources available on the project.
-    enabled_services = _services_enabled_on_project(resources.serviceusage, project_id)
-    compute_cred = _get_compute_resource(get_gcp_credentials())
+    compute_cred = _get_compute_resource(resources.credentials)
     if service_names.compute in enabled_services:
         compute.sync(neo4j_session, compute_cred, project_id, gcp_update_tag, common_job_parameters)
 
 
 def _sync_single_project_storage(
     neo4j_session: neo4j.Session, resources: Resource, project_id: str, gcp_update_tag: int,
-    common_job_parameters: Dict,
+    common_job_parameters: Dict, enabled_services: Set,
 ) -> None:
     """
     Handles graph sync for a single GCP project on Storage resources.
@@ -193,18 +197,17 @@ def _sync_single_project_storage(
     https://cloud.google.com/resource-manager/reference/rest/v1/projects
     :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
     :param common_job_parameters: Other parameters sent to Neo4j
+    :param enabled_services: The services enabled on the project, as returned by `_get_enabled_services()`
     :return: Nothing
     """
-    # Determine the resources available on the project.
-    enabled_services = _services_enabled_on_project(resources.serviceusage, project_id)
-    storage_cred = _get_storage_resource(get_gcp_credentials())
+    storage_cred = _get_storage_resource(resources.credentials)
     if service_names.storage in enabled_services:
         storage.sync_gcp_buckets(neo4j_session, storage_cred, project_id, gcp_update_tag, common_job_parameters)
 
 
 def _sync_single_project_gke(
     neo4j_session: neo4j.Session, resources: Resource, project_id: str, gcp_update_tag: int,
-    common_job_parameters: Dict,
+    common_job_parameters: Dict, enabled_services: Set,
 ) -> None:
     """
     Handles graph sync for a single GCP project GKE resources.
@@ -214,18 +217,17 @@ def _sync_single_project_gke(
     https://cloud.google.com/resource-manager/reference/rest/v1/projects
     :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
     :param common_job_parameters: Other parameters sent to Neo4j
+    :param enabled_services: The services enabled on the project, as returned by `_get_enabled_services()`
     :return: Nothing
     """
-    # Determine the resources available on the project.
-    enabled_services = _services_enabled_on_project(resources.serviceusage, project_id)
-    container_cred = _get_container_resource(get_gcp_credentials())
+    container_cred = _get_container_resource(resources.credentials)
     if service_names.gke in enabled_services:
         gke.sync_gke_clusters(neo4j_session, container_cred, project_id, gcp_update_tag, common_job_parameters)
 
 
 def _sync_single_project_dns(
     neo4j_session: neo4j.Session, resources: Resource, project_id: str, gcp_update_tag: int,
-    common_job_parameters: Dict,
+    common_job_parameters: Dict, enabled_services: Set,
 ) -> None:
     """
     Handles graph sync for a single GCP project DNS resources.
@@ -235,21 +237,93 @@ def _sync_single_project_dns(
     https://cloud.google.com/resource-manager/reference/rest/v1/projects
     :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
     :param common_job_parameters: Other parameters sent to Neo4j
+    :param enabled_services: The services enabled on the project, as returned by `_get_enabled_services()`
     :return: Nothing
     """
-    # Determine the resources available on the project.
-    enabled_services = _services_enabled_on_project(resources.serviceusage, project_id)
-    dns_cred = _get_dns_resource(get_gcp_credentials())
+    dns_cred = _get_dns_resource(resources.credentials)
     if service_names.dns in enabled_services:
         dns.sync(neo4j_session, dns_cred, project_id, gcp_update_tag, common_job_parameters)
 
 
+def _get_enabled_services(
+    resources: Resource, project_id: str, enabled_services_cache: Optional[EnabledServicesCache] = None,
+) -> Set:
+    """
+    Return the Google API services enabled on the given project, from the enabled services cache if one is given.
+    :param resources: namedtuple of the GCP resource objects
+    :param project_id: The project ID
+    :param enabled_services_cache: The cache of enabled services, or None to always ask serviceusage
+    :return: A set of services that are enabled on the project
+    """
+    if enabled_services_cache is None:
+        return _services_enabled_on_project(resources.serviceusage, project_id)
+
+    def _fetch(project_id: str) -> Set:
+        # Also called from the threads that refresh the cache, which need their own serviceusage resource.
+        return _services_enabled_on_project(_get_serviceusage_resource(resources.credentials), project_id)
+
+    return enabled_services_cache.get_enabled_services(project_id, _fetch)
+
+
+def _sync_single_project(
+    neo4j_session: neo4j.Session, resources: Resource, project_id: str, gcp_update_tag: int,
+    common_job_parameters: Dict, enabled_services_cache: Optional[EnabledServicesCache] = None,
+) -> None:
+    """
+    Handles graph sync for a single GCP project on Compute, Storage, GKE and DNS resources, in that order.
+    :param neo4j_session: The Neo4j session
+    :param resources: namedtuple of the GCP resource objects
+    :param project_id: The project ID number to sync.  See  the `projectId` field in
+    https://cloud.google.com/resource-manager/reference/rest/v1/projects
+    :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
+    :param common_job_parameters: Other parameters sent to Neo4j
+    :param enabled_services_cache: Optional cache of the services enabled on each project
+    :return: Nothing
+    """
+    # Determine the resources available on the project.
+    enabled_services = _get_enabled_services(resources, project_id, enabled_services_cache)
+    logger.info("Syncing GCP project %s for Compute.", project_id)
+    _sync_single_project_compute(
+        neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters, enabled_services,
+    )
+    logger.info("Syncing GCP project %s for Storage", project_id)
+    _sync_single_project_storage(
+        neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters, enabled_services,
+    )
+    logger.info("Syncing GCP project %s for GKE", project_id)
+    _sync_single_project_gke(
+        neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters, enabled_services,
+    )
+    logger.info("Syncing GCP project %s for DNS", project_id)
+    _sync_single_project_dns(
+        neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters, enabled_services,
+    )
+
+
+def _sync_single_project_in_thread(
+    neo4j_session: neo4j.Session, resources: Resource, project_id: str, gcp_update_tag: int,
+    common_job_parameters: Dict, enabled_services_cache: Optional[EnabledServicesCache] = None,
+) -> None:
+    """
+    Syncs a single GCP project from a worker thread, using a Neo4j session that is shared through a SerializedSession.
+    googleapiclient resource objects are not thread-safe, so the worker uses its own serviceusage resource instead
+    of the one of the main thread.
+    """
+    resources = resources._replace(serviceusage=_get_serviceusage_resource(resources.credentials))
+    _sync_single_project(
+        neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters, enabled_services_cache,
+    )
+
+
 def _sync_multiple_projects(
     neo4j_session: neo4j.Session, resources: Resource, projects: List[Dict],
     gcp_update_tag: int, common_job_parameters: Dict,
+    enabled_services_cache: Optional[EnabledServicesCache] = None,
 ) -> None:
     """
     Handles graph sync for multiple GCP projects.
+    If `gcp_project_workers` in common_job_parameters is greater than 1, that many projects are synced concurrently.
+    The workers share the Neo4j session one call at a time, so the data of each project is still loaded in order.
     :param neo4j_session: The Neo4j session
     :param resources: namedtuple of the GCP resource objects
     :param: projects: A list of projects. At minimum, this list should contain a list of dicts with the key "projectId"
@@ -258,33 +332,39 @@ def _sync_multiple_projects(
     See https://cloud.google.com/resource-manager/reference/rest/v1/projects.
     :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
     :param common_job_parameters: Other parameters sent to Neo4j
+    :param enabled_services_cache: Optional cache of the services enabled on each project
     :return: Nothing
     """
     logger.info("Syncing %d GCP projects.", len(projects))
     crm.sync_gcp_projects(neo4j_session, projects, gcp_update_tag, common_job_parameters)
-    # Compute data sync
-    for project in projects:
-        project_id = project['projectId']
-        logger.info("Syncing GCP project %s for Compute.", project_id)
-        _sync_single_project_compute(neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters)
-
-    # Storage data sync
-    for project in projects:
-        project_id = project['projectId']
-        logger.info("Syncing GCP project %s for Storage", project_id)
-        _sync_single_project_storage(neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters)
-
-    # GKE data sync
-    for project in projects:
-        project_id = project['projectId']
-        logger.info("Syncing GCP project %s for GKE", project_id)
-        _sync_single_project_gke(neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters)
-
-    # DNS data sync
-    for project in projects:
-        project_id = project['projectId']
-        logger.info("Syncing GCP project %s for DNS", project_id)
-        _sync_single_project_dns(neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters)
+
+    workers = common_job_parameters.get("gcp_project_workers") or 1
+    if workers <= 1:
+        for project in projects:
+            _sync_single_project(
+                neo4j_session, resources, project['projectId'], gcp_update_tag, common_job_parameters,
+                enabled_services_cache,
+            )
+        return
+
+    serialized_session = SerializedSession(neo4j_session)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _sync_single_project_in_thread,
+                serialized_session, resources, project['projectId'], gcp_update_tag, common_job_parameters,
+                enabled_services_cache,
+            )
+            for project in projects
+        ]
+        try:
+            for future in futures:
+                future.result()
+        except Exception:
+            # Fail the sync as the sequential one would, without starting the projects that are still queued.
+            for future in futures:
+                future.cancel()
+            raise
 
 
 @timeit
@@ -324,6 +404,7 @@ def start_gcp_ingestion(neo4j_session: neo4j.Session, config: Config) -> None:
     """
     common_job_parameters = {
         "UPDATE_TAG": config.update_tag,
+        "gcp_project_workers": config.gcp_project_workers,
     }
 
     credentials = get_gcp_credentials()
@@ -336,7 +417,19 @@ def start_gcp_ingestion(neo4j_session: neo4j.Session, config: Config) -> None:
 
     projects = crm.get_gcp_projects(resources.crm_v1)
 
-    _sync_multiple_projects(neo4j_session, resources, projects, config.update_tag, common_job_parameters)
+    enabled_services_cache = None
+    if config.gcp_serviceusage_cache_path:
+        enabled_services_cache = EnabledServicesCache(
+            config.gcp_serviceusage_cache_path,
+            ttl=config.gcp_serviceusage_cache_ttl or DEFAULT_TTL,
+        )
+    try:
+        _sync_multiple_projects(
+            neo4j_session, resources, projects, config.update_tag, common_job_parameters, enabled_services_cache,
+        )
+    finally:
+        if enabled_services_cache is not None:
+            enabled_services_cache.close()
 
     run_analysis_job(
         'gcp_compute_asset_inet_exposure.json',
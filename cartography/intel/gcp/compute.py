@@ -8,7 +8,6 @@ from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
-from typing import Set
 
 import neo4j
 from googleapiclient.discovery import HttpError
@@ -97,37 +96,61 @@ def get_zones_in_project(project_id: str, compute: Resource, max_results: Option
             raise
 
 
+def _get_aggregated_list_responses(
+    project_id: str, collection: Resource, items_key: str, resource_type: str,
+) -> List[Dict]:
+    """
+    Page through the `aggregatedList` endpoint of the given Compute collection, which returns the resources of all zones
+    or regions of a project at once, and split the results into one response object per zone or region. These have the
+    same shape as the responses of the per-zone and per-region `list` endpoints.
+    See https://cloud.google.com/compute/docs/reference/rest/v1/instances/aggregatedList.
+    :param project_id: The project ID
+    :param collection: The Compute collection to list, e.g. `compute.instances()`
+    :param items_key: The key of the resources in each scoped list of the aggregated response, e.g. `instances`
+    :param resource_type: The resource type that ends the `id` of each response object, e.g. `instances`
+    :return: A list of response objects of the form {id: str, items: []}, where `id` has the form
+    `projects/{project}/{zones|regions}/{name}/{resource_type}`
+    """
+    response_objects: Dict[str, Dict] = {}
+    req = collection.aggregatedList(project=project_id)
+    while req is not None:
+        res = req.execute()
+        # Scoped lists are keyed by `zones/{zone}` or `regions/{region}`. Global resources are listed separately.
+        for scope, scoped_list in res.get('items', {}).items():
+            warning = scoped_list.get('warning', {})
+            if warning.get('code') == 'UNREACHABLE':
+                logger.warning(
+                    "Could not list %s in %s for project %s: %s",
+                    resource_type, scope, project_id, warning.get('message'),
+                )
+            if scope == 'global' or items_key not in scoped_list:
+                continue
+            prefix = f"projects/{project_id}/{scope}/{resource_type}"
+            response_objects.setdefault(prefix, {'id': prefix, 'items': []})['items'].extend(scoped_list[items_key])
+        req = collection.aggregatedList_next(previous_request=req, previous_response=res)
+    return list(response_objects.values())
+
+
 @timeit
-def get_gcp_instance_responses(project_id: str, zones: Optional[List[Dict]], compute: Resource) -> List[Resource]:
+def get_gcp_instance_responses(project_id: str, compute: Resource) -> List[Resource]:
     """
-    Return list of GCP instance response objects for a given project and list of zones
+    Return list of GCP instance response objects for a given project, one for each zone that has instances
     :param project_id: The project ID
-    :param zones: The list of zones to query for instances
     :param compute: The compute resource object
     :return: A list of response objects of the form {id: str, items: []} where each item in `items` is a GCP instance
     """
-    if not zones:
-        # If the Compute Engine API is not enabled for a project, there are no zones and therefore no instances.
-        return []
-    response_objects: List[Resource] = []
-    for zone in zones:
-        req = compute.instances().list(project=project_id, zone=zone['name'])
-        res = req.execute()
-        response_objects.append(res)
-    return response_objects
+    return _get_aggregated_list_responses(project_id, compute.instances(), 'instances', 'instances')
 
 
 @timeit
-def get_gcp_subnets(projectid: str, region: str, compute: Resource) -> Resource:
+def get_gcp_subnets(projectid: str, compute: Resource) -> List[Resource]:
     """
-    Return list of all subnets in the given projectid and region
+    Return list of subnet response objects for the given projectid, one for each region that has subnets
     :param projectid: THe projectid
-    :param region: The region to pull subnets from
     :param compute: The compute resource object created by googleapiclient.discovery.build()
-    :return: Response object containing data on all GCP subnets for a given project
+    :return: A list of response objects of the form {id: str, items: []} where each item in `items` is a GCP subnet
     """
-    req = compute.subnetworks().list(project=projectid, region=region)
-    return req.execute()
+    return _get_aggregated_list_responses(projectid, compute.subnetworks(), 'subnetworks', 'subnetworks')
 
 
 @timeit
@@ -143,16 +166,16 @@ def get_gcp_vpcs(projectid: str, compute: Resource) -> Resource:
 
 
 @timeit
-def get_gcp_regional_forwarding_rules(project_id: str, region: str, compute: Resource) -> Resource:
+def get_gcp_regional_forwarding_rules(project_id: str, compute: Resource) -> List[Resource]:
     """
-    Return list of all regional forwarding rules in the given project_id and region
+    Return list of regional forwarding rule response objects for the given project_id, one for each region that has
+    forwarding rules
     :param project_id: The project ID
-    :param region: The region to pull forwarding rules from
     :param compute: The compute resource object created by googleapiclient.discovery.build()
-    :return: Response object containing data on all GCP forwarding rules for a given project
+    :return: A list of response objects of the form {id: str, items: []} where each item in `items` is a GCP
+    forwarding rule
     """
-    req = compute.forwardingRules().list(project=project_id, region=region)
-    return req.execute()
+    return _get_aggregated_list_responses(project_id, compute.forwardingRules(), 'forwardingRules', 'forwardingRules')
 
 
 @timeit
@@ -1088,8 +1111,8 @@ def cleanup_gcp_firewall_rules(neo4j_session: neo4j.Session, common_job_paramete
 
 @timeit
 def sync_gcp_instances(
-    neo4j_session: neo4j.Session, compute: Resource, project_id: str, zones: Optional[List[Dict]],
-    gcp_update_tag: int, common_job_parameters: Dict,
+    neo4j_session: neo4j.Session, compute: Resource, project_id: str, gcp_update_tag: int,
+    common_job_parameters: Dict,
 ) -> None:
     """
     Get GCP instances using the Compute resource object, ingest to Neo4j, and clean up old data.
@@ -1097,13 +1120,11 @@ def sync_gcp_instances(
     :param compute: The GCP Compute resource object
     :param project_id: The project ID number to sync.  See  the `projectId` field in
     https://cloud.google.com/resource-manager/reference/rest/v1/projects
-    :param zones: The list of all zone names that are enabled for this project; this is the output of
-    `get_zones_in_project()`
     :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
     :param common_job_parameters: dict of other job parameters to pass to Neo4j
     :return: Nothing
     """
-    instance_responses = get_gcp_instance_responses(project_id, zones, compute)
+    instance_responses = get_gcp_instance_responses(project_id, compute)
     instance_list = transform_gcp_instances(instance_responses)
     load_gcp_instances(neo4j_session, instance_list, gcp_update_tag)
     # TODO scope the cleanup to the current project - https://github.com/lyft/cartography/issues/381
@@ -1133,21 +1154,19 @@ def sync_gcp_vpcs(
 
 @timeit
 def sync_gcp_subnets(
-    neo4j_session: neo4j.Session, compute: Resource, project_id: str, regions: List[str], gcp_update_tag: int,
+    neo4j_session: neo4j.Session, compute: Resource, project_id: str, gcp_update_tag: int,
     common_job_parameters: Dict,
 ) -> None:
-    for r in regions:
-        subnet_res = get_gcp_subnets(project_id, r, compute)
+    for subnet_res in get_gcp_subnets(project_id, compute):
         subnets = transform_gcp_subnets(subnet_res)
         load_gcp_subnets(neo4j_session, subnets, gcp_update_tag)
-        # TODO scope the cleanup to the current project - https://github.com/lyft/cartography/issues/381
-        cleanup_gcp_subnets(neo4j_session, common_job_parameters)
+    # TODO scope the cleanup to the current project - https://github.com/lyft/cartography/issues/381
+    cleanup_gcp_subnets(neo4j_session, common_job_parameters)
 
 
 @timeit
 def sync_gcp_forwarding_rules(
-    neo4j_session: neo4j.Session, compute: Resource, project_id: str, regions: List[str], gcp_update_tag: int,
-
+    neo4j_session: neo4j.Session, compute: Resource, project_id: str, gcp_update_tag: int,
     common_job_parameters: Dict,
 ) -> None:
     """
@@ -1155,7 +1174,6 @@ def sync_gcp_forwarding_rules(
     :param neo4j_session: The Neo4j session
     :param compute: The GCP Compute resource object
     :param project_id: The project ID to sync
-    :param regions: List of regions.
     :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
     :param common_job_parameters: dict of other job parameters to pass to Neo4j
     :return: Nothing
@@ -1163,15 +1181,12 @@ def sync_gcp_forwarding_rules(
     global_fwd_response = get_gcp_global_forwarding_rules(project_id, compute)
     forwarding_rules = transform_gcp_forwarding_rules(global_fwd_response)
     load_gcp_forwarding_rules(neo4j_session, forwarding_rules, gcp_update_tag)
-    # TODO scope the cleanup to the current project - https://github.com/lyft/cartography/issues/381
-    cleanup_gcp_forwarding_rules(neo4j_session, common_job_parameters)
 
-    for r in regions:
-        fwd_response = get_gcp_regional_forwarding_rules(project_id, r, compute)
+    for fwd_response in get_gcp_regional_forwarding_rules(project_id, compute):
         forwarding_rules = transform_gcp_forwarding_rules(fwd_response)
         load_gcp_forwarding_rules(neo4j_session, forwarding_rules, gcp_update_tag)
-        # TODO scope the cleanup to the current project - https://github.com/lyft/cartography/issues/381
-        cleanup_gcp_forwarding_rules(neo4j_session, common_job_parameters)
+    # TODO scope the cleanup to the current project - https://github.com/lyft/cartography/issues/381
+    cleanup_gcp_forwarding_rules(neo4j_session, common_job_parameters)
 
 
 @timeit
@@ -1194,20 +1209,6 @@ def sync_gcp_firewall_rules(
     cleanup_gcp_firewall_rules(neo4j_session, common_job_parameters)
 
 
-def _zones_to_regions(zones: List[str]) -> List[Set]:
-    """
-    Return list of regions from the input list of zones
-    :param zones: List of zones. This is the output from `get_zones_in_project()`.
-    :return: List of regions available to the project
-    """
-    regions = set()
-    for zone in zones:
-        # Chop off the last 2 chars to turn the zone to a region
-        region = zone['name'][:-2]     # type: ignore
-        regions.add(region)
-    return list(regions)     # type: ignore
-
-
 def sync(
     neo4j_session: neo4j.Session, compute: Resource, project_id: str, gcp_update_tag: int,
     common_job_parameters: dict,
@@ -1224,14 +1225,15 @@ def sync(
     :return: Nothing
     """
     logger.info("Syncing Compute objects for project %s.", project_id)
-    zones = get_zones_in_project(project_id, compute)
+    # Instances, subnets and forwarding rules are listed for all zones and regions at once, so the zones are only
+    # fetched to find out whether the Compute API is enabled; a single one is enough for that.
+    zones = get_zones_in_project(project_id, compute, max_results=1)
     # Only pull additional assets for this project if the Compute API is enabled
     if zones is None:
         return
     else:
-        regions = _zones_to_regions(zones)
         sync_gcp_vpcs(neo4j_session, compute, project_id, gcp_update_tag, common_job_parameters)
         sync_gcp_firewall_rules(neo4j_session, compute, project_id, gcp_update_tag, common_job_parameters)
-        sync_gcp_subnets(neo4j_session, compute, project_id, regions, gcp_update_tag, common_job_parameters)
-        sync_gcp_instances(neo4j_session, compute, project_id, zones, gcp_update_tag, common_job_parameters)
-        sync_gcp_forwarding_rules(neo4j_session, compute, project_id, regions, gcp_update_tag, common_job_parameters)
+        sync_gcp_subnets(neo4j_session, compute, project_id, gcp_update_tag, common_job_parameters)
+        sync_gcp_instances(neo4j_session, compute, project_id, gcp_update_tag, common_job_parameters)
+        sync_gcp_forwarding_rules(neo4j_session, compute, project_id, gcp_update_tag, common_job_parameters)
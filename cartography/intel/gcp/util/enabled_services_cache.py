@@ -0,0 +1,140 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 86400
+DEFAULT_REFRESH_WORKERS = 4
+
+
+class EnabledServicesCache:
+    """
+    On-disk cache of the Google API services enabled on each GCP project, persisted in a SQLite file so that it is
+    shared across syncs. Entries are used for `ttl` seconds. Entries older than half of that are still used, but are
+    refreshed on a background thread so that they rarely expire in the middle of a sync.
+    """
+
+    def __init__(self, path: str, ttl: int = DEFAULT_TTL, refresh_workers: int = DEFAULT_REFRESH_WORKERS):
+        self.ttl = ttl
+        self.refresh_workers = refresh_workers
+        # Background refreshes write from their own threads, so the connection is shared under a lock.
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._refresher: Optional[ThreadPoolExecutor] = None
+        self._refreshing: Set[str] = set()
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS enabled_services (
+                    project_id TEXT PRIMARY KEY,
+                    services TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+                """,
+            )
+            self._conn.commit()
+
+    def get(self, project_id: str) -> Optional[Tuple[Set[str], float]]:
+        """
+        Returns the cached services of the given project and the time at which they were fetched, or None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT services, fetched_at FROM enabled_services WHERE project_id = ?",
+                (project_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return set(json.loads(row[0])), row[1]
+
+    def put(self, project_id: str, services: Set[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO enabled_services (project_id, services, fetched_at) VALUES (?, ?, ?)",
+                (project_id, json.dumps(sorted(services)), time.time()),
+            )
+            self._conn.commit()
+
+    def entries(self) -> List[Tuple[str, List[str], float]]:
+        """
+        Returns the project ID, services and fetch time of every cached project.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT project_id, services, fetched_at FROM enabled_services ORDER BY project_id",
+            ).fetchall()
+        return [(project_id, json.loads(services), fetched_at) for project_id, services, fetched_at in rows]
+
+    def invalidate(self, project_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Removes the given projects from the cache, or every project if none are given. Returns the number of removed
+        entries.
+        """
+        with self._lock:
+            if project_ids is None:
+                cursor = self._conn.execute("DELETE FROM enabled_services")
+            else:
+                cursor = self._conn.executemany(
+                    "DELETE FROM enabled_services WHERE project_id = ?",
+                    [(project_id,) for project_id in project_ids],
+                )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def get_enabled_services(self, project_id: str, fetch: Callable[[str], Set[str]]) -> Set[str]:
+        """
+        Returns the services enabled on the given project, calling `fetch` only if the project is not cached or its
+        entry has expired. `fetch` may also be called from a background thread to refresh an entry that is about to
+        expire. Empty results are not cached, since they are also returned when the project could not be read.
+        """
+        entry = self.get(project_id)
+        if entry is not None:
+            services, fetched_at = entry
+            age = time.time() - fetched_at
+            if age < self.ttl:
+                if age >= self.ttl / 2:
+                    self._refresh_in_background(project_id, fetch)
+                return services
+
+        services = fetch(project_id)
+        if services:
+            self.put(project_id, services)
+        return services
+
+    def _refresh_in_background(self, project_id: str, fetch: Callable[[str], Set[str]]) -> None:
+        with self._lock:
+            if project_id in self._refreshing:
+                return
+            self._refreshing.add(project_id)
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(max_workers=self.refresh_workers)
+        self._refresher.submit(self._refresh, project_id, fetch)
+
+    def _refresh(self, project_id: str, fetch: Callable[[str], Set[str]]) -> None:
+        try:
+            services = fetch(project_id)
+            if services:
+                self.put(project_id, services)
+        except Exception:
+            logger.warning(f"Failed to refresh the enabled services of project {project_id}.", exc_info=True)
+        finally:
+            with self._lock:
+                self._refreshing.discard(project_id)
+
+    def close(self) -> None:
+        """
+        Waits for the background refreshes to finish, then closes the cache.
+        """
+        if self._refresher is not None:
+            self._refresher.shutdown(wait=True)
+        self._conn.close()
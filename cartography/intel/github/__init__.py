@@ -1,6 +1,10 @@
 import base64
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Dict
+from typing import Optional
 
 import neo4j
 from requests import exceptions
@@ -8,7 +12,11 @@ from requests import exceptions
 import cartography.intel.github.repos
 import cartography.intel.github.teams
 import cartography.intel.github.users
+from cartography.client.core.session import SerializedSession
 from cartography.config import Config
+from cartography.intel.github.manifest_cache import ManifestCache
+from cartography.intel.github.repo_state import RepoSyncState
+from cartography.intel.github.repos import DEFAULT_FULL_SYNC_INTERVAL
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
@@ -30,29 +38,71 @@ def start_github_ingestion(neo4j_session: neo4j.Session, config: Config) -> None
     common_job_parameters = {
         "UPDATE_TAG": config.update_tag,
     }
-    # run sync for the provided github tokens
-    for auth_data in auth_tokens['organization']:
-        try:
-            cartography.intel.github.users.sync(
-                neo4j_session,
-                common_job_parameters,
-                auth_data['token'],
-                auth_data['url'],
-                auth_data['name'],
-            )
-            cartography.intel.github.repos.sync(
-                neo4j_session,
-                common_job_parameters,
-                auth_data['token'],
-                auth_data['url'],
-                auth_data['name'],
-            )
-            cartography.intel.github.teams.sync_github_teams(
-                neo4j_session,
-                common_job_parameters,
-                auth_data['token'],
-                auth_data['url'],
-                auth_data['name'],
-            )
-        except exceptions.RequestException as e:
-            logger.error("Could not complete request to the GitHub API: %s", e)
+    organizations = auth_tokens['organization']
+    workers = config.github_org_workers or 1
+    repo_state = RepoSyncState(config.github_repo_state_path) if config.github_repo_state_path else None
+    full_sync_interval = config.github_full_sync_interval or DEFAULT_FULL_SYNC_INTERVAL
+    # Without a path, manifests shared by several repos are still parsed once per sync.
+    manifest_cache = ManifestCache(config.github_manifest_cache_path or ':memory:')
+    try:
+        if workers <= 1:
+            for auth_data in organizations:
+                _sync_organization(
+                    neo4j_session, common_job_parameters, auth_data, repo_state, full_sync_interval, manifest_cache,
+                )
+            return
+
+        # The organizations share the Neo4j session one call at a time, so each organization's data is still loaded
+        # in order. Organizations using the same token share its rate limit budget.
+        serialized_session = SerializedSession(neo4j_session)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _sync_organization, serialized_session, common_job_parameters, auth_data, repo_state,
+                    full_sync_interval, manifest_cache,
+                )
+                for auth_data in organizations
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        if repo_state is not None:
+            repo_state.close()
+        manifest_cache.close()
+
+
+def _sync_organization(
+    neo4j_session: neo4j.Session,
+    common_job_parameters: Dict[str, Any],
+    auth_data: Dict[str, Any],
+    repo_state: Optional[RepoSyncState],
+    full_sync_interval: int,
+    manifest_cache: ManifestCache,
+) -> None:
+    try:
+        cartography.intel.github.users.sync(
+            neo4j_session,
+            common_job_parameters,
+            auth_data['token'],
+            auth_data['url'],
+            auth_data['name'],
+        )
+        cartography.intel.github.repos.sync(
+            neo4j_session,
+            common_job_parameters,
+            auth_data['token'],
+            auth_data['url'],
+            auth_data['name'],
+            repo_state,
+            full_sync_interval,
+            manifest_cache,
+        )
+        cartography.intel.github.teams.sync_github_teams(
+            neo4j_session,
+            common_job_parameters,
+            auth_data['token'],
+            auth_data['url'],
+            auth_data['name'],
+        )
+    except exceptions.RequestException as e:
+        logger.error("Could not complete request to the GitHub API: %s", e)
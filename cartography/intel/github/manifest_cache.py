@@ -0,0 +1,54 @@
+import json
+import sqlite3
+import threading
+from typing import Dict
+from typing import List
+from typing import Optional
+
+
+class ManifestCache:
+    """
+    Cache of the requirements parsed from dependency manifests (e.g. requirements.txt), keyed by the git object ID of
+    the manifest. Object IDs are hashes of the contents, so entries never go stale. Persisted in a SQLite file so that
+    it is shared across syncs, or kept in memory for the current sync if the path is ':memory:'.
+    """
+
+    def __init__(self, path: str):
+        self.persistent = path != ':memory:'
+        # Organizations are synced from several threads, so the connection is shared under a lock.
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS manifest_requirements (
+                    kind TEXT NOT NULL,
+                    oid TEXT NOT NULL,
+                    requirements TEXT NOT NULL,
+                    PRIMARY KEY (kind, oid)
+                )
+                """,
+            )
+            self._conn.commit()
+
+    def get(self, kind: str, oid: str) -> Optional[List[Dict]]:
+        """
+        Returns the requirements parsed from the manifest of the given kind and object ID, or None if it is not cached.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT requirements FROM manifest_requirements WHERE kind = ? AND oid = ?",
+                (kind, oid),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, kind: str, oid: str, requirements: List[Dict]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO manifest_requirements (kind, oid, requirements) VALUES (?, ?, ?)",
+                (kind, oid, json.dumps(requirements)),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,55 @@
+import sqlite3
+import threading
+from collections import namedtuple
+from typing import Optional
+
+# The newest `updatedAt` and `pushedAt` of the repos of an organization as of its last sync, and the time (in seconds
+# since the epoch) of its last full sync.
+RepoCursor = namedtuple('RepoCursor', ['updated_at', 'pushed_at', 'last_full_sync'])
+
+
+class RepoSyncState:
+    """
+    On-disk state of the incremental GitHub repo sync, persisted in a SQLite file so that it is shared across syncs.
+    For every organization, it holds the cursor up to which the repos in the graph are current.
+    """
+
+    def __init__(self, path: str):
+        # Organizations are synced from several threads, so the connection is shared under a lock.
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS repo_cursors (
+                    organization TEXT PRIMARY KEY,
+                    updated_at TEXT NOT NULL,
+                    pushed_at TEXT NOT NULL,
+                    last_full_sync REAL NOT NULL
+                )
+                """,
+            )
+            self._conn.commit()
+
+    def get(self, organization: str) -> Optional[RepoCursor]:
+        """
+        Returns the cursor of the given organization, or None if its repos have not been synced yet.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT updated_at, pushed_at, last_full_sync FROM repo_cursors WHERE organization = ?",
+                (organization,),
+            ).fetchone()
+        return RepoCursor(*row) if row else None
+
+    def set(self, organization: str, cursor: RepoCursor) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO repo_cursors (organization, updated_at, pushed_at, last_full_sync) "
+                "VALUES (?, ?, ?, ?)",
+                (organization, cursor.updated_at, cursor.pushed_at, cursor.last_full_sync),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
@@ -1,17 +1,29 @@
 import configparser
+import json
 import logging
+import time
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from string import Template
 from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 
 import neo4j
+import requests
 from packaging.requirements import InvalidRequirement
 from packaging.requirements import Requirement
 from packaging.utils import canonicalize_name
 
+from cartography.client.core.session import CoalescingSession
+from cartography.intel.github.manifest_cache import ManifestCache
+from cartography.intel.github.repo_state import RepoCursor
+from cartography.intel.github.repo_state import RepoSyncState
+from cartography.intel.github.util import call_github_api
 from cartography.intel.github.util import fetch_all
 from cartography.intel.github.util import PaginatedGraphqlData
 from cartography.util import backoff_handler
@@ -21,6 +33,22 @@ from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# Number of repos whose collaborators are queried concurrently
+COLLABORATOR_QUERY_WORKERS = 8
+
+# Default number of seconds between two full syncs of an organization's repos in incremental mode
+DEFAULT_FULL_SYNC_INTERVAL = 86400
+
+# Dependency manifests fetched by GITHUB_ORG_REPOS_PAGINATED_GRAPHQL, by the field holding them
+MANIFEST_KINDS = {'requirements': 'requirements.txt', 'setupCfg': 'setup.cfg'}
+
+# Maximum number of manifests downloaded per request, as allowed by the `nodes` query
+BLOB_TEXTS_BATCH_SIZE = 100
+
+# Timestamps that advance when a repo changes, and the order by which repos are listed newest first for each of them.
+# `updatedAt` advances when the repo itself is changed (e.g. its description), `pushedAt` when a branch is pushed to.
+REPO_CURSOR_ORDER_FIELDS = {'updatedAt': 'UPDATED_AT', 'pushedAt': 'PUSHED_AT'}
+
 
 # Representation of a user's permission level and affiliation to a GitHub repo. See:
 # - Permission: https://docs.github.com/en/graphql/reference/enums#repositorypermission
@@ -35,13 +63,13 @@ UserAffiliationAndRepoPermission = namedtuple(
 )
 
 
-GITHUB_ORG_REPOS_PAGINATED_GRAPHQL = """
-    query($login: String!, $cursor: String) {
+GITHUB_ORG_REPOS_PAGINATED_GRAPHQL_TEMPLATE = Template("""
+    query($login: String!, $cursor: String, $orderBy: RepositoryOrder) {
     organization(login: $login)
         {
             url
             login
-            repositories(first: 50, after: $cursor){
+            repositories(first: 50, after: $cursor, orderBy: $orderBy){
                 pageInfo{
                     endCursor
                     hasNextPage
@@ -57,6 +85,7 @@ GITHUB_ORG_REPOS_PAGINATED_GRAPHQL = """
                     createdAt
                     description
                     updatedAt
+                    pushedAt
                     homepageUrl
                     languages(first: 25){
                         totalCount
@@ -85,21 +114,51 @@ GITHUB_ORG_REPOS_PAGINATED_GRAPHQL = """
                     }
                     requirements:object(expression: "HEAD:requirements.txt") {
                         ... on Blob {
-                            text
+                            $manifest_fields
                         }
                     }
                     setupCfg:object(expression: "HEAD:setup.cfg") {
                         ... on Blob {
-                            text
+                            $manifest_fields
                         }
                     }
                 }
             }
         }
+        rateLimit {
+            limit
+            cost
+            remaining
+            resetAt
+        }
     }
-    """
+    """)
 # Note: In the above query, `HEAD` references the default branch.
 # See https://stackoverflow.com/questions/48935381/github-graphql-api-default-branch-in-repository
+GITHUB_ORG_REPOS_PAGINATED_GRAPHQL = GITHUB_ORG_REPOS_PAGINATED_GRAPHQL_TEMPLATE.safe_substitute(
+    manifest_fields='oid\n                            text',
+)
+# Only lists the object IDs of the manifests, for syncs with a persistent manifest cache. The text of the manifests
+# that are not cached yet is downloaded by GITHUB_BLOB_TEXTS_GRAPHQL.
+GITHUB_ORG_REPOS_MANIFEST_OIDS_PAGINATED_GRAPHQL = GITHUB_ORG_REPOS_PAGINATED_GRAPHQL_TEMPLATE.safe_substitute(
+    manifest_fields='id\n                            oid',
+)
+
+GITHUB_BLOB_TEXTS_GRAPHQL = """
+    query($ids: [ID!]!) {
+        nodes(ids: $ids) {
+            ... on Blob {
+                text
+            }
+        }
+        rateLimit {
+            limit
+            cost
+            remaining
+            resetAt
+        }
+    }
+    """
 
 GITHUB_REPO_COLLABS_PAGINATED_GRAPHQL = """
     query($login: String!, $repo: String!, $affiliation: CollaboratorAffiliation!, $cursor: String) {
@@ -142,37 +201,37 @@ def _get_repo_collaborators_inner_func(
         token: str,
         repo_raw_data: list[dict[str, Any]],
         affiliation: str,
-        collab_users: list[dict[str, Any]],
-        collab_permission: list[str],
 ) -> dict[str, list[UserAffiliationAndRepoPermission]]:
     result: dict[str, list[UserAffiliationAndRepoPermission]] = {}
+    repos_to_query: list[dict[str, Any]] = []
 
     for repo in repo_raw_data:
-        repo_name = repo['name']
-        repo_url = repo['url']
-
         if ((affiliation == 'OUTSIDE' and repo['outsideCollaborators']['totalCount'] == 0) or
                 (affiliation == 'DIRECT' and repo['directCollaborators']['totalCount'] == 0)):
             # repo has no collabs of the affiliation type we're looking for, so don't waste time making an API call
-            result[repo_url] = []
-            continue
+            result[repo['url']] = []
+        else:
+            repos_to_query.append(repo)
 
-        logger.info(f"Loading {affiliation} collaborators for repo {repo_name}.")
-        collaborators = _get_repo_collaborators(token, api_url, org, repo_name, affiliation)
+    def _get_collaborators(repo: dict[str, Any]) -> list[UserAffiliationAndRepoPermission]:
+        logger.info(f"Loading {affiliation} collaborators for repo {repo['name']}.")
+        collaborators = _get_repo_collaborators(token, api_url, org, repo['name'], affiliation)
 
         # nodes and edges are expected to always be present given that we only call for them if totalCount is > 0
         # however sometimes GitHub returns None, as in issue 1334 and 1404.
-        for collab in collaborators.nodes or []:
-            collab_users.append(collab)
-
+        collab_users = list(collaborators.nodes or [])
         # The `or []` is because `.edges` can be None.
-        for perm in collaborators.edges or []:
-            collab_permission.append(perm['permission'])
-
-        result[repo_url] = [
+        collab_permission = [perm['permission'] for perm in collaborators.edges or []]
+        return [
             UserAffiliationAndRepoPermission(user, permission, affiliation)
             for user, permission in zip(collab_users, collab_permission)
         ]
+
+    # The queries of different repos run concurrently, paced by the rate limiter of the token.
+    with ThreadPoolExecutor(max_workers=COLLABORATOR_QUERY_WORKERS) as executor:
+        futures = {repo['url']: executor.submit(_get_collaborators, repo) for repo in repos_to_query}
+        for repo_url, future in futures.items():
+            result[repo_url] = future.result()
     return result
 
 
@@ -194,8 +253,6 @@ def _get_repo_collaborators_for_multiple_repos(
     :return: A dictionary of repo URL to list of UserAffiliationAndRepoPermission
     """
     logger.info(f'Retrieving repo collaborators for affiliation "{affiliation}" on org "{org}".')
-    collab_users: List[dict[str, Any]] = []
-    collab_permission: List[str] = []
 
     result: dict[str, list[UserAffiliationAndRepoPermission]] = retries_with_backoff(
         _get_repo_collaborators_inner_func,
@@ -208,8 +265,6 @@ def _get_repo_collaborators_for_multiple_repos(
         token=token,
         repo_raw_data=repo_raw_data,
         affiliation=affiliation,
-        collab_users=collab_users,
-        collab_permission=collab_permission,
     )
     return result
 
@@ -242,13 +297,14 @@ def _get_repo_collaborators(
 
 
 @timeit
-def get(token: str, api_url: str, organization: str) -> List[Dict]:
+def get(token: str, api_url: str, organization: str, manifest_texts: bool = True) -> List[Dict]:
     """
     Retrieve a list of repos from a Github organization as described in
     https://docs.github.com/en/graphql/reference/objects#repository.
     :param token: The Github API token as string.
     :param api_url: The Github v4 API endpoint as string.
     :param organization: The name of the target Github organization as string.
+    :param manifest_texts: Whether to list the text of the dependency manifests, or only their object IDs.
     :return: A list of dicts representing repos. See tests.data.github.repos for data shape.
     """
     # TODO: link the Github organization to the repositories
@@ -256,16 +312,126 @@ def get(token: str, api_url: str, organization: str) -> List[Dict]:
         token,
         api_url,
         organization,
-        GITHUB_ORG_REPOS_PAGINATED_GRAPHQL,
+        _get_repos_query(manifest_texts),
         'repositories',
     )
     return repos.nodes
 
 
+@timeit
+def get_changed(
+        token: str, api_url: str, organization: str, cursor: RepoCursor, manifest_texts: bool = True,
+) -> Tuple[List[Dict], str]:
+    """
+    Retrieve the repos of a Github organization that were updated or pushed to since the given cursor. Repos are listed
+    newest first, so listing stops at the first page that reaches past the cursor.
+    :param token: The Github API token as string.
+    :param api_url: The Github v4 API endpoint as string.
+    :param organization: The name of the target Github organization as string.
+    :param cursor: The cursor of the previous sync of the organization.
+    :param manifest_texts: Whether to list the text of the dependency manifests, or only their object IDs.
+    :return: A 2-tuple containing 1. a list of dicts representing the changed repos, and 2. the URL of the organization.
+    """
+    changed: Dict[str, Dict] = {}
+    org_url = ''
+    for field, since in (('updatedAt', cursor.updated_at), ('pushedAt', cursor.pushed_at)):
+        repos, org_data = fetch_all(
+            token,
+            api_url,
+            organization,
+            _get_repos_query(manifest_texts),
+            'repositories',
+            stop_after_page=partial(_is_page_past_cursor, field, since),
+            orderBy={'field': REPO_CURSOR_ORDER_FIELDS[field], 'direction': 'DESC'},
+        )
+        org_url = org_data['url']
+        for repo in repos.nodes:
+            # Repos changed in the same second as the cursor are fetched again, as they may not have been seen yet.
+            if _get_repo_timestamp(repo, field) >= since:
+                changed.setdefault(repo['url'], repo)
+    return list(changed.values()), org_url
+
+
+def _get_repos_query(manifest_texts: bool) -> str:
+    return GITHUB_ORG_REPOS_PAGINATED_GRAPHQL if manifest_texts else GITHUB_ORG_REPOS_MANIFEST_OIDS_PAGINATED_GRAPHQL
+
+
+def _get_repo_timestamp(repo: Dict, field: str) -> str:
+    # `pushedAt` is null for repos that were never pushed to. ISO 8601 timestamps in UTC sort as strings.
+    return repo.get(field) or ''
+
+
+def _is_page_past_cursor(field: str, since: str, nodes: List[Dict]) -> bool:
+    return not nodes or _get_repo_timestamp(nodes[-1], field) < since
+
+
+def _advance_cursor(cursor: Optional[RepoCursor], repos_json: List[Dict], last_full_sync: float) -> RepoCursor:
+    """
+    Returns the cursor of an organization after syncing the given repos.
+    """
+    updated_at = [_get_repo_timestamp(repo, 'updatedAt') for repo in repos_json]
+    pushed_at = [_get_repo_timestamp(repo, 'pushedAt') for repo in repos_json]
+    return RepoCursor(
+        updated_at=max([cursor.updated_at if cursor else ''] + updated_at),
+        pushed_at=max([cursor.pushed_at if cursor else ''] + pushed_at),
+        last_full_sync=last_full_sync,
+    )
+
+
+@timeit
+def get_manifest_texts(
+        token: str,
+        api_url: str,
+        repos_json: List[Dict],
+        manifest_cache: Optional[ManifestCache] = None,
+) -> None:
+    """
+    Downloads the text of the dependency manifests of the given repos whose requirements are not cached yet, and sets
+    it on the manifests. Manifests with the same object ID are downloaded once.
+    :param token: The Github API token as string.
+    :param api_url: The Github v4 API endpoint as string.
+    :param repos_json: A list of dicts representing repos. See tests.data.github.repos.GET_REPOS for data shape.
+    :param manifest_cache: Optional cache of the requirements parsed from manifests.
+    :return: Nothing
+    """
+    manifests_by_oid: Dict[str, List[Dict]] = {}
+    for repo_object in repos_json:
+        for field, kind in MANIFEST_KINDS.items():
+            manifest = repo_object.get(field)
+            if not manifest or not manifest.get('oid') or 'text' in manifest:
+                continue
+            if manifest_cache and manifest_cache.get(kind, manifest['oid']) is not None:
+                continue
+            manifests_by_oid.setdefault(manifest['oid'], []).append(manifest)
+    if not manifests_by_oid:
+        return
+
+    logger.info(f"Downloading {len(manifests_by_oid)} changed dependency manifests.")
+    oids = list(manifests_by_oid)
+    for start in range(0, len(oids), BLOB_TEXTS_BATCH_SIZE):
+        batch = oids[start:start + BLOB_TEXTS_BATCH_SIZE]
+        response = retries_with_backoff(call_github_api, requests.exceptions.RequestException, 5, backoff_handler)(
+            GITHUB_BLOB_TEXTS_GRAPHQL,
+            json.dumps({'ids': [manifests_by_oid[oid][0]['id'] for oid in batch]}),
+            token,
+            api_url,
+        )
+        nodes = (response.get('data') or {}).get('nodes')
+        if nodes is None:
+            # call_github_api() already logged the errors; these manifests are retried by the next sync.
+            logger.warning(f"Could not download {len(batch)} dependency manifests.")
+            continue
+        # Nodes are returned in the order of the given IDs, with None for the ones that could not be resolved.
+        for oid, node in zip(batch, nodes):
+            for manifest in manifests_by_oid[oid]:
+                manifest['text'] = node['text'] if node else None
+
+
 def transform(
         repos_json: List[Dict],
         direct_collaborators: dict[str, List[UserAffiliationAndRepoPermission]],
         outside_collaborators: dict[str, List[UserAffiliationAndRepoPermission]],
+        manifest_cache: Optional[ManifestCache] = None,
 ) -> Dict:
     """
     Parses the JSON returned from GitHub API to create data for graph ingestion
@@ -275,6 +441,7 @@ def transform(
         See tests.data.github.repos.DIRECT_COLLABORATORS for data shape.
     :param outside_collaborators: dict of repo URL to list of outside collaborators.
         See tests.data.github.repos.OUTSIDE_COLLABORATORS for data shape.
+    :param manifest_cache: Optional cache of the requirements parsed from manifests, which are only parsed on a miss.
     :return: Dict containing the repos, repo->language mapping, owners->repo mapping, outside collaborators->repo
     mapping, and Python requirements files (if any) in a repo.
     """
@@ -309,8 +476,12 @@ def transform(
                 transformed_direct_collaborators,
             )
 
-        _transform_requirements_txt(repo_object['requirements'], repo_url, transformed_requirements_files)
-        _transform_setup_cfg_requirements(repo_object['setupCfg'], repo_url, transformed_requirements_files)
+        _transform_requirements_txt(
+            repo_object['requirements'], repo_url, transformed_requirements_files, manifest_cache,
+        )
+        _transform_setup_cfg_requirements(
+            repo_object['setupCfg'], repo_url, transformed_requirements_files, manifest_cache,
+        )
     results = {
         'repos': transformed_repo_list,
         'repo_languages': transformed_repo_languages,
@@ -434,35 +605,74 @@ def _transform_requirements_txt(
     req_file_contents: Optional[Dict],
     repo_url: str,
     out_requirements_files: List[Dict],
+    manifest_cache: Optional[ManifestCache] = None,
 ) -> None:
     """
     Performs data transformations for the requirements.txt file in a GitHub repo, if available.
-    :param req_file_contents: Dict: The contents of the requirements.txt file.
+    :param req_file_contents: Dict: The object ID and contents of the requirements.txt file.
     :param repo_url: str: The URL of the GitHub repo.
     :param out_requirements_files: Output array to append transformed results to.
+    :param manifest_cache: Optional cache of the requirements parsed from manifests.
     :return: Nothing.
     """
-    if req_file_contents and req_file_contents.get('text'):
-        text_contents = req_file_contents['text']
-        requirements_list = text_contents.split("\n")
-        _transform_python_requirements(requirements_list, repo_url, out_requirements_files)
+    requirements = _get_manifest_requirements(
+        req_file_contents, 'requirements.txt', repo_url, _parse_requirements_txt, manifest_cache,
+    )
+    out_requirements_files.extend({**requirement, 'repo_url': repo_url} for requirement in requirements)
 
 
 def _transform_setup_cfg_requirements(
     setup_cfg_contents: Optional[Dict],
     repo_url: str,
     out_requirements_files: List[Dict],
+    manifest_cache: Optional[ManifestCache] = None,
 ) -> None:
     """
     Performs data transformations for the setup.cfg file in a GitHub repo, if available.
-    :param setup_cfg_contents: Dict: Contains contents of a repo's setup.cfg file.
+    :param setup_cfg_contents: Dict: Contains the object ID and contents of a repo's setup.cfg file.
     :param repo_url: str: The URL of the GitHub repo.
     :param out_requirements_files: Output array to append transformed results to.
+    :param manifest_cache: Optional cache of the requirements parsed from manifests.
     :return: Nothing.
     """
-    if not setup_cfg_contents or not setup_cfg_contents.get('text'):
-        return
-    text_contents = setup_cfg_contents['text']
+    requirements = _get_manifest_requirements(
+        setup_cfg_contents, 'setup.cfg', repo_url, _parse_setup_cfg_text, manifest_cache,
+    )
+    out_requirements_files.extend({**requirement, 'repo_url': repo_url} for requirement in requirements)
+
+
+def _get_manifest_requirements(
+    manifest: Optional[Dict],
+    kind: str,
+    repo_url: str,
+    parse: Callable[[str, str], List[Dict]],
+    manifest_cache: Optional[ManifestCache],
+) -> List[Dict]:
+    """
+    Returns the requirements of the given manifest, from the cache if its object ID is cached and parsed from its text
+    otherwise.
+    """
+    if not manifest:
+        return []
+    oid = manifest.get('oid')
+    if manifest_cache and oid:
+        cached = manifest_cache.get(kind, oid)
+        if cached is not None:
+            return cached
+    if not manifest.get('text'):
+        # Empty, binary or not downloaded; the latter are not cached so that they are retried by the next sync.
+        return []
+    requirements = parse(manifest['text'], repo_url)
+    if manifest_cache and oid:
+        manifest_cache.set(kind, oid, requirements)
+    return requirements
+
+
+def _parse_requirements_txt(text_contents: str, repo_url: str) -> List[Dict]:
+    return _parse_python_requirements(text_contents.split("\n"), repo_url)
+
+
+def _parse_setup_cfg_text(text_contents: str, repo_url: str) -> List[Dict]:
     setup_cfg = configparser.ConfigParser()
     try:
         setup_cfg.read_string(text_contents)
@@ -471,22 +681,16 @@ def _transform_setup_cfg_requirements(
             f"Failed to parse {repo_url}'s setup.cfg; skipping.",
             exc_info=True,
         )
-        return
-    requirements_list = parse_setup_cfg(setup_cfg)
-    _transform_python_requirements(requirements_list, repo_url, out_requirements_files)
+        return []
+    return _parse_python_requirements(parse_setup_cfg(setup_cfg), repo_url)
 
 
-def _transform_python_requirements(
-    requirements_list: List[str],
-    repo_url: str,
-    out_requirements_files: List[Dict],
-) -> None:
+def _parse_python_requirements(requirements_list: List[str], repo_url: str) -> List[Dict]:
     """
     Helper function to perform data transformations on an arbitrary list of requirements.
     :param requirements_list: List[str]: List of requirements
-    :param repo_url: str: The URL of the GitHub repo.
-    :param out_requirements_files: Output array to append transformed results to.
-    :return: Nothing.
+    :param repo_url: str: The URL of the GitHub repo, for logging.
+    :return: The transformed requirements, without the repo they belong to.
     """
     parsed_list = []
     for line in requirements_list:
@@ -503,6 +707,7 @@ def _transform_python_requirements(
                 exc_info=True,
             )
 
+    requirements = []
     for req in parsed_list:
         pinned_version = None
         if len(req.specifier) == 1:
@@ -520,13 +725,13 @@ def _transform_python_requirements(
         canon_name = canonicalize_name(req.name)
         requirement_id = f"{canon_name}|{pinned_version}" if pinned_version else canon_name
 
-        out_requirements_files.append({
+        requirements.append({
             "id": requirement_id,
             "name": canon_name,
             "specifier": spec,
             "version": pinned_version,
-            "repo_url": repo_url,
         })
+    return requirements
 
 
 def parse_setup_cfg(config: configparser.ConfigParser) -> List[str]:
@@ -640,28 +845,29 @@ def load_github_owners(neo4j_session: neo4j.Session, update_tag: int, repo_owner
     :param repo_owners: list of owner to repo mappings
     :return: Nothing
     """
-    for owner in repo_owners:
-        ingest_owner_template = Template("""
-            MERGE (user:$account_type{id: $Id})
-            ON CREATE SET user.firstseen = timestamp()
-            SET user.username = $UserName,
-            user.lastupdated = $UpdateTag
-            WITH user
-
-            MATCH (repo:GitHubRepository{id: $RepoId})
-            MERGE (user)<-[r:OWNER]-(repo)
-            ON CREATE SET r.firstseen = timestamp()
-            SET r.lastupdated = $UpdateTag""")
-
-        account_type = {'User': "GitHubUser", 'Organization': "GitHubOrganization"}
-
-        neo4j_session.run(
-            ingest_owner_template.safe_substitute(account_type=account_type[owner['type']]),
-            Id=owner['owner_id'],
-            UserName=owner['owner'],
-            RepoId=owner['repo_id'],
-            UpdateTag=update_tag,
-        )
+    with CoalescingSession(neo4j_session) as session:
+        for owner in repo_owners:
+            ingest_owner_template = Template("""
+                MERGE (user:$account_type{id: $Id})
+                ON CREATE SET user.firstseen = timestamp()
+                SET user.username = $UserName,
+                user.lastupdated = $UpdateTag
+                WITH user
+
+                MATCH (repo:GitHubRepository{id: $RepoId})
+                MERGE (user)<-[r:OWNER]-(repo)
+                ON CREATE SET r.firstseen = timestamp()
+                SET r.lastupdated = $UpdateTag""")
+
+            account_type = {'User': "GitHubUser", 'Organization': "GitHubOrganization"}
+
+            session.run(
+                ingest_owner_template.safe_substitute(account_type=account_type[owner['type']]),
+                Id=owner['owner_id'],
+                UserName=owner['owner'],
+                RepoId=owner['repo_id'],
+                UpdateTag=update_tag,
+            )
 
 
 @timeit
@@ -731,12 +937,44 @@ def load_python_requirements(neo4j_session: neo4j.Session, update_tag: int, requ
     )
 
 
+@timeit
+def touch_unchanged_repos(neo4j_session: neo4j.Session, update_tag: int, org_url: str) -> None:
+    """
+    Marks the repos of an organization that were not loaded by an incremental sync as current, along with their default
+    branches, languages, requirements and collaborators, so that the cleanup job keeps them.
+    :param neo4j_session: Neo4J session object for server communication
+    :param update_tag: Timestamp used to determine data freshness
+    :param org_url: The URL of the organization owning the repos
+    :return: Nothing
+    """
+    query = """
+    MATCH (:GitHubOrganization{id: $OrgUrl})<-[owner:OWNER]-(repo:GitHubRepository)
+    WHERE repo.lastupdated <> $UpdateTag
+    SET repo.lastupdated = $UpdateTag,
+    owner.lastupdated = $UpdateTag
+
+    WITH repo
+    OPTIONAL MATCH (repo)-[r:BRANCH|LANGUAGE|REQUIRES]->(n)
+    SET r.lastupdated = $UpdateTag,
+    n.lastupdated = $UpdateTag
+
+    WITH DISTINCT repo
+    OPTIONAL MATCH (repo)<-[c]-(:GitHubUser)
+    WHERE type(c) STARTS WITH 'DIRECT_COLLAB_' OR type(c) STARTS WITH 'OUTSIDE_COLLAB_'
+    SET c.lastupdated = $UpdateTag
+    """
+    neo4j_session.run(query, OrgUrl=org_url, UpdateTag=update_tag)
+
+
 def sync(
         neo4j_session: neo4j.Session,
         common_job_parameters: Dict[str, Any],
         github_api_key: str,
         github_url: str,
         organization: str,
+        repo_state: Optional[RepoSyncState] = None,
+        full_sync_interval: int = DEFAULT_FULL_SYNC_INTERVAL,
+        manifest_cache: Optional[ManifestCache] = None,
 ) -> None:
     """
     Performs the sequential tasks to collect, transform, and sync github data
@@ -745,10 +983,31 @@ def sync(
     :param github_api_key: The API key to access the GitHub v4 API
     :param github_url: The URL for the GitHub v4 endpoint to use
     :param organization: The organization to query GitHub for
+    :param repo_state: Optional state of the incremental sync. If given, only the repos that changed since the previous
+    sync are fetched, and the others are kept as they are. Every `full_sync_interval` seconds, all repos are fetched
+    again so that deleted repos are cleaned up.
+    :param full_sync_interval: The number of seconds between two full syncs in incremental mode
+    :param manifest_cache: Optional cache of the requirements parsed from manifests. Cached manifests are not parsed
+    again. If the cache is persistent, only the object IDs of the manifests are listed and cached manifests are not
+    downloaded either.
     :return: Nothing
     """
     logger.info("Syncing GitHub repos")
-    repos_json = get(github_api_key, github_url, organization)
+    now = time.time()
+    cursor = repo_state.get(organization) if repo_state else None
+    incremental = cursor is not None and now - cursor.last_full_sync < full_sync_interval
+    # Without a persistent cache, listing the manifest texts inline is cheaper than downloading them afterwards.
+    manifest_texts = not (manifest_cache and manifest_cache.persistent)
+    if cursor is not None and incremental:
+        logger.info(
+            f"Syncing GitHub repos of {organization} updated since {cursor.updated_at} or pushed to since "
+            f"{cursor.pushed_at}.",
+        )
+        repos_json, org_url = get_changed(github_api_key, github_url, organization, cursor, manifest_texts)
+        last_full_sync = cursor.last_full_sync
+    else:
+        repos_json = get(github_api_key, github_url, organization, manifest_texts)
+        last_full_sync = now
     direct_collabs: dict[str, list[UserAffiliationAndRepoPermission]] = {}
     outside_collabs: dict[str, list[UserAffiliationAndRepoPermission]] = {}
     try:
@@ -761,6 +1020,11 @@ def sync(
     except TypeError:
         # due to permission errors or transient network error or some other nonsense
         logger.warning('Unable to list repo collaborators due to permission errors; continuing on.', exc_info=True)
-    repo_data = transform(repos_json, direct_collabs, outside_collabs)
+    get_manifest_texts(github_api_key, github_url, repos_json, manifest_cache)
+    repo_data = transform(repos_json, direct_collabs, outside_collabs, manifest_cache)
     load(neo4j_session, common_job_parameters, repo_data)
+    if incremental:
+        touch_unchanged_repos(neo4j_session, common_job_parameters['UPDATE_TAG'], org_url)
     run_cleanup_job('github_repos_cleanup.json', neo4j_session, common_job_parameters)
+    if repo_state:
+        repo_state.set(organization, _advance_cursor(cursor if incremental else None, repos_json, last_full_sync))
@@ -66,6 +66,12 @@ def get_teams(org: str, api_url: str, token: str) -> Tuple[PaginatedGraphqlData,
                     }
                 }
             }
+            rateLimit {
+                limit
+                cost
+                remaining
+                resetAt
+            }
         }
     """
     return fetch_all(token, api_url, org, org_teams_gql, 'teams')
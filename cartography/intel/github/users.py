@@ -46,6 +46,12 @@ GITHUB_ORG_USERS_PAGINATED_GRAPHQL = """
                 }
             }
         }
+        rateLimit {
+            limit
+            cost
+            remaining
+            resetAt
+        }
     }
     """
 
@@ -73,6 +79,12 @@ GITHUB_ENTERPRISE_OWNER_USERS_PAGINATED_GRAPHQL = """
                 }
             }
         }
+        rateLimit {
+            limit
+            cost
+            remaining
+            resetAt
+        }
     }
     """
 
@@ -1,10 +1,11 @@
 import json
 import logging
+import threading
 import time
 from datetime import datetime
-from datetime import timedelta
 from datetime import timezone as tz
 from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
 from typing import NamedTuple
@@ -18,6 +19,10 @@ logger = logging.getLogger(__name__)
 # Connect and read timeouts of 60 seconds each; see https://requests.readthedocs.io/en/master/user/advanced/#timeouts
 _TIMEOUT = (60, 60)
 _GRAPHQL_RATE_LIMIT_REMAINING_THRESHOLD = 500
+# Requests are paced once less than this share of the GraphQL rate limit remains
+_GRAPHQL_RATE_LIMIT_PACE_BELOW = 0.5
+# Seconds to wait past the rate limit reset, for safety
+_GRAPHQL_RATE_LIMIT_RESET_MARGIN = 60
 
 
 class PaginatedGraphqlData(NamedTuple):
@@ -25,28 +30,111 @@ class PaginatedGraphqlData(NamedTuple):
     edges: List[Dict[str, Any]]
 
 
-def handle_rate_limit_sleep(token: str) -> None:
-    '''
-    Check the remaining rate limit and sleep if remaining is below threshold
-    :param token: The Github API token as string.
-    '''
-    response = requests.get('https://api.github.com/rate_limit', headers={'Authorization': f"token {token}"})
-    response.raise_for_status()
-    response_json = response.json()
-    rate_limit_obj = response_json['resources']['graphql']
-    remaining = rate_limit_obj['remaining']
-    threshold = _GRAPHQL_RATE_LIMIT_REMAINING_THRESHOLD
-    if remaining > threshold:
-        return
-    reset_at = datetime.fromtimestamp(rate_limit_obj['reset'], tz=tz.utc)
-    now = datetime.now(tz.utc)
-    # add an extra minute for safety
-    sleep_duration = reset_at - now + timedelta(minutes=1)
-    logger.warning(
-        f'Github graphql ratelimit has {remaining} remaining and is under threshold {threshold},'
-        f' sleeping until reset at {reset_at} for {sleep_duration}',
-    )
-    time.sleep(sleep_duration.seconds)
+class GraphqlRateLimiter:
+    """
+    Paces the GraphQL requests made with one token so that its rate limit budget is spread over the rest of the rate
+    limit window, instead of being spent as fast as possible and then sleeping until the window resets. The budget is
+    read from the rate limit headers of every response, and the cost of a query from the `rateLimit` object that the
+    queries request inline, so no extra call to the REST `/rate_limit` endpoint is needed.
+
+    Requests are not delayed while more than `pace_below` of the limit remains. Below that, requests are spaced so that
+    the remaining budget, minus `reserve` points kept for other clients of the token, lasts until the reset. The
+    limiter is shared by all threads using the token, so concurrent requests are paced together.
+    """
+
+    def __init__(
+        self,
+        reserve: int = _GRAPHQL_RATE_LIMIT_REMAINING_THRESHOLD,
+        pace_below: float = _GRAPHQL_RATE_LIMIT_PACE_BELOW,
+    ) -> None:
+        self.reserve = reserve
+        self.pace_below = pace_below
+        self._lock = threading.Lock()
+        self._limit: Optional[int] = None
+        self._remaining: Optional[float] = None
+        self._reset_at: Optional[float] = None
+        # Moving average of the cost of a query, in rate limit points
+        self._cost = 1.0
+        self._next_request_at = 0.0
+
+    def wait(self) -> None:
+        """
+        Blocks until the next request may be made within the budget.
+        """
+        with self._lock:
+            delay = self._reserve_request(time.time())
+        if delay > 0:
+            logger.debug(f"Pacing GitHub GraphQL requests, sleeping for {delay:.1f} seconds.")
+            time.sleep(delay)
+
+    def _reserve_request(self, now: float) -> float:
+        if self._remaining is None or self._reset_at is None:
+            return 0.0
+        if self._reset_at <= now:
+            # The window has reset, the new budget is known again after the next response
+            self._remaining = None
+            return 0.0
+        if self._limit and self._remaining > self._limit * self.pace_below:
+            self._remaining -= self._cost
+            return 0.0
+
+        available = self._remaining - self.reserve
+        if available < self._cost:
+            delay = self._reset_at + _GRAPHQL_RATE_LIMIT_RESET_MARGIN - now
+            logger.warning(
+                f'Github graphql ratelimit has {int(self._remaining)} remaining and is under threshold '
+                f'{self.reserve}, sleeping until reset for {delay:.0f} seconds',
+            )
+            return delay
+        start = max(now, self._next_request_at)
+        self._next_request_at = start + (self._reset_at - now) * self._cost / available
+        # Count the request against the budget until its response tells the actual remaining points
+        self._remaining -= self._cost
+        return start - now
+
+    def update(self, response: requests.Response) -> None:
+        """
+        Records the budget reported by a GraphQL response.
+        """
+        headers = response.headers
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        limit = headers.get('X-RateLimit-Limit')
+        rate_limit: Dict[str, Any] = {}
+        if response.ok:
+            try:
+                rate_limit = (response.json().get('data') or {}).get('rateLimit') or {}
+            except ValueError:
+                pass
+        with self._lock:
+            if remaining is not None and reset is not None:
+                self._remaining = float(remaining)
+                self._reset_at = float(reset)
+            elif 'remaining' in rate_limit and 'resetAt' in rate_limit:
+                self._remaining = float(rate_limit['remaining'])
+                self._reset_at = datetime.strptime(
+                    rate_limit['resetAt'], '%Y-%m-%dT%H:%M:%SZ',
+                ).replace(tzinfo=tz.utc).timestamp()
+            if limit is not None:
+                self._limit = int(limit)
+            elif 'limit' in rate_limit:
+                self._limit = int(rate_limit['limit'])
+            if 'cost' in rate_limit:
+                self._cost = max(1.0, 0.8 * self._cost + 0.2 * float(rate_limit['cost']))
+
+
+_rate_limiters: Dict[str, GraphqlRateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(token: str) -> GraphqlRateLimiter:
+    """
+    Returns the rate limiter shared by every request made with the given token.
+    """
+    with _rate_limiters_lock:
+        if token not in _rate_limiters:
+            _rate_limiters[token] = GraphqlRateLimiter()
+        return _rate_limiters[token]
 
 
 def call_github_api(query: str, variables: str, token: str, api_url: str) -> Dict:
@@ -59,6 +147,8 @@ def call_github_api(query: str, variables: str, token: str, api_url: str) -> Dic
     :return: query results json
     """
     headers = {'Authorization': f"token {token}"}
+    rate_limiter = get_rate_limiter(token)
+    rate_limiter.wait()
     try:
         response = requests.post(
             api_url,
@@ -70,6 +160,7 @@ def call_github_api(query: str, variables: str, token: str, api_url: str) -> Dic
         # Add context and re-raise for callers to handle
         logger.warning("GitHub: requests.get('%s') timed out.", api_url)
         raise
+    rate_limiter.update(response)
     response.raise_for_status()
     response_json = response.json()
     if "errors" in response_json:
@@ -117,6 +208,7 @@ def fetch_all(
         resource_type: str,
         retries: int = 5,
         resource_inner_type: Optional[str] = None,
+        stop_after_page: Optional[Callable[[List[Dict[str, Any]]], bool]] = None,
         **kwargs: Any,
 ) -> Tuple[PaginatedGraphqlData, Dict[str, Any]]:
     """
@@ -133,6 +225,8 @@ def fetch_all(
     :param resource_inner_type: Optional str. Default = None. Sometimes we need to paginate a field that is inside
     `resource_type` - for example: organization['team']['repositories']. In this case, we specify 'repositories' as the
     `resource_inner_type`.
+    :param stop_after_page: Optional predicate called with the nodes of each page. Pagination stops after the first
+    page for which it returns True.
     :param kwargs: Additional key-value args (other than `login` and `cursor`) to pass to the GraphQL query variables.
     :return: A 2-tuple containing 1. A list of data items of the given `resource_type` and `field_name`,  and 2. a dict
     containing the `url` and the `login` fields of the organization that the items belong to.
@@ -146,9 +240,6 @@ def fetch_all(
     while has_next_page:
         exc: Any = None
         try:
-            # In the future, we may use also use the rateLimit object from the graphql response.
-            # But we still need at least one call to the REST endpoint in case the graphql remaining is already 0
-            handle_rate_limit_sleep(token)
             resp = fetch_page(token, api_url, organization, query, cursor, **kwargs)
             retry = 0
         except requests.exceptions.Timeout as err:
@@ -191,6 +282,8 @@ def fetch_all(
 
         cursor = resource['pageInfo']['endCursor']
         has_next_page = resource['pageInfo']['hasNextPage']
+        if stop_after_page and stop_after_page(resource.get('nodes', [])):
+            has_next_page = False
         if not org_data:
             org_data = {
                 'url': resp['data']['organization']['url'],
@@ -4,7 +4,6 @@ import logging
 import os
 from collections import namedtuple
 
-import googleapiclient.discovery
 import neo4j
 from google.auth.exceptions import DefaultCredentialsError
 from google.auth.transport.requests import Request
@@ -16,6 +15,7 @@ from googleapiclient.discovery import Resource
 
 from cartography.config import Config
 from cartography.intel.gsuite import api
+from cartography.util import build_google_api_client
 from cartography.util import timeit
 
 OAUTH_SCOPE = [
@@ -37,7 +37,7 @@ def _get_admin_resource(credentials: OAuth2Credentials | ServiceAccountCredentia
     :param credentials: The credentials object
     :return: An admin api resource object
     """
-    return googleapiclient.discovery.build('admin', 'directory_v1', credentials=credentials, cache_discovery=False)
+    return build_google_api_client('admin', 'directory_v1', credentials)
 
 
 def _initialize_resources(credentials: OAuth2Credentials | ServiceAccountCredentials) -> Resources:
@@ -5,6 +5,7 @@ from typing import List
 import neo4j
 from googleapiclient.discovery import Resource
 
+from cartography.client.core.session import CoalescingSession
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
@@ -279,6 +280,7 @@ def sync_gsuite_groups(
 def sync_gsuite_members(
     groups: List[Dict], neo4j_session: neo4j.Session, admin: Resource, gsuite_update_tag: int,
 ) -> None:
-    for group in groups:
-        members = get_members_for_group(admin, group['email'])
-        load_gsuite_members(neo4j_session, group, members, gsuite_update_tag)
+    with CoalescingSession(neo4j_session) as session:
+        for group in groups:
+            members = get_members_for_group(admin, group['email'])
+            load_gsuite_members(session, group, members, gsuite_update_tag)
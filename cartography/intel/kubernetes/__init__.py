@@ -1,19 +1,76 @@
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
 
 from neo4j import Session
 
+from cartography.client.core.session import SerializedSession
 from cartography.config import Config
 from cartography.intel.kubernetes.namespaces import sync_namespaces
 from cartography.intel.kubernetes.pods import sync_pods
 from cartography.intel.kubernetes.secrets import sync_secrets
 from cartography.intel.kubernetes.services import sync_services
+from cartography.intel.kubernetes.util import DEFAULT_WATCH_TIMEOUT
 from cartography.intel.kubernetes.util import get_k8s_clients
+from cartography.intel.kubernetes.util import K8sClient
+from cartography.intel.kubernetes.watch_state import WatchState
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
 
+class KubernetesSyncError(Exception):
+    pass
+
+
+def sync_cluster(
+    session: Session,
+    client: K8sClient,
+    update_tag: int,
+    timeout: Optional[float] = None,
+    watch_state: Optional[WatchState] = None,
+    watch_timeout: int = DEFAULT_WATCH_TIMEOUT,
+) -> None:
+    """
+    Syncs the namespaces, pods, services and secrets of a single cluster. If a timeout is given, the sync fails with
+    KubernetesSyncTimeout once it has run for that many seconds. If a watch state is given, pods are synced
+    incrementally from the resourceVersion of the previous sync.
+    """
+    logger.info(f"Syncing data for k8s cluster {client.name}...")
+    if timeout:
+        client.deadline = time.monotonic() + timeout
+    cluster = sync_namespaces(session, client, update_tag)
+    pods = sync_pods(session, client, update_tag, cluster, watch_state, watch_timeout)
+    sync_services(session, client, update_tag, cluster, pods)
+    sync_secrets(session, client, update_tag, cluster)
+
+
+def _sync_cluster_timed(
+    session: Session,
+    client: K8sClient,
+    update_tag: int,
+    timeout: Optional[float],
+    watch_state: Optional[WatchState],
+    watch_timeout: int,
+) -> Tuple[bool, float]:
+    """
+    Syncs a single cluster without raising, so that a failing cluster does not stop the others. Returns whether the
+    sync succeeded and how long it took.
+    """
+    start = time.monotonic()
+    try:
+        sync_cluster(session, client, update_tag, timeout, watch_state, watch_timeout)
+        return True, time.monotonic() - start
+    except Exception:
+        logger.exception(f"Failed to sync data for k8s cluster {client.name}...")
+        return False, time.monotonic() - start
+
+
 @timeit
 def start_k8s_ingestion(session: Session, config: Config) -> None:
 
@@ -22,16 +79,38 @@ def start_k8s_ingestion(session: Session, config: Config) -> None:
         logger.error("kubeconfig not found.")
         return
 
-    for client in get_k8s_clients(config.k8s_kubeconfig):
-        logger.info(f"Syncing data for k8s cluster {client.name}...")
-        try:
-            cluster = sync_namespaces(session, client, config.update_tag)
-            pods = sync_pods(session, client, config.update_tag, cluster)
-            sync_services(session, client, config.update_tag, cluster, pods)
-            sync_secrets(session, client, config.update_tag, cluster)
-        except Exception:
-            logger.exception(f"Failed to sync data for k8s cluster {client.name}...")
-            raise
+    clients = get_k8s_clients(config.k8s_kubeconfig)
+    workers = config.k8s_cluster_workers or 1
+    timeout = config.k8s_cluster_timeout
+    watch_state = WatchState(config.k8s_watch_state_path) if config.k8s_watch_state_path else None
+    watch_timeout = config.k8s_watch_timeout or DEFAULT_WATCH_TIMEOUT
+    # Clusters share the Neo4j session one call at a time, so each cluster's data is still loaded in order.
+    cluster_session = SerializedSession(session) if workers > 1 else session
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _sync_cluster_timed, cluster_session, client, config.update_tag, timeout, watch_state,
+                    watch_timeout,
+                )
+                for client in clients
+            ]
+            results: Dict[str, Tuple[bool, float]] = {
+                client.name: future.result() for client, future in zip(clients, futures)
+            }
+    finally:
+        if watch_state is not None:
+            watch_state.close()
+
+    for name, (succeeded, duration) in sorted(results.items(), key=lambda item: -item[1][1]):
+        logger.info(f"k8s cluster {name}: {'synced' if succeeded else 'FAILED'} in {duration:.1f} seconds.")
+    failed: List[str] = [name for name, (succeeded, _) in results.items() if not succeeded]
+    if failed:
+        # The cleanup would delete the data of the clusters that could not be synced, so it is skipped.
+        raise KubernetesSyncError(
+            f"Failed to sync {len(failed)} of {len(results)} k8s clusters: {', '.join(sorted(failed))}. "
+            "Skipped the cleanup of stale k8s data.",
+        )
 
     run_cleanup_job(
         "kubernetes_import_cleanup.json",
@@ -1,12 +1,15 @@
+import json
 import logging
+from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
-from typing import Tuple
 
 from neo4j import Session
 
-from cartography.intel.kubernetes.util import get_epoch
+from cartography.intel.kubernetes.util import get_epoch_from_timestamp
 from cartography.intel.kubernetes.util import K8sClient
+from cartography.intel.kubernetes.util import list_paginated
 from cartography.stats import get_stats_client
 from cartography.util import merge_module_sync_metadata
 from cartography.util import timeit
@@ -17,8 +20,9 @@ stat_handler = get_stats_client(__name__)
 
 @timeit
 def sync_namespaces(session: Session, client: K8sClient, update_tag: int) -> Dict:
-    cluster, namespaces = get_namespaces(client)
-    load_namespaces(session, cluster, namespaces, update_tag)
+    cluster = get_cluster(client)
+    for namespaces in get_namespaces(client):
+        load_namespaces(session, cluster, namespaces, update_tag)
     merge_module_sync_metadata(
         session,
         group_type='KubernetesCluster',
@@ -31,21 +35,31 @@ def sync_namespaces(session: Session, client: K8sClient, update_tag: int) -> Dic
 
 
 @timeit
-def get_namespaces(client: K8sClient) -> Tuple[Dict, List[Dict]]:
-    cluster = dict()
-    namespaces = list()
-    for namespace in client.core.list_namespace().items:
-        namespaces.append(
-            {
-                "uid": namespace.metadata.uid,
-                "name": namespace.metadata.name,
-                "creation_timestamp": get_epoch(namespace.metadata.creation_timestamp),
-                "deletion_timestamp": get_epoch(namespace.metadata.deletion_timestamp),
-            },
-        )
-        if namespace.metadata.name == "kube-system":
-            cluster = {"uid": namespace.metadata.uid, "name": client.name}
-    return cluster, namespaces
+def get_cluster(client: K8sClient) -> Dict:
+    """
+    The cluster is identified by the uid of its kube-system namespace.
+    """
+    # With _preload_content=False the raw HTTP response is returned instead of a V1Namespace.
+    response: Any = client.core.read_namespace(
+        "kube-system", _preload_content=False, _request_timeout=client.request_timeout(),
+    )
+    namespace = json.loads(response.data)
+    return {"uid": namespace["metadata"]["uid"], "name": client.name}
+
+
+def get_namespaces(client: K8sClient) -> Iterator[List[Dict]]:
+    for page in list_paginated(client.core.list_namespace, client):
+        yield [transform_namespace(namespace) for namespace in page.get("items") or list()]
+
+
+def transform_namespace(namespace: Dict) -> Dict:
+    metadata = namespace["metadata"]
+    return {
+        "uid": metadata["uid"],
+        "name": metadata["name"],
+        "creation_timestamp": get_epoch_from_timestamp(metadata.get("creationTimestamp")),
+        "deletion_timestamp": get_epoch_from_timestamp(metadata.get("deletionTimestamp")),
+    }
 
 
 def load_namespaces(
@@ -1,70 +1,165 @@
 import logging
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
 
 from neo4j import Session
 
-from cartography.intel.kubernetes.util import get_epoch
+from cartography.intel.kubernetes.util import DEFAULT_PAGE_SIZE
+from cartography.intel.kubernetes.util import DEFAULT_WATCH_TIMEOUT
+from cartography.intel.kubernetes.util import get_epoch_from_timestamp
 from cartography.intel.kubernetes.util import K8sClient
+from cartography.intel.kubernetes.util import list_paginated
+from cartography.intel.kubernetes.util import ResourceVersionExpired
+from cartography.intel.kubernetes.util import watch_events
+from cartography.intel.kubernetes.watch_state import WatchState
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+WATCH_STATE_KIND = "pods"
+
 
 @timeit
 def sync_pods(
-    session: Session, client: K8sClient, update_tag: int, cluster: Dict,
+    session: Session,
+    client: K8sClient,
+    update_tag: int,
+    cluster: Dict,
+    watch_state: Optional[WatchState] = None,
+    watch_timeout: int = DEFAULT_WATCH_TIMEOUT,
 ) -> List[Dict]:
-    pods = get_pods(client, cluster)
-    load_pods(session, pods, update_tag)
-    return pods
+    """
+    Loads the pods of the cluster page by page, and returns the uid and labels of every pod for service matching.
 
+    If a watch state is given and holds the resourceVersion of a previous sync of this cluster, only the pods that
+    changed since then are loaded. The pods are listed in full on the first sync, when the resourceVersion has
+    expired, or when the graph no longer holds the pods recorded in the watch state.
+    """
+    if watch_state is not None:
+        state = watch_state.get(cluster["uid"], WATCH_STATE_KIND)
+        if state is not None:
+            resource_version, labels = state
+            if get_pod_count(session, cluster["uid"]) != len(labels):
+                logger.info(f"The graph does not match the watch state of k8s cluster {client.name}, listing pods.")
+            else:
+                try:
+                    return sync_pod_changes(
+                        session, client, update_tag, cluster, watch_state, resource_version, labels, watch_timeout,
+                    )
+                except ResourceVersionExpired:
+                    logger.info(f"resourceVersion of k8s cluster {client.name} has expired, listing pods.")
 
-@timeit
-def get_pods(client: K8sClient, cluster: Dict) -> List[Dict]:
-    pods = list()
-    for pod in client.core.list_pod_for_all_namespaces().items:
-        containers = {}
-        for container in pod.spec.containers:
-            containers[container.name] = {
-                "name": container.name,
-                "image": container.image,
-                "uid": f"{pod.metadata.uid}-{container.name}",
-            }
-        if pod.status and pod.status.container_statuses:
-            for status in pod.status.container_statuses:
-                if status.name in containers:
-                    _state = 'waiting'
-                    if status.state.running:
-                        _state = 'running'
-                    elif status.state.terminated:
-                        _state = 'terminated'
-                    try:
-                        image_sha = status.image_id.split("@")[1]
-                    except IndexError:
-                        image_sha = None
-                    containers[status.name]["status"] = {
-                        "image_id": status.image_id,
-                        "image_sha": image_sha,
-                        "ready": status.ready,
-                        "started": status.started,
-                        "state": _state,
-                    }
-        pods.append(
-            {
-                "uid": pod.metadata.uid,
-                "name": pod.metadata.name,
-                "status_phase": pod.status.phase,
-                "creation_timestamp": get_epoch(pod.metadata.creation_timestamp),
-                "deletion_timestamp": get_epoch(pod.metadata.deletion_timestamp),
-                "namespace": pod.metadata.namespace,
-                "node": pod.spec.node_name,
-                "cluster_uid": cluster["uid"],
-                "labels": pod.metadata.labels,
-                "containers": list(containers.values()),
-            },
+    pod_labels: List[Dict] = list()
+    list_resource_version = None
+    for list_resource_version, pods in get_pods(client, cluster):
+        load_pods(session, pods, update_tag)
+        pod_labels.extend({"uid": pod["uid"], "labels": pod["labels"]} for pod in pods)
+    if watch_state is not None and list_resource_version:
+        watch_state.replace(
+            cluster["uid"], WATCH_STATE_KIND, list_resource_version, {pod["uid"]: pod["labels"] for pod in pod_labels},
         )
-    return pods
+    return pod_labels
+
+
+def get_pods(client: K8sClient, cluster: Dict) -> Iterator[Tuple[str, List[Dict]]]:
+    """
+    Yields the resourceVersion of the list along with the pods of each page.
+    """
+    for page in list_paginated(client.core.list_pod_for_all_namespaces, client):
+        resource_version = page.get("metadata", {}).get("resourceVersion")
+        yield resource_version, [transform_pod(pod, cluster) for pod in page.get("items") or list()]
+
+
+def sync_pod_changes(
+    session: Session,
+    client: K8sClient,
+    update_tag: int,
+    cluster: Dict,
+    watch_state: WatchState,
+    resource_version: str,
+    labels: Dict[str, Optional[Dict]],
+    watch_timeout: int = DEFAULT_WATCH_TIMEOUT,
+) -> List[Dict]:
+    """
+    Watches the pods of the cluster from the given resourceVersion, and loads the pods that were added or modified.
+    The pods that did not change are moved to this update tag, while the deleted pods are left for the cleanup job
+    to remove, as after a full list.
+    """
+    changed: Dict[str, Dict] = dict()
+    deleted: Set[str] = set()
+    for event in watch_events(client.core.list_pod_for_all_namespaces, resource_version, client, watch_timeout):
+        pod = event["object"]
+        resource_version = pod["metadata"]["resourceVersion"]
+        if event["type"] == "DELETED":
+            changed.pop(pod["metadata"]["uid"], None)
+            deleted.add(pod["metadata"]["uid"])
+        elif event["type"] in ("ADDED", "MODIFIED"):
+            changed[pod["metadata"]["uid"]] = transform_pod(pod, cluster)
+            deleted.discard(pod["metadata"]["uid"])
+    logger.info(f"Watched {len(changed)} changed and {len(deleted)} deleted pods in k8s cluster {client.name}.")
+
+    touch_pods(session, cluster["uid"], deleted | set(changed), update_tag)
+    pods = list(changed.values())
+    for i in range(0, len(pods), DEFAULT_PAGE_SIZE):
+        load_pods(session, pods[i: i + DEFAULT_PAGE_SIZE], update_tag)
+    watch_state.update(
+        cluster["uid"], WATCH_STATE_KIND, resource_version, {pod["uid"]: pod["labels"] for pod in pods}, deleted,
+    )
+
+    for uid in deleted:
+        labels.pop(uid, None)
+    labels.update({pod["uid"]: pod["labels"] for pod in pods})
+    return [{"uid": uid, "labels": pod_labels} for uid, pod_labels in labels.items()]
+
+
+def transform_pod(pod: Dict, cluster: Dict) -> Dict:
+    metadata = pod["metadata"]
+    spec = pod.get("spec") or dict()
+    status = pod.get("status") or dict()
+    containers = {}
+    for container in spec.get("containers") or list():
+        containers[container["name"]] = {
+            "name": container["name"],
+            "image": container.get("image"),
+            "uid": f"{metadata['uid']}-{container['name']}",
+        }
+    for container_status in status.get("containerStatuses") or list():
+        if container_status["name"] in containers:
+            state = container_status.get("state") or dict()
+            _state = 'waiting'
+            if state.get("running") is not None:
+                _state = 'running'
+            elif state.get("terminated") is not None:
+                _state = 'terminated'
+            image_id = container_status.get("imageID")
+            try:
+                image_sha = image_id.split("@")[1] if image_id else None
+            except IndexError:
+                image_sha = None
+            containers[container_status["name"]]["status"] = {
+                "image_id": image_id,
+                "image_sha": image_sha,
+                "ready": container_status.get("ready"),
+                "started": container_status.get("started"),
+                "state": _state,
+            }
+    return {
+        "uid": metadata["uid"],
+        "name": metadata["name"],
+        "status_phase": status.get("phase"),
+        "creation_timestamp": get_epoch_from_timestamp(metadata.get("creationTimestamp")),
+        "deletion_timestamp": get_epoch_from_timestamp(metadata.get("deletionTimestamp")),
+        "namespace": metadata.get("namespace"),
+        "node": spec.get("nodeName"),
+        "cluster_uid": cluster["uid"],
+        "labels": metadata.get("labels"),
+        "containers": list(containers.values()),
+    }
 
 
 def load_pods(session: Session, data: List[Dict], update_tag: int) -> None:
@@ -105,3 +200,32 @@ def load_pods(session: Session, data: List[Dict], update_tag: int) -> None:
     """
     logger.info(f"Loading {len(data)} kubernetes pods.")
     session.run(ingestion_cypher_query, pods=data, update_tag=update_tag)
+
+
+def get_pod_count(session: Session, cluster_uid: str) -> int:
+    query = """
+    MATCH (:KubernetesCluster {id: $cluster_uid})-[:HAS_POD]->(pod:KubernetesPod)
+    RETURN count(pod) AS count
+    """
+    return session.run(query, cluster_uid=cluster_uid).single()["count"]
+
+
+def touch_pods(session: Session, cluster_uid: str, excluded: Iterable[str], update_tag: int) -> None:
+    """
+    Moves the pods of the cluster, except the excluded ones, and their containers to this update tag, so that the
+    cleanup job keeps the pods that did not change since the last sync.
+    """
+    touch_query = """
+    MATCH (:KubernetesCluster {id: $cluster_uid})-[rel1:HAS_POD]->(pod:KubernetesPod)
+    WHERE NOT pod.id IN $excluded
+    SET pod.lastupdated = $update_tag,
+        rel1.lastupdated = $update_tag
+    WITH pod
+    OPTIONAL MATCH (:KubernetesNamespace)-[rel2:HAS_POD]->(pod)
+    SET rel2.lastupdated = $update_tag
+    WITH pod
+    OPTIONAL MATCH (pod)-[rel3:HAS_CONTAINER]->(container:KubernetesContainer)
+    SET rel3.lastupdated = $update_tag,
+        container.lastupdated = $update_tag
+    """
+    session.run(touch_query, cluster_uid=cluster_uid, excluded=list(excluded), update_tag=update_tag)
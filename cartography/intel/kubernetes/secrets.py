@@ -1,15 +1,25 @@
 import logging
 from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
 
+from kubernetes.client import ApiClient
+from kubernetes.client import CoreV1Api
 from neo4j import Session
 
-from cartography.intel.kubernetes.util import get_epoch
+from cartography.intel.kubernetes.util import get_epoch_from_timestamp
 from cartography.intel.kubernetes.util import K8sClient
+from cartography.intel.kubernetes.util import list_paginated
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# Secrets are listed as a table of their name, type, number of data keys and age, along with the metadata of each
+# secret as a PartialObjectMetadata. Their data is never sent. Unlike the PartialObjectMetadataList representation,
+# the table keeps the secret type, which is not part of the metadata.
+SECRET_TABLE_ACCEPT = "application/json;as=Table;v=v1;g=meta.k8s.io"
+
 
 @timeit
 def sync_secrets(
@@ -17,27 +27,49 @@ def sync_secrets(
     client: K8sClient,
     update_tag: int,
     cluster: Dict,
-) -> List[Dict]:
-    secrets = get_secrets(client, cluster)
-    load_secrets(session, secrets, update_tag)
-    return secrets
+) -> None:
+    for secrets in get_secrets(client, cluster):
+        load_secrets(session, secrets, update_tag)
 
 
-@timeit
-def get_secrets(client: K8sClient, cluster: Dict) -> List[Dict]:
-    return [
-        {
-            "uid": secret.metadata.uid,
-            "name": secret.metadata.name,
-            "creation_timestamp": get_epoch(secret.metadata.creation_timestamp),
-            "deletion_timestamp": get_epoch(secret.metadata.deletion_timestamp),
-            "namespace": secret.metadata.namespace,
-            "cluster_uid": cluster["uid"],
-            "labels": secret.metadata.labels,
-            "type": secret.type,
-        }
-        for secret in client.core.list_secret_for_all_namespaces().items
-    ]
+def _get_secret_table_api(client: K8sClient) -> CoreV1Api:
+    """
+    Returns a CoreV1Api of the cluster that asks for lists in the Table representation.
+    """
+    api_client = ApiClient(
+        configuration=client.core.api_client.configuration,
+        header_name="Accept",
+        header_value=SECRET_TABLE_ACCEPT,
+    )
+    return CoreV1Api(api_client=api_client)
+
+
+def get_secrets(client: K8sClient, cluster: Dict) -> Iterator[List[Dict]]:
+    type_column = None
+    for table in list_paginated(_get_secret_table_api(client).list_secret_for_all_namespaces, client):
+        # The column definitions may be omitted from the pages that follow the first one.
+        if table.get("columnDefinitions"):
+            type_column = [column["name"] for column in table["columnDefinitions"]].index("Type")
+        yield transform_secret_table(table, cluster, type_column)
+
+
+def transform_secret_table(table: Dict, cluster: Dict, type_column: Optional[int]) -> List[Dict]:
+    secrets = list()
+    for row in table.get("rows") or list():
+        metadata = row["object"]["metadata"]
+        secrets.append(
+            {
+                "uid": metadata["uid"],
+                "name": metadata["name"],
+                "creation_timestamp": get_epoch_from_timestamp(metadata.get("creationTimestamp")),
+                "deletion_timestamp": get_epoch_from_timestamp(metadata.get("deletionTimestamp")),
+                "namespace": metadata.get("namespace"),
+                "cluster_uid": cluster["uid"],
+                "labels": metadata.get("labels"),
+                "type": row["cells"][type_column] if type_column is not None else None,
+            },
+        )
+    return secrets
 
 
 def load_secrets(session: Session, data: List[Dict], update_tag: int) -> None:
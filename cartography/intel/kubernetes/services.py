@@ -1,11 +1,17 @@
 import logging
+from collections import defaultdict
 from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
 
 from neo4j import Session
 
-from cartography.intel.kubernetes.util import get_epoch
+from cartography.intel.kubernetes.util import get_epoch_from_timestamp
 from cartography.intel.kubernetes.util import K8sClient
+from cartography.intel.kubernetes.util import list_paginated
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
@@ -15,46 +21,61 @@ logger = logging.getLogger(__name__)
 def sync_services(
     session: Session, client: K8sClient, update_tag: int, cluster: Dict, pods: List[Dict],
 ) -> None:
-    services = get_services(client, cluster, pods)
-    load_services(session, services, update_tag)
+    for services in get_services(client, cluster, pods):
+        load_services(session, services, update_tag)
 
 
-@timeit
-def get_services(client: K8sClient, cluster: Dict, pods: List[Dict]) -> List[Dict]:
-    services = list()
-    for service in client.core.list_service_for_all_namespaces().items:
-        item = {
-            "uid": service.metadata.uid,
-            "name": service.metadata.name,
-            "creation_timestamp": get_epoch(service.metadata.creation_timestamp),
-            "deletion_timestamp": get_epoch(service.metadata.deletion_timestamp),
-            "namespace": service.metadata.namespace,
-            "cluster_uid": cluster["uid"],
-            "type": service.spec.type,
-            "selector": service.spec.selector,
-            "load_balancer_ip": service.spec.load_balancer_ip,
-        }
-
-        ingresses = service.status.load_balancer.ingress
-        for ingress in ingresses or list():
-            item.update({"ingress_host": ingress.hostname, "ingress_ip": ingress.ip})
-
-        service_pods = list()
-        for pod in pods:
-            is_service_pod = True if service.spec.selector else False
-            for selector in service.spec.selector or dict():
-                if (
-                    not pod.get("labels") or
-                    selector not in pod["labels"] or
-                    service.spec.selector[selector] != pod["labels"][selector]
-                ):
-                    is_service_pod = False
-                    break
-            if is_service_pod:
-                service_pods.append(pod)
-        item["pods"] = service_pods
-        services.append(item)
-    return services
+def build_pod_label_index(pods: List[Dict]) -> Dict[Tuple[str, str], Set[str]]:
+    """
+    Returns an index from each (label key, label value) pair to the uids of the pods that carry it.
+    """
+    index: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+    for pod in pods:
+        for key, value in (pod.get("labels") or {}).items():
+            index[(key, value)].add(pod["uid"])
+    return index
+
+
+def get_selected_pod_ids(
+    selector: Optional[Dict[str, str]], pod_label_index: Dict[Tuple[str, str], Set[str]],
+) -> List[str]:
+    """
+    Returns the uids of the pods that carry every label of the selector. An empty selector selects no pods.
+    """
+    if not selector:
+        return []
+    # Intersect the smallest sets first, so that the result shrinks as early as possible.
+    pod_id_sets = sorted((pod_label_index.get(item, set()) for item in selector.items()), key=len)
+    return sorted(set.intersection(*pod_id_sets))
+
+
+def get_services(client: K8sClient, cluster: Dict, pods: List[Dict]) -> Iterator[List[Dict]]:
+    pod_label_index = build_pod_label_index(pods)
+    for page in list_paginated(client.core.list_service_for_all_namespaces, client):
+        yield [transform_service(service, cluster, pod_label_index) for service in page.get("items") or list()]
+
+
+def transform_service(service: Dict, cluster: Dict, pod_label_index: Dict[Tuple[str, str], Set[str]]) -> Dict:
+    metadata = service["metadata"]
+    spec = service.get("spec") or dict()
+    item = {
+        "uid": metadata["uid"],
+        "name": metadata["name"],
+        "creation_timestamp": get_epoch_from_timestamp(metadata.get("creationTimestamp")),
+        "deletion_timestamp": get_epoch_from_timestamp(metadata.get("deletionTimestamp")),
+        "namespace": metadata.get("namespace"),
+        "cluster_uid": cluster["uid"],
+        "type": spec.get("type"),
+        "selector": spec.get("selector"),
+        "load_balancer_ip": spec.get("loadBalancerIP"),
+    }
+
+    ingresses = ((service.get("status") or dict()).get("loadBalancer") or dict()).get("ingress")
+    for ingress in ingresses or list():
+        item.update({"ingress_host": ingress.get("hostname"), "ingress_ip": ingress.get("ip")})
+
+    item["pod_ids"] = get_selected_pod_ids(spec.get("selector"), pod_label_index)
+    return item
 
 
 def load_services(session: Session, data: List[Dict], update_tag: int) -> None:
@@ -70,14 +91,14 @@ def load_services(session: Session, data: List[Dict], update_tag: int) -> None:
             service.load_balancer_ip = k8service.load_balancer_ip,
             service.ingress_host = k8service.ingress_host,
             service.ingress_ip = k8service.ingress_ip
-        WITH service, k8service.namespace as ns, k8service.cluster_uid as cuid, k8service.pods as k8pods
+        WITH service, k8service.namespace as ns, k8service.cluster_uid as cuid, k8service.pod_ids as pod_ids
         MATCH (cluster:KubernetesCluster {id: cuid})-[:HAS_NAMESPACE]->(space:KubernetesNamespace {name: ns})
         MERGE (space)-[rel1:HAS_SERVICE]->(service)
         ON CREATE SET rel1.firstseen = timestamp()
         SET rel1.lastupdated = $update_tag
-        WITH service, k8pods
-        UNWIND k8pods as k8pod
-            MATCH (pod:KubernetesPod {id: k8pod.uid})
+        WITH service, pod_ids
+        UNWIND pod_ids as pod_id
+            MATCH (pod:KubernetesPod {id: pod_id})
             MERGE (service)-[rel2:SERVES_POD]->(pod)
             ON CREATE SET rel2.firstseen = timestamp()
             SET rel2.lastupdated = $update_tag
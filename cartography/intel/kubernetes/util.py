@@ -1,19 +1,39 @@
+import json
+import time
 from datetime import datetime
+from datetime import timezone
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
 from typing import Union
 
 from kubernetes import config
 from kubernetes.client import ApiClient
 from kubernetes.client import CoreV1Api
 from kubernetes.client import NetworkingV1Api
+from kubernetes.client.exceptions import ApiException
+
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_WATCH_TIMEOUT = 10
 
 
 class KubernetesContextNotFound(Exception):
     pass
 
 
+class KubernetesSyncTimeout(Exception):
+    pass
+
+
+class ResourceVersionExpired(Exception):
+    pass
+
+
 class K8CoreApiClient(CoreV1Api):
-    def __init__(self, name: str, api_client: ApiClient = None) -> None:
+    def __init__(self, name: str, api_client: Optional[ApiClient] = None) -> None:
         self.name = name
         if not api_client:
             api_client = config.new_client_from_config(context=name)
@@ -21,7 +41,7 @@ class K8CoreApiClient(CoreV1Api):
 
 
 class K8NetworkingApiClient(NetworkingV1Api):
-    def __init__(self, name: str, api_client: ApiClient = None) -> None:
+    def __init__(self, name: str, api_client: Optional[ApiClient] = None) -> None:
         self.name = name
         if not api_client:
             api_client = config.new_client_from_config(context=name)
@@ -29,10 +49,24 @@ class K8NetworkingApiClient(NetworkingV1Api):
 
 
 class K8sClient:
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, api_client: Optional[ApiClient] = None) -> None:
         self.name = name
-        self.core = K8CoreApiClient(self.name)
-        self.networking = K8NetworkingApiClient(self.name)
+        self.core = K8CoreApiClient(self.name, api_client)
+        self.networking = K8NetworkingApiClient(self.name, api_client)
+        # Monotonic time by which the sync of this cluster must be done, if it is limited
+        self.deadline: Optional[float] = None
+
+    def request_timeout(self) -> Optional[float]:
+        """
+        Returns the number of seconds left before the deadline, to be used as the timeout of the next request, or None
+        if there is no deadline. Raises KubernetesSyncTimeout once the deadline has passed.
+        """
+        if self.deadline is None:
+            return None
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise KubernetesSyncTimeout(f"Timed out syncing k8s cluster {self.name}.")
+        return remaining
 
 
 def get_k8s_clients(kubeconfig: str) -> List[K8sClient]:
@@ -49,3 +83,92 @@ def get_epoch(date: datetime) -> Union[int, None]:
     if date:
         return int(date.strftime("%s"))
     return None
+
+
+def get_epoch_from_timestamp(timestamp: Optional[str]) -> Optional[int]:
+    """
+    Converts a timestamp of the raw API JSON, e.g. '2021-10-07T04:41:06Z', to seconds since the epoch.
+    """
+    if timestamp:
+        return int(datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp())
+    return None
+
+
+def list_paginated(
+    list_func: Callable[..., Any],
+    client: Optional[K8sClient] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    **kwargs: Any,
+) -> Iterator[Dict]:
+    """
+    Calls a kubernetes-client list function page by page with `limit` and `_continue`, and yields each page as parsed
+    JSON. The raw responses are parsed with json rather than deserialized into kubernetes-client models. If a client
+    is given, each request is limited to the time left before the client's deadline.
+    """
+    _continue = None
+    while True:
+        if client is not None:
+            kwargs["_request_timeout"] = client.request_timeout()
+        response = list_func(limit=limit, _continue=_continue, _preload_content=False, **kwargs)
+        page = json.loads(response.data)
+        yield page
+        _continue = page.get("metadata", {}).get("continue")
+        if not _continue:
+            return
+
+
+def watch_events(
+    list_func: Callable[..., Any],
+    resource_version: str,
+    client: Optional[K8sClient] = None,
+    timeout_seconds: int = DEFAULT_WATCH_TIMEOUT,
+    **kwargs: Any,
+) -> Iterator[Dict]:
+    """
+    Watches a kubernetes-client list function from the given resourceVersion, and yields each ADDED, MODIFIED, DELETED
+    and BOOKMARK event as parsed JSON until the API server ends the watch after `timeout_seconds`. Raises
+    ResourceVersionExpired if the resourceVersion is too old to watch from (410 Gone), in which case the resources must
+    be listed again.
+    """
+    if client is not None:
+        kwargs["_request_timeout"] = client.request_timeout()
+    try:
+        response = list_func(
+            watch=True,
+            resource_version=resource_version,
+            allow_watch_bookmarks=True,
+            timeout_seconds=timeout_seconds,
+            _preload_content=False,
+            **kwargs,
+        )
+    except ApiException as e:
+        if e.status == 410:
+            raise ResourceVersionExpired(f"resourceVersion {resource_version} is too old to watch from.") from e
+        raise
+    try:
+        for line in _iter_lines(response):
+            event = json.loads(line)
+            if event["type"] == "ERROR":
+                # The API server reports errors as a Status object in place of the watched object
+                status = event.get("object") or dict()
+                if status.get("code") == 410:
+                    raise ResourceVersionExpired(status.get("message"))
+                raise ApiException(status=status.get("code"), reason=status.get("message"))
+            yield event
+    finally:
+        response.release_conn()
+
+
+def _iter_lines(response: Any) -> Iterator[bytes]:
+    """
+    Splits a streamed watch response into its newline delimited events as they arrive.
+    """
+    pending = b""
+    for chunk in response.stream():
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if pending.strip():
+        yield pending
@@ -0,0 +1,99 @@
+import json
+import sqlite3
+import threading
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+
+
+class WatchState:
+    """
+    On-disk state of the incremental kubernetes sync, persisted in a SQLite file so that it is shared across syncs.
+    For every cluster and resource kind, it holds the resourceVersion up to which the graph is current, and the data
+    of the objects that later syncs need but cannot read back from the graph (e.g. the labels of pods).
+    """
+
+    def __init__(self, path: str):
+        # Clusters are synced from several threads, so the connection is shared under a lock.
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS resource_versions (
+                    cluster TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    resource_version TEXT NOT NULL,
+                    PRIMARY KEY (cluster, kind)
+                )
+                """,
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS objects (
+                    cluster TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    uid TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (cluster, kind, uid)
+                )
+                """,
+            )
+            self._conn.commit()
+
+    def get(self, cluster: str, kind: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Returns the resourceVersion and the objects, by uid, of the given cluster and kind, or None if the kind has
+        not been synced yet.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT resource_version FROM resource_versions WHERE cluster = ? AND kind = ?",
+                (cluster, kind),
+            ).fetchone()
+            if row is None:
+                return None
+            objects = self._conn.execute(
+                "SELECT uid, data FROM objects WHERE cluster = ? AND kind = ?",
+                (cluster, kind),
+            ).fetchall()
+        return row[0], {uid: json.loads(data) for uid, data in objects}
+
+    def replace(self, cluster: str, kind: str, resource_version: str, objects: Dict[str, Any]) -> None:
+        """
+        Stores the state of a full list, replacing the previous objects of the given cluster and kind.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM objects WHERE cluster = ? AND kind = ?", (cluster, kind))
+            self._write(cluster, kind, resource_version, objects, [])
+
+    def update(
+        self, cluster: str, kind: str, resource_version: str, objects: Dict[str, Any], deleted: Iterable[str],
+    ) -> None:
+        """
+        Stores the state after a watch, adding or replacing the given objects and removing the deleted uids.
+        """
+        with self._lock:
+            self._write(cluster, kind, resource_version, objects, deleted)
+
+    def _write(
+        self, cluster: str, kind: str, resource_version: str, objects: Dict[str, Any], deleted: Iterable[str],
+    ) -> None:
+        self._conn.executemany(
+            "DELETE FROM objects WHERE cluster = ? AND kind = ? AND uid = ?",
+            [(cluster, kind, uid) for uid in deleted],
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO objects (cluster, kind, uid, data) VALUES (?, ?, ?, ?)",
+            [(cluster, kind, uid, json.dumps(data)) for uid, data in objects.items()],
+        )
+        self._conn.execute(
+            "INSERT OR REPLACE INTO resource_versions (cluster, kind, resource_version) VALUES (?, ?, ?)",
+            (cluster, kind, resource_version),
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
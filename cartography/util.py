@@ -1,6 +1,8 @@
 import asyncio
 import logging
 import re
+import threading
+import time
 from functools import partial
 from functools import wraps
 from importlib.resources import open_binary
@@ -23,7 +25,9 @@ from typing import Union
 import backoff
 import boto3
 import botocore
+import googleapiclient.discovery
 import neo4j
+from googleapiclient.discovery import Resource
 
 from cartography.graph.job import GraphJob
 from cartography.graph.statement import get_job_shortname
@@ -39,6 +43,8 @@ STATUS_FAILURE = 1
 STATUS_KEYBOARD_INTERRUPT = 130
 DEFAULT_BATCH_SIZE = 1000
 
+_google_api_clients = threading.local()
+
 
 def run_analysis_job(
     filename: str,
@@ -439,3 +445,37 @@ def to_synchronous(*awaitables: Awaitable[Any]) -> List[Any]:
     results = to_synchronous(future_1, future_2)
     '''
     return asyncio.get_event_loop().run_until_complete(asyncio.gather(*awaitables))
+
+
+def build_google_api_client(service_name: str, version: str, credentials: Any) -> Resource:
+    """
+    Returns a googleapiclient Resource for the given API, built from the discovery document that ships with
+    google-api-python-client instead of one fetched over the network. Building a Resource parses the whole discovery
+    document (several MB for Compute), so built Resources are reused. They are not thread-safe, so each thread keeps
+    its own, keyed by API and credentials object.
+
+    :param service_name: the name of the API, e.g. 'compute'
+    :param version: the version of the API, e.g. 'v1'
+    :param credentials: the credentials used by the Resource
+    :return: a Resource for the API
+    """
+    clients = getattr(_google_api_clients, 'clients', None)
+    if clients is None:
+        clients = _google_api_clients.clients = {}
+    key = (service_name, version, id(credentials))
+    # The credentials are kept with the Resource so that their id cannot be reused by other credentials.
+    cached = clients.get(key)
+    if cached is not None and cached[0] is credentials:
+        return cached[1]
+
+    start = time.perf_counter()
+    client = googleapiclient.discovery.build(
+        service_name,
+        version,
+        credentials=credentials,
+        cache_discovery=False,
+        static_discovery=True,
+    )
+    logger.debug(f"Built {service_name} {version} client in {time.perf_counter() - start:.3f} seconds.")
+    clients[key] = (credentials, client)
+    return client
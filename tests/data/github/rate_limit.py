@@ -1,39 +0,0 @@
-RATE_LIMIT_RESPONSE_JSON = {
-    "resources": {
-        "core": {
-            "limit": 60,
-            "remaining": 60,
-            "reset": 1696988282,
-            "used": 0,
-            "resource": "core",
-        },
-        "graphql": {
-            "limit": 0,
-            "remaining": 0,
-            "reset": 1696987997,
-            "used": 0,
-            "resource": "graphql",
-        },
-        "integration_manifest": {
-            "limit": 5000,
-            "remaining": 5000,
-            "reset": 1696988282,
-            "used": 0,
-            "resource": "integration_manifest",
-        },
-        "search": {
-            "limit": 10,
-            "remaining": 10,
-            "reset": 1696984742,
-            "used": 0,
-            "resource": "search",
-        },
-    },
-    "rate": {
-        "limit": 60,
-        "remaining": 60,
-        "reset": 1696988282,
-        "used": 0,
-        "resource": "core",
-    },
-}
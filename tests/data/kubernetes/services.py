@@ -14,12 +14,7 @@ GET_SERVICES_DATA = [
         "namespace": GET_NAMESPACES_DATA[-1]["name"],
         "cluster_uid": GET_CLUSTER_DATA["uid"],
         "type": "ClusterIP",
-        "pods": [
-            {
-                "uid": GET_PODS_DATA[-1]["uid"],
-                "name": GET_PODS_DATA[-1]["name"],
-            },
-        ],
+        "pod_ids": [GET_PODS_DATA[-1]["uid"]],
         "load_balancer_ip": "1.1.1.1",
         "ingress_host": "myhost.local",
     },
@@ -101,6 +101,12 @@ def test_start_aws_ingestion(mock_perform_analysis, mock_sync_multiple, mock_org
         {
             "UPDATE_TAG": test_config.update_tag,
             "permission_relationships_file": test_config.permission_relationships_file,
+            "permission_relationships_workers": test_config.permission_relationships_workers,
+            "aws_s3_parse_workers": test_config.aws_s3_parse_workers,
+            "aws_ecr_incremental_sync": test_config.aws_ecr_incremental_sync,
+            "aws_metadata_cache_path": test_config.aws_metadata_cache_path,
+            "aws_metadata_cache_max_entries": test_config.aws_metadata_cache_max_entries,
+            "aws_metadata_cache_ttl": test_config.aws_metadata_cache_ttl,
         },
     )
 
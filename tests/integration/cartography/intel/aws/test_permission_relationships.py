@@ -0,0 +1,125 @@
+import cartography.intel.aws.permission_relationships
+from tests.integration.util import check_rels
+
+TEST_ACCOUNT_ID = '000000000000'
+TEST_REGION = 'us-east-1'
+TEST_UPDATE_TAG = 123456789
+READER_ARN = 'arn:aws:iam::000000000000:role/reader'
+WRITER_ARN = 'arn:aws:iam::000000000000:role/writer'
+RULES = """
+- target_label: S3Bucket
+  permissions:
+  - S3:GetObject
+  relationship_name: CAN_READ
+"""
+
+
+def _create_principal(neo4j_session, principal_arn, action, account_id=TEST_ACCOUNT_ID):
+    neo4j_session.run(
+        """
+        MERGE (acc:AWSAccount{id: $AccountId})
+        MERGE (acc)-[:RESOURCE]->(principal:AWSPrincipal{arn: $PrincipalArn})
+        MERGE (principal)-[:POLICY]->(policy:AWSPolicy{id: $PrincipalArn + '/policy'})
+        MERGE (policy)-[:STATEMENT]->(statement:AWSPolicyStatement{id: $PrincipalArn + '/policy/statement'})
+        SET statement.effect = 'Allow', statement.action = [$Action], statement.resource = ['*']
+        """,
+        AccountId=account_id,
+        PrincipalArn=principal_arn,
+        Action=action,
+    )
+
+
+def _create_bucket(neo4j_session, bucket_name, account_id=TEST_ACCOUNT_ID):
+    neo4j_session.run(
+        """
+        MERGE (acc:AWSAccount{id: $AccountId})
+        MERGE (acc)-[:RESOURCE]->(:S3Bucket{id: $BucketName, arn: 'arn:aws:s3:::' + $BucketName})
+        """,
+        AccountId=account_id,
+        BucketName=bucket_name,
+    )
+
+
+def _sync(neo4j_session, rules_file, update_tag, account_id=TEST_ACCOUNT_ID):
+    cartography.intel.aws.permission_relationships.sync(
+        neo4j_session,
+        None,
+        [TEST_REGION],
+        account_id,
+        update_tag,
+        {'UPDATE_TAG': update_tag, 'permission_relationships_file': str(rules_file)},
+    )
+
+
+def test_sync_permission_relationships_incrementally(neo4j_session, tmp_path):
+    # Arrange
+    rules_file = tmp_path / 'permission_relationships.yaml'
+    rules_file.write_text(RULES)
+    _create_principal(neo4j_session, READER_ARN, 's3:Get*')
+    _create_principal(neo4j_session, WRITER_ARN, 's3:Put*')
+    _create_bucket(neo4j_session, 'bucket1')
+
+    # Act
+    _sync(neo4j_session, rules_file, TEST_UPDATE_TAG)
+
+    # Assert
+    assert check_rels(neo4j_session, 'AWSPrincipal', 'arn', 'S3Bucket', 'id', 'CAN_READ') == {
+        (READER_ARN, 'bucket1'),
+    }
+
+    # Arrange: a new bucket is created and the writer is granted read access
+    _create_bucket(neo4j_session, 'bucket2')
+    _create_principal(neo4j_session, WRITER_ARN, 's3:*')
+
+    # Act
+    _sync(neo4j_session, rules_file, TEST_UPDATE_TAG + 1)
+
+    # Assert: the unchanged reader is evaluated against the new bucket and keeps its existing relationship
+    assert check_rels(neo4j_session, 'AWSPrincipal', 'arn', 'S3Bucket', 'id', 'CAN_READ') == {
+        (READER_ARN, 'bucket1'),
+        (READER_ARN, 'bucket2'),
+        (WRITER_ARN, 'bucket1'),
+        (WRITER_ARN, 'bucket2'),
+    }
+    result = neo4j_session.run(
+        """
+        MATCH (:AWSPrincipal)-[r:CAN_READ]->(:S3Bucket)
+        RETURN collect(DISTINCT r.lastupdated) AS lastupdated
+        """,
+    )
+    assert result.single()['lastupdated'] == [TEST_UPDATE_TAG + 1]
+
+
+def test_sync_permission_relationships_after_policies_are_reattached(neo4j_session, tmp_path):
+    # Arrange
+    account_id = '000000000001'
+    principal_arn = 'arn:aws:iam::000000000001:role/reader'
+    rules_file = tmp_path / 'permission_relationships.yaml'
+    rules_file.write_text(RULES)
+    _create_principal(neo4j_session, principal_arn, 's3:Get*', account_id)
+    _create_bucket(neo4j_session, 'reattached-bucket', account_id)
+    _sync(neo4j_session, rules_file, TEST_UPDATE_TAG, account_id)
+    assert (principal_arn, 'reattached-bucket') in check_rels(
+        neo4j_session, 'AWSPrincipal', 'arn', 'S3Bucket', 'id', 'CAN_READ',
+    )
+
+    # Act: the principal loses its policies
+    neo4j_session.run(
+        "MATCH (:AWSPrincipal{arn: $PrincipalArn})-[r:POLICY]->(:AWSPolicy) DELETE r",
+        PrincipalArn=principal_arn,
+    )
+    _sync(neo4j_session, rules_file, TEST_UPDATE_TAG + 1, account_id)
+
+    # Assert
+    assert (principal_arn, 'reattached-bucket') not in check_rels(
+        neo4j_session, 'AWSPrincipal', 'arn', 'S3Bucket', 'id', 'CAN_READ',
+    )
+
+    # Act: the same policies are attached again
+    _create_principal(neo4j_session, principal_arn, 's3:Get*', account_id)
+    _sync(neo4j_session, rules_file, TEST_UPDATE_TAG + 2, account_id)
+
+    # Assert: the principal is fully re-evaluated against the existing bucket
+    assert (principal_arn, 'reattached-bucket') in check_rels(
+        neo4j_session, 'AWSPrincipal', 'arn', 'S3Bucket', 'id', 'CAN_READ',
+    )
@@ -361,3 +361,37 @@ def test_python_library_in_multiple_requirements_files(neo4j_session):
     node_ids = {n['lib_ids'] for n in nodes}
     assert len(node_ids) == 2
     assert node_ids == {'okta', 'okta|0.9.0'}
+
+
+def test_touch_unchanged_repos(neo4j_session):
+    """
+    Ensure that an incremental sync keeps the repos it did not fetch, along with their relationships.
+    """
+    _ensure_local_neo4j_has_test_data(neo4j_session)
+    new_update_tag = TEST_UPDATE_TAG + 1
+
+    cartography.intel.github.repos.touch_unchanged_repos(
+        neo4j_session, new_update_tag, 'https://github.com/example_org',
+    )
+
+    nodes = neo4j_session.run(
+        """
+        MATCH (:GitHubOrganization{id: 'https://github.com/example_org'})<-[:OWNER]-(repo:GitHubRepository)
+        RETURN repo.id, repo.lastupdated
+        """,
+    )
+    assert {(n['repo.id'], n['repo.lastupdated']) for n in nodes} == {
+        ("https://github.com/example_org/sample_repo", new_update_tag),
+        ("https://github.com/example_org/SampleRepo2", new_update_tag),
+        ("https://github.com/lyft/cartography", new_update_tag),
+    }
+    stale = neo4j_session.run(
+        """
+        MATCH (:GitHubRepository)-[r]-()
+        WHERE type(r) IN ['OWNER', 'LANGUAGE', 'REQUIRES', 'DIRECT_COLLAB_WRITE', 'OUTSIDE_COLLAB_WRITE']
+        AND r.lastupdated <> $UpdateTag
+        RETURN count(r) AS stale
+        """,
+        UpdateTag=new_update_tag,
+    ).single()['stale']
+    assert stale == 0
@@ -0,0 +1,79 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from cartography.client.core.session import _run_coalesced_tx
+from cartography.client.core.session import CoalescingSession
+from cartography.client.core.session import rewrite_as_unwind
+from cartography.client.core.session import SerializedSession
+
+
+def test_rewrite_as_unwind():
+    query = """
+    MERGE (u:User{id: $Id})
+    SET u.name = $Name, u.note = 'keep $Id WITH this'
+    WITH u
+    MATCH (g:Group) WHERE g.name STARTS WITH $Prefix
+    MERGE (u)-[r:MEMBER_OF]->(g)
+    SET r.lastupdated = $UpdateTag, r.other = $NotPassed
+    """
+    assert rewrite_as_unwind(query, ['Id', 'Name', 'Prefix', 'UpdateTag']) == """UNWIND $coalesced_rows AS coalesced_row
+
+    MERGE (u:User{id: coalesced_row.Id})
+    SET u.name = coalesced_row.Name, u.note = 'keep $Id WITH this'
+    WITH coalesced_row, u
+    MATCH (g:Group) WHERE g.name STARTS WITH coalesced_row.Prefix
+    MERGE (u)-[r:MEMBER_OF]->(g)
+    SET r.lastupdated = coalesced_row.UpdateTag, r.other = $NotPassed
+    """
+
+
+def test_rewrite_as_unwind_rejects_unsafe_queries():
+    assert rewrite_as_unwind('MATCH (n{id: $Id}) RETURN n', ['Id']) is None
+    assert rewrite_as_unwind('MATCH (n{id: $Id}) WITH n LIMIT 1 DELETE n', ['Id']) is None
+
+
+def test_coalescing_session_batches_calls():
+    neo4j_session = MagicMock()
+    with CoalescingSession(neo4j_session, max_rows=3) as session:
+        for i in range(4):
+            session.run('MERGE (n:Node{id: $Id})', Id=i)
+            session.run('MERGE (m:Other{id: $Id})', {'Id': i})
+        # Reads flush the buffered writes first and are passed through
+        session.run('MATCH (n:Node) RETURN count(n)')
+        neo4j_session.run.assert_called_once_with('MATCH (n:Node) RETURN count(n)', {})
+
+    calls = [call.args for call in neo4j_session.write_transaction.call_args_list]
+    assert all(call[0] is _run_coalesced_tx for call in calls)
+    # The first query reaches 3 rows and flushes both buffers, the rest is flushed by the read in the order the
+    # queries were first run after the previous flush
+    assert [(call[1].split('\n')[1], [row['Id'] for row in call[2]]) for call in calls] == [
+        ('MERGE (n:Node{id: coalesced_row.Id})', [0, 1, 2]),
+        ('MERGE (m:Other{id: coalesced_row.Id})', [0, 1]),
+        ('MERGE (m:Other{id: coalesced_row.Id})', [2, 3]),
+        ('MERGE (n:Node{id: coalesced_row.Id})', [3]),
+    ]
+
+
+def test_coalescing_session_discards_writes_on_error():
+    neo4j_session = MagicMock()
+    with pytest.raises(ValueError):
+        with CoalescingSession(neo4j_session) as session:
+            session.run('MERGE (n:Node{id: $Id})', Id=1)
+            raise ValueError()
+
+    neo4j_session.write_transaction.assert_not_called()
+
+
+def test_serialized_session_fetches_results_under_lock():
+    neo4j_session = MagicMock()
+    neo4j_session.run.return_value.__iter__.return_value = iter(['record'])
+    session = SerializedSession(neo4j_session)
+
+    result = session.run('MATCH (n) RETURN n', {'Id': 1})
+
+    neo4j_session.run.assert_called_once_with('MATCH (n) RETURN n', {'Id': 1})
+    assert list(result) == ['record']
+    assert result.consume() is neo4j_session.run.return_value.consume.return_value
+    session.write_transaction(_run_coalesced_tx, 'query', [])
+    neo4j_session.write_transaction.assert_called_once_with(_run_coalesced_tx, 'query', [])
@@ -4,6 +4,7 @@ from unittest.mock import patch
 from botocore.exceptions import ClientError
 
 from cartography.intel.aws.ec2.images import get_images
+from cartography.intel.aws.util.metadata_cache import MetadataCache
 
 
 @patch('cartography.intel.aws.ec2.images.get_botocore_config')
@@ -70,3 +71,87 @@ def test_get_images_no_image_ids(mock_boto3_session, mock_get_botocore_config):
 
     assert len(result) == 1
     assert result[0]['ImageId'] == 'ami-12345678'
+
+
+@patch('cartography.intel.aws.ec2.images.get_botocore_config')
+@patch('boto3.session.Session')
+def test_get_images_uses_metadata_cache(mock_boto3_session, mock_get_botocore_config, tmp_path):
+    region = 'us-east-1'
+    metadata_cache = MetadataCache(str(tmp_path / 'cache.db'))
+
+    mock_client = MagicMock()
+    mock_boto3_session.client.return_value = mock_client
+    mock_client.describe_images.side_effect = [
+        {'Images': []},
+        {'Images': [{'ImageId': 'ami-12345678', 'Name': 'shared', 'State': 'available'}]},
+        {'Images': []},
+    ]
+    mock_get_botocore_config.return_value = {}
+
+    first = get_images(mock_boto3_session, region, ['ami-12345678'], metadata_cache, '000000000000')
+    second = get_images(mock_boto3_session, region, ['ami-12345678'], metadata_cache, '000000000000')
+
+    assert first == second == [{'ImageId': 'ami-12345678', 'Name': 'shared', 'State': 'available'}]
+    # The second sync only lists the account's own images
+    assert mock_client.describe_images.call_count == 3
+    mock_client.describe_images.assert_called_with(Owners=['self'])
+
+
+@patch('cartography.intel.aws.ec2.images.get_botocore_config')
+@patch('boto3.session.Session')
+def test_get_images_only_caches_available_images_per_account(
+    mock_boto3_session, mock_get_botocore_config, tmp_path,
+):
+    region = 'us-east-1'
+    metadata_cache = MetadataCache(str(tmp_path / 'cache.db'))
+
+    mock_client = MagicMock()
+    mock_boto3_session.client.return_value = mock_client
+    mock_client.describe_images.side_effect = [
+        {'Images': []},
+        {
+            'Images': [
+                {'ImageId': 'ami-11111111', 'State': 'pending'},
+                {'ImageId': 'ami-22222222', 'State': 'available'},
+            ],
+        },
+        {'Images': []},
+        {'Images': [{'ImageId': 'ami-11111111', 'State': 'available'}]},
+        {'Images': []},
+        {'Images': [{'ImageId': 'ami-22222222', 'State': 'available'}]},
+    ]
+    mock_get_botocore_config.return_value = {}
+    image_ids = ['ami-11111111', 'ami-22222222']
+
+    get_images(mock_boto3_session, region, image_ids, metadata_cache, '000000000000')
+    get_images(mock_boto3_session, region, image_ids, metadata_cache, '000000000000')
+    get_images(mock_boto3_session, region, ['ami-22222222'], metadata_cache, '111111111111')
+
+    # The pending image is described again, and another account does not reuse the cached description
+    assert mock_client.describe_images.call_args_list[3].kwargs == {'ImageIds': ['ami-11111111']}
+    assert mock_client.describe_images.call_args_list[5].kwargs == {'ImageIds': ['ami-22222222']}
+
+
+@patch('cartography.intel.aws.util.metadata_cache.time.time')
+@patch('cartography.intel.aws.ec2.images.get_botocore_config')
+@patch('boto3.session.Session')
+def test_get_images_describes_cached_images_again_after_ttl(
+    mock_boto3_session, mock_get_botocore_config, mock_time, tmp_path,
+):
+    region = 'us-east-1'
+    metadata_cache = MetadataCache(str(tmp_path / 'cache.db'), ttl=60)
+
+    mock_client = MagicMock()
+    mock_boto3_session.client.return_value = mock_client
+    mock_client.describe_images.side_effect = lambda **kwargs: {
+        'Images': [{'ImageId': 'ami-12345678', 'State': 'available'}] if 'ImageIds' in kwargs else [],
+    }
+    mock_get_botocore_config.return_value = {}
+
+    # Cache hits do not extend the lifetime of the cached description
+    for now in range(1000, 1080, 20):
+        mock_time.return_value = now
+        get_images(mock_boto3_session, region, ['ami-12345678'], metadata_cache, '000000000000')
+
+    described = [call for call in mock_client.describe_images.call_args_list if 'ImageIds' in call.kwargs]
+    assert len(described) == 2
@@ -0,0 +1,34 @@
+from unittest.mock import MagicMock
+
+import tests.data.aws.ec2.security_groups as test_data
+from cartography.intel.aws.ec2.security_groups import load_ec2_security_groupinfo
+from cartography.intel.aws.ec2.security_groups import transform_ec2_security_group_rules
+
+
+def test_transform_ec2_security_group_rules():
+    inbound_rules, egress_rules, ranges = transform_ec2_security_group_rules(test_data.DESCRIBE_SGS)
+
+    assert 6 == len(inbound_rules)
+    assert 8 == len(egress_rules)
+    assert {
+        'RuleId': 'sg-028e2522c72719996/IpPermissions/8080tcp',
+        'GroupId': 'sg-028e2522c72719996',
+        'FromPort': 80,
+        'ToPort': 80,
+        'Protocol': 'tcp',
+    } in inbound_rules
+    assert {'RangeId': '203.0.113.0/24', 'RuleId': 'sg-028e2522c72719996/IpPermissions/8080tcp'} in ranges
+
+
+def test_load_ec2_security_groupinfo_batches_writes():
+    """
+    Ensure that groups, inbound rules, egress rules and ranges are each written in one transaction, however many
+    groups there are.
+    """
+    mock_neo4j_session = MagicMock()
+    data = test_data.DESCRIBE_SGS * 50
+
+    load_ec2_security_groupinfo(mock_neo4j_session, data, 'eu-north-1', '000000000000', 123456789)
+
+    assert 4 == mock_neo4j_session.write_transaction.call_count
+    mock_neo4j_session.run.assert_not_called()
@@ -0,0 +1,48 @@
+import datetime
+
+from cartography.intel.aws import ecr
+
+
+DIGEST_1 = 'sha256:0000000000000000000000000000000000000000000000000000000000000001'
+DIGEST_2 = 'sha256:0000000000000000000000000000000000000000000000000000000000000002'
+DIGEST_3 = 'sha256:0000000000000000000000000000000000000000000000000000000000000003'
+
+
+def _image_details(*images):
+    return [
+        {
+            'imageDigest': digest,
+            'imageTags': tags,
+            'imagePushedAt': datetime.datetime(2023, 1, day, tzinfo=datetime.timezone.utc),
+        }
+        for digest, tags, day in images
+    ]
+
+
+def test_transform_ecr_image_details():
+    repo_images = ecr.transform_ecr_image_details(_image_details((DIGEST_1, ['1', 'latest'], 1), (DIGEST_2, [], 2)))
+    assert [(img['imageDigest'], img.get('imageTag')) for img in repo_images] == [
+        (DIGEST_1, '1'),
+        (DIGEST_1, 'latest'),
+        (DIGEST_2, None),
+    ]
+    assert 'imageTag' not in repo_images[2]
+
+
+def test_get_new_ecr_images():
+    previous_images = ecr.transform_ecr_image_details(_image_details((DIGEST_1, ['1'], 1), (DIGEST_2, ['2'], 2)))
+    watermark = ecr.get_ecr_images_watermark(previous_images)
+    assert watermark['image_digest_count'] == 2
+
+    # Nothing stored yet: full load
+    assert ecr.get_new_ecr_images(previous_images, None) is None
+    # Nothing changed
+    assert ecr.get_new_ecr_images(previous_images, watermark) == []
+    # A newer image was pushed
+    new_image = ecr.transform_ecr_image_details(_image_details((DIGEST_3, ['3'], 3)))
+    assert ecr.get_new_ecr_images(previous_images + new_image, watermark) == new_image
+    # An image was deleted
+    assert ecr.get_new_ecr_images(previous_images[:1] + new_image, watermark) is None
+    # A tag was moved to another existing image
+    moved_tag = ecr.transform_ecr_image_details(_image_details((DIGEST_1, ['1', '2'], 1), (DIGEST_2, [], 2)))
+    assert ecr.get_new_ecr_images(moved_tag, watermark) is None
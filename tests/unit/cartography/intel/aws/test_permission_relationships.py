@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from cartography.intel.aws import permission_relationships
 
 
@@ -464,3 +466,132 @@ def test_permissions_list():
         assert False
     except ValueError:
         assert True
+
+
+def test_get_clause_literal_prefix():
+    assert "arn:aws:s3:::test" == permission_relationships.get_clause_literal_prefix("arn:aws:s3:::Test*")
+    assert "arn:aws:s3:::test" == permission_relationships.get_clause_literal_prefix("arn:aws:s3:::test?")
+    assert "arn:aws:s3:::a.b" == permission_relationships.get_clause_literal_prefix("arn:aws:s3:::a.b")
+    assert "" == permission_relationships.get_clause_literal_prefix("*")
+    assert "" == permission_relationships.get_clause_literal_prefix("arn:aws:s3:::a|arn:aws:s3:::b")
+    assert "" == permission_relationships.get_clause_literal_prefix("arn:aws:s3:::ab+")
+
+
+def test_permission_evaluator_matches_principal_allowed_on_resource():
+    principals = {
+        "admin": {
+            "admin": [{"action": ["*"], "resource": ["*"], "effect": "Allow"}],
+        },
+        "denied": {
+            "allow": [{"action": ["s3:*"], "resource": ["*"], "effect": "Allow"}],
+            "deny": [{"action": ["s3:GetObject"], "resource": ["arn:aws:s3:::test*"], "effect": "Deny"}],
+        },
+        "prefixed": {
+            "allow": [{"action": ["s3:Get*"], "resource": ["arn:aws:s3:::prod-*"], "effect": "Allow"}],
+        },
+        "notresource": {
+            "allow": [{
+                "action": ["s3:*"],
+                "resource": ["arn:aws:s3:::*"],
+                "notresource": ["arn:aws:s3:::prod-?ecret"],
+                "effect": "Allow",
+            }],
+        },
+        "same_policy_order": {
+            "mixed": [
+                {"action": ["s3:PutObject"], "resource": ["*"], "effect": "Allow"},
+                {"action": ["s3:GetObject"], "resource": ["*"], "effect": "Deny"},
+            ],
+        },
+        "notaction": {
+            "allow": [{"notaction": ["s3:Put*"], "resource": ["ARN:AWS:S3:::TEST*"], "effect": "Allow"}],
+        },
+        "deny_only": {
+            "deny": [{"action": ["*"], "resource": ["*"], "effect": "Deny"}],
+        },
+    }
+    resource_arns = [
+        "arn:aws:s3:::testbucket",
+        "arn:aws:s3:::prod-secret",
+        "arn:aws:s3:::prod-public",
+        "arn:aws:s3:::other",
+        "arn:aws:dynamodb:us-east-1:000000000000:table/test",
+    ]
+    for permissions in (["S3:GetObject"], ["S3:PutObject"], ["S3:PutObject", "S3:GetObject"], ["dynamodb:Query"]):
+        evaluator = permission_relationships.PermissionEvaluator(principals, permissions)
+        for resource_arn in resource_arns:
+            expected = [
+                principal_arn for principal_arn, policies in principals.items()
+                if permission_relationships.principal_allowed_on_resource(policies, resource_arn, permissions)
+            ]
+            assert expected == evaluator.get_allowed_principals(resource_arn)
+
+
+@patch.object(permission_relationships, '_EVALUATION_CHUNK_SIZE', 2)
+def test_iter_permission_relationships_with_workers():
+    changed_principals = {
+        "reader": {
+            "allow": [{"action": ["s3:Get*"], "resource": ["arn:aws:s3:::bucket*"], "effect": "Allow"}],
+        },
+    }
+    unchanged_principals = {
+        "writer": {
+            "allow": [{"action": ["s3:*"], "resource": ["*"], "effect": "Allow"}],
+        },
+    }
+    resources = [(f"arn:aws:s3:::bucket{i}", i == 4) for i in range(5)] + [("arn:aws:s3:::other", False)]
+    rules = [["S3:GetObject"], ["S3:PutObject"]]
+    evaluators = [
+        (
+            permission_relationships.PermissionEvaluator(changed_principals, permissions),
+            permission_relationships.PermissionEvaluator(unchanged_principals, permissions),
+        )
+        for permissions in rules
+    ]
+
+    batches = list(permission_relationships.iter_permission_relationships(evaluators, resources, workers=2))
+
+    assert 3 == len(batches)
+    read_mappings = [mapping for rule_mappings in batches for mapping in rule_mappings[0]]
+    write_mappings = [mapping for rule_mappings in batches for mapping in rule_mappings[1]]
+    assert read_mappings == [
+        {"principal_arn": "reader", "resource_arn": f"arn:aws:s3:::bucket{i}"} for i in range(5)
+    ] + [
+        {"principal_arn": "writer", "resource_arn": "arn:aws:s3:::bucket4"},
+    ]
+    assert write_mappings == [{"principal_arn": "writer", "resource_arn": "arn:aws:s3:::bucket4"}]
+
+
+def test_principal_fingerprint():
+    policies = {
+        "allow": [
+            {"action": ["s3:Get*"], "resource": ["*"], "effect": "Allow", "lastupdated": 1},
+            {"action": ["s3:List*"], "resource": ["*"], "effect": "Allow", "lastupdated": 1},
+        ],
+    }
+    same_policies = {
+        "allow": [
+            {"action": ["s3:List*"], "resource": ["*"], "effect": "Allow", "lastupdated": 2},
+            {"action": ["s3:Get*"], "resource": ["*"], "effect": "Allow", "lastupdated": 2},
+        ],
+    }
+    changed_policies = {
+        "allow": [
+            {"action": ["s3:*"], "resource": ["*"], "effect": "Allow", "lastupdated": 2},
+            {"action": ["s3:List*"], "resource": ["*"], "effect": "Allow", "lastupdated": 2},
+        ],
+    }
+    rules = permission_relationships.parse_permission_relationships_file(
+        "cartography/data/permission_relationships.yaml",
+    )
+    rules_fingerprint = permission_relationships.get_rules_fingerprint(rules)
+    fingerprint = permission_relationships.get_principal_fingerprint(policies, rules_fingerprint)
+
+    assert fingerprint == permission_relationships.get_principal_fingerprint(same_policies, rules_fingerprint)
+    assert fingerprint == permission_relationships.get_principal_fingerprint(
+        {"allow": permission_relationships.compile_statement(same_policies["allow"])}, rules_fingerprint,
+    )
+    assert fingerprint != permission_relationships.get_principal_fingerprint(changed_policies, rules_fingerprint)
+    assert fingerprint != permission_relationships.get_principal_fingerprint(
+        policies, permission_relationships.get_rules_fingerprint(rules[:1]),
+    )
@@ -70,3 +70,33 @@ def test_load_tags_empty_data():
 
     # Assert
     mock_neo4j_session.write_transaction.assert_not_called()
+
+
+def test_get_resource_type_from_arn():
+    assert 'ec2:instance' == rgta.get_resource_type_from_arn('arn:aws:ec2:us-east-1:1234:instance/i-abcd')
+    assert 's3' == rgta.get_resource_type_from_arn('arn:aws:s3:::bucket_name')
+    assert 'rds:db' == rgta.get_resource_type_from_arn('arn:aws:rds:us-east-1:1234:db:rds-db-1')
+    assert 'ecs:task-definition' == rgta.get_resource_type_from_arn(
+        'arn:aws:ecs:us-east-1:1234:task-definition/my-task:1',
+    )
+    assert 'elasticloadbalancing:loadbalancer' == rgta.get_resource_type_from_arn(
+        'arn:aws:elasticloadbalancing:us-east-1:1234:loadbalancer/foo',
+    )
+    assert 'elasticloadbalancing:loadbalancer/app' == rgta.get_resource_type_from_arn(
+        'arn:aws:elasticloadbalancing:us-east-1:1234:loadbalancer/app/foo/abdc123',
+    )
+    assert rgta.get_resource_type_from_arn('arn:aws:sns:us-east-1:1234:my-topic') is None
+
+
+def test_partition_tags_by_resource_type():
+    tags_by_resource_type = rgta.partition_tags_by_resource_type(
+        copy.deepcopy(test_data.GET_RESOURCES_RESPONSE),
+    )
+    assert {
+        resource_type: [tag_mapping['ResourceARN'] for tag_mapping in tag_data]
+        for resource_type, tag_data in tags_by_resource_type.items()
+    } == {
+        'ec2:instance': ['arn:aws:ec2:us-east-1:1234:instance/i-01'],
+        's3': ['arn:aws:s3:::bucket-1'],
+        'rds:db': ['arn:aws:rds:us-east-1:1234:db:rds-db-1'],
+    }
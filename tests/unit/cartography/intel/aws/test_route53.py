@@ -0,0 +1,67 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from cartography.intel.aws import route53
+
+
+TEST_UPDATE_TAG = 123456789
+
+
+@patch.object(route53, 'load_graph_data')
+def test_link_aws_resources_joins_on_normalized_names(mock_load_graph_data):
+    neo4j_session = MagicMock()
+    neo4j_session.read_transaction.side_effect = [
+        # AWSDNSRecord: id, name, value
+        [
+            (1, 'www.example.com', 'app.example.com'),
+            (2, 'app.example.com', 'my-elb-123.us-east-1.elb.amazonaws.com'),
+            (3, 'api.example.com', 'ec2-1-2-3-4.compute-1.amazonaws.com.'),
+            (4, 'self.example.com', 'self.example.com'),
+        ],
+        # LoadBalancer
+        [(10, 'My-ELB-123.us-east-1.elb.amazonaws.com')],
+        # LoadBalancerV2
+        [(20, 'unreferenced.elb.amazonaws.com')],
+        # EC2Instance
+        [(30, 'ec2-1-2-3-4.compute-1.amazonaws.com')],
+    ]
+
+    route53.link_aws_resources(neo4j_session, TEST_UPDATE_TAG)
+
+    pairs = mock_load_graph_data.call_args.args[2]
+    assert sorted((pair['source'], pair['target']) for pair in pairs) == [
+        (1, 2),
+        (2, 10),
+        (3, 30),
+    ]
+
+
+@patch.object(route53, 'DNS_RECORD_BATCH_SIZE', 2)
+@patch.object(route53, 'link_aws_resources')
+@patch.object(route53, 'load_a_records')
+@patch.object(route53, 'load_zones')
+def test_load_dns_details_batches_records_across_zones(mock_load_zones, mock_load_a_records, mock_link):
+    def _zone(zone_id):
+        return {
+            'Id': zone_id,
+            'Name': f'{zone_id}.com.',
+            'Config': {'PrivateZone': False},
+            'ResourceRecordSetCount': 1,
+        }
+
+    def _a_record(name):
+        return {'Name': f'{name}.', 'Type': 'A', 'ResourceRecords': [{'Value': '1.2.3.4'}]}
+
+    dns_details = iter([
+        (_zone('a'), iter([_a_record('one.a.com')])),
+        (_zone('b'), iter([_a_record('one.b.com'), _a_record('two.b.com')])),
+    ])
+
+    route53.load_dns_details(MagicMock(), dns_details, '000000000000', TEST_UPDATE_TAG)
+
+    assert [[zone['zoneid'] for zone in call.args[1]] for call in mock_load_zones.call_args_list] == [['a', 'b']]
+    assert [[record['name'] for record in call.args[1]] for call in mock_load_a_records.call_args_list] == [
+        ['one.a.com', 'one.b.com'],
+        ['two.b.com'],
+    ]
+    mock_link.assert_called_once()
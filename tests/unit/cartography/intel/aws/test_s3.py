@@ -0,0 +1,80 @@
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import cartography.intel.aws.s3
+from tests.data.aws.s3 import LIST_BUCKETS
+from tests.data.aws.s3 import LIST_STATEMENTS
+from tests.data.aws.s3 import OPEN_BUCKET_ACLS
+
+
+TEST_ACCOUNT_ID = '000000000000'
+TEST_UPDATE_TAG = 123456789
+
+
+def test_get_s3_bucket_details_reuses_regional_clients():
+    boto3_session = MagicMock()
+    bucket_data = copy.deepcopy(LIST_BUCKETS)
+    bucket_data['Buckets'].append({'Name': 'bucket-4', 'Region': 'eu-west-1'})
+
+    details = list(cartography.intel.aws.s3.get_s3_bucket_details(boto3_session, bucket_data, max_in_flight=2))
+
+    assert [detail[0] for detail in details] == ['bucket-1', 'bucket-2', 'bucket-3', 'bucket-4']
+    # One client per region, even though the eu-west-1 buckets are fetched in different windows
+    assert boto3_session.client.call_count == 3
+
+
+@patch.object(cartography.intel.aws.s3, '_set_default_values')
+@patch.object(cartography.intel.aws.s3, '_run_s3_acl_analysis')
+@patch.object(cartography.intel.aws.s3, 'run_cleanup_job')
+@patch.object(cartography.intel.aws.s3, '_load_parsed_s3_details')
+def test_load_s3_details_in_chunks(mock_load_chunk, mock_cleanup, mock_analysis, mock_set_defaults):
+    neo4j_session = MagicMock()
+    details = [(f'bucket-{i}', None, None, None, None, None) for i in range(5)]
+
+    cartography.intel.aws.s3.load_s3_details(
+        neo4j_session, iter(details), TEST_ACCOUNT_ID, TEST_UPDATE_TAG, chunk_size=2,
+    )
+
+    assert len(mock_load_chunk.call_args_list) == 3
+    # Exposure details are only cleaned up for each chunk's buckets once they have been fetched
+    assert [call.args[2]['BUCKET_NAMES'] for call in mock_cleanup.call_args_list] == [
+        ['bucket-0', 'bucket-1'],
+        ['bucket-2', 'bucket-3'],
+        ['bucket-4'],
+    ]
+    # The ACL analysis covers the whole account, so it must only run once after all chunks are loaded
+    mock_analysis.assert_called_once_with(neo4j_session, TEST_ACCOUNT_ID)
+    mock_set_defaults.assert_called_once_with(neo4j_session, TEST_ACCOUNT_ID)
+
+
+def test_parse_s3_details_in_pool_matches_inline_parsing():
+    s3_details = [
+        (bucket, acl, LIST_STATEMENTS, None, None, None) for bucket, acl in OPEN_BUCKET_ACLS.items()
+    ]
+
+    with patch.object(cartography.intel.aws.s3, 'S3_PARSE_CHUNK_SIZE', 2):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            parsed_in_pool = cartography.intel.aws.s3._parse_s3_details_in_pool(executor, s3_details, TEST_ACCOUNT_ID)
+
+    parsed_inline = cartography.intel.aws.s3.parse_s3_details(s3_details, TEST_ACCOUNT_ID)
+    for policy in parsed_in_pool['policies'] + parsed_inline['policies']:
+        policy['accessible_actions'].sort()
+    assert parsed_in_pool == parsed_inline
+    assert [policy['bucket'] for policy in parsed_inline['policies']] == ['bucket-1', 'bucket-2', 'bucket-3']
+
+
+def test_parse_policy_memoizes_policy_analysis():
+    cartography.intel.aws.s3._get_policy_internet_exposure.cache_clear()
+
+    first = cartography.intel.aws.s3.parse_policy('bucket-1', LIST_STATEMENTS)
+    second = cartography.intel.aws.s3.parse_policy('bucket-2', LIST_STATEMENTS)
+
+    assert cartography.intel.aws.s3._get_policy_internet_exposure.cache_info().hits == 1
+    assert first['bucket'] == 'bucket-1'
+    assert second['bucket'] == 'bucket-2'
+    assert first['internet_accessible'] == second['internet_accessible']
+    assert first['accessible_actions'] == second['accessible_actions']
+    # Each bucket gets its own copy of the memoized actions
+    assert first['accessible_actions'] is not second['accessible_actions']
@@ -1,6 +1,9 @@
+from unittest.mock import patch
+
 import pytest
 
 from cartography.intel.aws.util.common import parse_and_validate_aws_requested_syncs
+from cartography.intel.aws.util.metadata_cache import MetadataCache
 
 
 def test_parse_and_validate_requested_syncs():
@@ -17,3 +20,34 @@ def test_parse_and_validate_requested_syncs():
     absolute_garbage = '#@$@#RDFFHKjsdfkjsd,KDFJHW#@,'
     with pytest.raises(ValueError):
         parse_and_validate_aws_requested_syncs(absolute_garbage)
+
+
+def test_metadata_cache_evicts_least_recently_used(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = MetadataCache(path, max_entries=2)
+    cache.put_many('ec2:image', {'ami-1': {'ImageId': 'ami-1'}})
+    cache.put_many('ec2:image', {'ami-2': {'ImageId': 'ami-2'}})
+    # Reading ami-1 makes ami-2 the least recently used entry
+    assert cache.get_many('ec2:image', ['ami-1']) == {'ami-1': {'ImageId': 'ami-1'}}
+    cache.put_many('ec2:image', {'ami-3': {'ImageId': 'ami-3'}})
+    cache.close()
+
+    # Entries persist across cache instances
+    cache = MetadataCache(path, max_entries=2)
+    assert cache.get_many('ec2:image', ['ami-1', 'ami-2', 'ami-3']) == {
+        'ami-1': {'ImageId': 'ami-1'},
+        'ami-3': {'ImageId': 'ami-3'},
+    }
+    assert cache.get_many('other', ['ami-1']) == {}
+    cache.close()
+
+
+def test_metadata_cache_expires_entries(tmp_path):
+    cache = MetadataCache(str(tmp_path / 'cache.db'), ttl=60)
+    with patch('cartography.intel.aws.util.metadata_cache.time.time', return_value=1000):
+        cache.put_many('ec2:image', {'ami-1': {'ImageId': 'ami-1'}})
+    with patch('cartography.intel.aws.util.metadata_cache.time.time', return_value=1059):
+        assert cache.get_many('ec2:image', ['ami-1']) == {'ami-1': {'ImageId': 'ami-1'}}
+    with patch('cartography.intel.aws.util.metadata_cache.time.time', return_value=1061):
+        assert cache.get_many('ec2:image', ['ami-1']) == {}
+    cache.close()
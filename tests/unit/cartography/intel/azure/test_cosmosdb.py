@@ -0,0 +1,57 @@
+import threading
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from cartography.intel.azure import cosmosdb
+
+
+TEST_UPDATE_TAG = 123456789
+
+
+def _getter(kind, barrier):
+    def get(credentials, subscription_id, database_account):
+        # Every account's fetches must be in flight at the same time to pass the barrier
+        barrier.wait()
+        return [{'id': f"{database_account['id']}/{kind}"}]
+    return get
+
+
+def test_get_database_account_details_fetches_concurrently():
+    accounts = [
+        {'id': 'da1', 'name': 'DA1', 'resourceGroup': 'RG'},
+        {'id': 'da2', 'name': 'DA2', 'resourceGroup': 'RG'},
+    ]
+    barrier = threading.Barrier(8, timeout=5)
+
+    with patch.object(cosmosdb, 'get_sql_databases', _getter('sql', barrier)), \
+            patch.object(cosmosdb, 'get_cassandra_keyspaces', _getter('cassandra', barrier)), \
+            patch.object(cosmosdb, 'get_mongodb_databases', _getter('mongodb', barrier)), \
+            patch.object(cosmosdb, 'get_table_resources', _getter('table', barrier)):
+        details = list(cosmosdb.get_database_account_details(MagicMock(), 'sub', accounts))
+
+    assert details == [
+        (
+            account['id'], account['name'], 'RG', [{'id': f"{account['id']}/sql"}],
+            [{'id': f"{account['id']}/cassandra"}], [{'id': f"{account['id']}/mongodb"}],
+            [{'id': f"{account['id']}/table"}],
+        )
+        for account in accounts
+    ]
+
+
+def test_load_database_account_locations_in_one_query():
+    neo4j_session = MagicMock()
+    accounts = [
+        {'id': 'da1', 'write_locations': [{'id': 'da1-eastus'}, {'id': 'da1-westus'}]},
+        {'id': 'da2', 'write_locations': [{'id': 'da2-eastus'}]},
+        {'id': 'da3'},
+    ]
+
+    cosmosdb._load_database_account_write_locations(neo4j_session, accounts, TEST_UPDATE_TAG)
+
+    neo4j_session.run.assert_called_once()
+    assert neo4j_session.run.call_args.kwargs['write_locations_list'] == [
+        {'id': 'da1-eastus', 'database_account_id': 'da1'},
+        {'id': 'da1-westus', 'database_account_id': 'da1'},
+        {'id': 'da2-eastus', 'database_account_id': 'da2'},
+    ]
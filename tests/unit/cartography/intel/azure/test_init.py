@@ -0,0 +1,31 @@
+import threading
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import cartography.intel.azure
+
+
+TEST_UPDATE_TAG = 123456789
+
+
+@patch.object(cartography.intel.azure.subscription, 'sync')
+@patch.object(cartography.intel.azure, '_sync_one_subscription')
+def test_sync_multiple_subscriptions_concurrently(mock_sync_one_subscription, mock_subscription_sync):
+    barrier = threading.Barrier(2, timeout=5)
+    subscription_ids = {}
+
+    def _sync_one_subscription(neo4j_session, credentials, subscription_id, update_tag, common_job_parameters):
+        # Both subscriptions must be in progress at the same time to pass the barrier
+        barrier.wait()
+        subscription_ids[subscription_id] = common_job_parameters['AZURE_SUBSCRIPTION_ID']
+
+    mock_sync_one_subscription.side_effect = _sync_one_subscription
+    common_job_parameters = {'UPDATE_TAG': TEST_UPDATE_TAG, 'azure_subscription_workers': 2}
+
+    cartography.intel.azure._sync_multiple_subscriptions(
+        MagicMock(), MagicMock(), 'tenant', [{'subscriptionId': 'sub-1'}, {'subscriptionId': 'sub-2'}],
+        TEST_UPDATE_TAG, common_job_parameters,
+    )
+
+    assert subscription_ids == {'sub-1': 'sub-1', 'sub-2': 'sub-2'}
+    assert 'AZURE_SUBSCRIPTION_ID' not in common_job_parameters
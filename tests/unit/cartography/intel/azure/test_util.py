@@ -0,0 +1,37 @@
+import time
+from unittest.mock import MagicMock
+
+from azure.core.credentials import AccessToken
+
+from cartography.intel.azure.util.clients import CachedTokenCredential
+from cartography.intel.azure.util.clients import get_cached_credential
+from cartography.intel.azure.util.clients import get_management_client
+
+
+def test_cached_token_credential_reuses_tokens_until_they_expire():
+    credential = MagicMock()
+    credential.get_token.side_effect = [
+        AccessToken('first', int(time.time()) + 3600),
+        AccessToken('second', int(time.time()) + 60),
+        AccessToken('third', int(time.time()) + 3600),
+    ]
+    cached = CachedTokenCredential(credential)
+
+    assert cached.get_token('https://management.azure.com/.default').token == 'first'
+    assert cached.get_token('https://management.azure.com/.default').token == 'first'
+    assert cached.get_token('https://graph.windows.net/.default').token == 'second'
+    # The second token expires within the refresh margin, so it is acquired again
+    assert cached.get_token('https://graph.windows.net/.default').token == 'third'
+    assert credential.get_token.call_count == 3
+
+
+def test_management_clients_are_shared_per_subscription():
+    credential = MagicMock()
+    client_class = MagicMock()
+
+    assert get_cached_credential(credential) is get_cached_credential(credential)
+    assert get_management_client(client_class, credential, 'sub-1') is get_management_client(
+        client_class, credential, 'sub-1',
+    )
+    get_management_client(client_class, credential, 'sub-2')
+    assert [call.args for call in client_class.call_args_list] == [(credential, 'sub-1'), (credential, 'sub-2')]
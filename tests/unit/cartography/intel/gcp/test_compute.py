@@ -1,3 +1,5 @@
+from unittest.mock import MagicMock
+
 import cartography.intel.gcp.compute
 from tests.data.gcp.compute import LIST_FIREWALLS_RESPONSE
 from tests.data.gcp.compute import VPC_RESPONSE
@@ -63,3 +65,46 @@ def test_transform_gcp_firewall():
     assert sample_fw_icmp_rule['fromport'] is None
     assert sample_fw_icmp_rule['toport'] is None
     assert sample_fw_icmp_rule['protocol'] == 'icmp'
+
+
+def test_get_gcp_instance_responses_splits_aggregated_list_by_zone():
+    """
+    Ensure that get_gcp_instance_responses() pages through instances().aggregatedList() and returns one response object
+    per zone, in the shape that transform_gcp_instances() expects.
+    """
+    pages = [
+        {
+            'items': {
+                'zones/us-east1-b': {'instances': [{'name': 'instance-1'}]},
+                'zones/us-east1-c': {'warning': {'code': 'NO_RESULTS_ON_PAGE'}},
+            },
+        },
+        {
+            'items': {
+                'zones/us-east1-b': {'instances': [{'name': 'instance-2'}]},
+                'zones/europe-west1-d': {'instances': [{'name': 'instance-3'}]},
+            },
+        },
+    ]
+    compute = MagicMock()
+    instances = compute.instances.return_value
+    instances.aggregatedList.return_value.execute.return_value = pages[0]
+    next_request = MagicMock()
+    next_request.execute.return_value = pages[1]
+    instances.aggregatedList_next.side_effect = [next_request, None]
+
+    responses = cartography.intel.gcp.compute.get_gcp_instance_responses('project-abc', compute)
+
+    instances.aggregatedList.assert_called_once_with(project='project-abc')
+    assert responses == [
+        {
+            'id': 'projects/project-abc/zones/us-east1-b/instances',
+            'items': [{'name': 'instance-1'}, {'name': 'instance-2'}],
+        },
+        {
+            'id': 'projects/project-abc/zones/europe-west1-d/instances',
+            'items': [{'name': 'instance-3'}],
+        },
+    ]
+    prefix = cartography.intel.gcp.compute._parse_instance_uri_prefix(responses[1]['id'])
+    assert (prefix.project_id, prefix.zone_name) == ('project-abc', 'europe-west1-d')
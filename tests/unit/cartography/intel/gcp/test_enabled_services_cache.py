@@ -0,0 +1,36 @@
+import time
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from cartography.intel.gcp.util.enabled_services_cache import EnabledServicesCache
+
+
+def test_enabled_services_cache(tmp_path):
+    cache = EnabledServicesCache(str(tmp_path / 'cache.db'), ttl=100)
+    fetch = Mock(side_effect=lambda project_id: {f'{project_id}.googleapis.com'})
+
+    # Not cached yet
+    assert cache.get_enabled_services('project-a', fetch) == {'project-a.googleapis.com'}
+    # Fresh entries skip the call
+    assert cache.get_enabled_services('project-a', fetch) == {'project-a.googleapis.com'}
+    assert fetch.call_count == 1
+    # Empty results are not cached
+    assert cache.get_enabled_services('project-b', Mock(return_value=set())) == set()
+    assert [entry[0] for entry in cache.entries()] == ['project-a']
+
+    # Entries past half of the TTL are returned and refreshed in the background
+    with patch('cartography.intel.gcp.util.enabled_services_cache.time.time', return_value=time.time() + 60):
+        assert cache.get_enabled_services('project-a', Mock(return_value={'new.googleapis.com'})) == {
+            'project-a.googleapis.com',
+        }
+        cache._refresher.shutdown(wait=True)
+    assert cache.get('project-a')[0] == {'new.googleapis.com'}
+
+    # Expired entries are fetched again
+    with patch('cartography.intel.gcp.util.enabled_services_cache.time.time', return_value=time.time() + 1000):
+        assert cache.get_enabled_services('project-a', fetch) == {'project-a.googleapis.com'}
+    assert fetch.call_count == 2
+
+    assert cache.invalidate(['project-a', 'project-c']) == 1
+    assert cache.entries() == []
+    cache.close()
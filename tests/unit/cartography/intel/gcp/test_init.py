@@ -0,0 +1,43 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import cartography.intel.gcp
+
+
+TEST_UPDATE_TAG = 123456789
+
+
+@patch.object(cartography.intel.gcp, '_services_enabled_on_project', return_value={'compute.googleapis.com'})
+@patch.object(cartography.intel.gcp, '_get_serviceusage_resource')
+@patch.object(cartography.intel.gcp.crm, 'sync_gcp_projects')
+def test_sync_multiple_projects_concurrently(mock_sync_projects, mock_serviceusage, mock_enabled_services):
+    calls = []
+
+    def _record(service):
+        def _sync(neo4j_session, resources, project_id, gcp_update_tag, common_job_parameters, enabled_services):
+            neo4j_session.run(f'{service} {project_id}')
+            calls.append((project_id, service))
+        return _sync
+
+    neo4j_session = MagicMock()
+    projects = [{'projectId': f'project-{i}'} for i in range(10)]
+    with patch.multiple(
+        cartography.intel.gcp,
+        _sync_single_project_compute=_record('compute'),
+        _sync_single_project_storage=_record('storage'),
+        _sync_single_project_gke=_record('gke'),
+        _sync_single_project_dns=_record('dns'),
+    ):
+        cartography.intel.gcp._sync_multiple_projects(
+            neo4j_session, MagicMock(), projects, TEST_UPDATE_TAG,
+            {'UPDATE_TAG': TEST_UPDATE_TAG, 'gcp_project_workers': 4},
+        )
+
+    assert neo4j_session.run.call_count == 40
+    for project in projects:
+        assert [service for project_id, service in calls if project_id == project['projectId']] == [
+            'compute', 'storage', 'gke', 'dns',
+        ]
+    # Each worker thread uses its own serviceusage resource, and enabled services are listed once per project
+    assert mock_serviceusage.call_count == 10
+    assert mock_enabled_services.call_count == 10
@@ -1,8 +1,3 @@
-import typing
-from copy import deepcopy
-from datetime import datetime
-from datetime import timedelta
-from datetime import timezone as tz
 from unittest.mock import Mock
 from unittest.mock import patch
 
@@ -12,16 +7,13 @@ from requests.exceptions import HTTPError
 
 from cartography.intel.github.util import _GRAPHQL_RATE_LIMIT_REMAINING_THRESHOLD
 from cartography.intel.github.util import fetch_all
-from cartography.intel.github.util import handle_rate_limit_sleep
-from tests.data.github.rate_limit import RATE_LIMIT_RESPONSE_JSON
+from cartography.intel.github.util import GraphqlRateLimiter
 
 
 @patch('cartography.intel.github.util.time.sleep')
-@patch('cartography.intel.github.util.handle_rate_limit_sleep')
 @patch('cartography.intel.github.util.fetch_page')
 def test_fetch_all_handles_retries(
     mock_fetch_page: Mock,
-    mock_handle_rate_limit_sleep: Mock,
     mock_sleep: Mock,
 ) -> None:
     '''
@@ -37,58 +29,43 @@ def test_fetch_all_handles_retries(
     with pytest.raises(exception) as excinfo:
         fetch_all('my-token', 'my-api_url', 'my-org', 'my-query', 'my-resource', retries=retries)
     # Assert
-    assert mock_handle_rate_limit_sleep.call_count == retries
     assert mock_fetch_page.call_count == retries
     assert 'my-error' in str(excinfo.value)
 
 
-@typing.no_type_check
+def _response(remaining: int, reset: float, cost: int = 1) -> Mock:
+    return Mock(
+        ok=True,
+        headers={'X-RateLimit-Remaining': str(remaining), 'X-RateLimit-Reset': str(reset), 'X-RateLimit-Limit': '5000'},
+        json=Mock(return_value={'data': {'rateLimit': {'cost': cost, 'remaining': remaining}}}),
+    )
+
+
 @patch('cartography.intel.github.util.time.sleep')
-@patch('cartography.intel.github.util.datetime')
-@patch('cartography.intel.github.util.requests.get')
-def test_handle_rate_limit_sleep(
-    mock_requests_get: Mock,
-    mock_datetime: Mock,
-    mock_sleep: Mock,
-) -> None:
+@patch('cartography.intel.github.util.time.time')
+def test_rate_limiter_paces_requests(mock_time: Mock, mock_sleep: Mock) -> None:
     '''
-    Ensure we sleep to avoid the rate limit
+    Ensure that requests are only paced once the budget runs low, and are then spread over the rest of the window
     '''
-    # Arrange
-    mock_datetime.fromtimestamp = datetime.fromtimestamp
-    now = datetime(year=2040, month=1, day=1, hour=19, minute=0, second=0, tzinfo=tz.utc)
-    mock_datetime.now = Mock(return_value=now)
-    reset = (now + timedelta(minutes=47)).timestamp()
-    # sleep for one extra minute for safety
-    expected_sleep_seconds = timedelta(minutes=48).seconds
-
-    # above threshold
-    resp_0 = deepcopy(RATE_LIMIT_RESPONSE_JSON)
-    resp_0['resources']['graphql']['remaining'] = _GRAPHQL_RATE_LIMIT_REMAINING_THRESHOLD + 1
-    resp_0['resources']['graphql']['reset'] = reset
-
-    # below threshold
-    resp_1 = deepcopy(RATE_LIMIT_RESPONSE_JSON)
-    resp_1['resources']['graphql']['remaining'] = _GRAPHQL_RATE_LIMIT_REMAINING_THRESHOLD - 1
-    resp_1['resources']['graphql']['reset'] = reset
+    mock_time.return_value = 1000.0
+    limiter = GraphqlRateLimiter()
 
-    mock_requests_get.side_effect = [
-        Mock(json=Mock(return_value=resp_0)),
-        Mock(json=Mock(return_value=resp_1)),
-    ]
-
-    # Act
-    handle_rate_limit_sleep('my-token')
-    # Assert
-    mock_datetime.now.assert_not_called()
+    # Nothing is known about the budget yet, or most of it remains
+    limiter.wait()
+    limiter.update(_response(4000, 4600))
+    limiter.wait()
     mock_sleep.assert_not_called()
 
-    # reset mocks
-    mock_datetime.reset_mock()
-    mock_sleep.reset_mock()
+    # 1000 points are left for the next 3600 seconds: spacing requests costing 1 point by 3600 / 500 seconds keeps
+    # 500 points in reserve
+    limiter.update(_response(_GRAPHQL_RATE_LIMIT_REMAINING_THRESHOLD + 500, 4600))
+    limiter.wait()
+    limiter.wait()
+    limiter.wait()
+    assert [round(call.args[0], 1) for call in mock_sleep.call_args_list] == [7.2, 14.4]
 
-    # Act
-    handle_rate_limit_sleep('my-token')
-    # Assert
-    mock_datetime.now.assert_called_once_with(tz.utc)
-    mock_sleep.assert_called_once_with(expected_sleep_seconds)
+    # Once the budget is spent, wait until the window resets
+    mock_sleep.reset_mock()
+    limiter.update(_response(_GRAPHQL_RATE_LIMIT_REMAINING_THRESHOLD, 4600))
+    limiter.wait()
+    mock_sleep.assert_called_once_with(3660.0)
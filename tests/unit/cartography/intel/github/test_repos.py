@@ -1,9 +1,19 @@
+import json
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
 
+import cartography.intel.github.repos
+from cartography.intel.github.manifest_cache import ManifestCache
+from cartography.intel.github.repo_state import RepoCursor
+from cartography.intel.github.repo_state import RepoSyncState
 from cartography.intel.github.repos import _get_repo_collaborators_for_multiple_repos
+from cartography.intel.github.repos import get_changed
+from cartography.intel.github.repos import get_manifest_texts
+from cartography.intel.github.repos import transform
+from cartography.intel.github.util import PaginatedGraphqlData
+from tests.data.github.repos import GET_REPOS
 
 
 @patch('time.sleep', return_value=None)
@@ -35,3 +45,190 @@ def test_get_team_users_github_returns_none(mock_backoff_handler, mock_get_team_
     assert mock_sleep.call_count == 4
     assert mock_get_team_collaborators.call_count == 5
     assert mock_backoff_handler.call_count == 4
+
+
+def _repo(name, updated_at, pushed_at):
+    return {'url': f'https://github.com/example_org/{name}', 'updatedAt': updated_at, 'pushedAt': pushed_at}
+
+
+@patch('cartography.intel.github.repos.fetch_all')
+def test_get_changed_stops_at_cursor(mock_fetch_all):
+    pages = {
+        'UPDATED_AT': [
+            [_repo('a', '2024-01-03T00:00:00Z', None), _repo('b', '2024-01-02T00:00:00Z', '2023-01-01T00:00:00Z')],
+            [_repo('c', '2024-01-01T00:00:00Z', '2024-01-05T00:00:00Z')],
+            [_repo('d', '2023-12-01T00:00:00Z', '2023-01-01T00:00:00Z')],
+        ],
+        'PUSHED_AT': [
+            [_repo('c', '2024-01-01T00:00:00Z', '2024-01-05T00:00:00Z'), _repo('e', '2023-01-01T00:00:00Z', None)],
+        ],
+    }
+
+    def _fetch_all(*args, stop_after_page, orderBy, **kwargs):
+        assert orderBy['direction'] == 'DESC'
+        nodes = []
+        for page in pages[orderBy['field']]:
+            nodes.extend(page)
+            if stop_after_page(page):
+                break
+        return PaginatedGraphqlData(nodes=nodes, edges=[]), {'url': 'https://github.com/example_org'}
+
+    mock_fetch_all.side_effect = _fetch_all
+    cursor = RepoCursor('2024-01-01T00:00:00Z', '2024-01-04T00:00:00Z', 0)
+
+    repos, org_url = get_changed('test-token', 'https://api.github.com', 'example_org', cursor)
+
+    # Repos changed in the same second as the cursor are fetched again, and the page past the cursor is not fetched
+    assert [repo['url'].split('/')[-1] for repo in repos] == ['a', 'b', 'c']
+    assert org_url == 'https://github.com/example_org'
+
+
+@patch('cartography.intel.github.repos.run_cleanup_job')
+@patch('cartography.intel.github.repos.touch_unchanged_repos')
+@patch('cartography.intel.github.repos.load')
+@patch('cartography.intel.github.repos._get_repo_collaborators_for_multiple_repos', return_value={})
+@patch('cartography.intel.github.repos.transform')
+@patch('cartography.intel.github.repos.get_changed')
+@patch('cartography.intel.github.repos.get')
+@patch('cartography.intel.github.repos.time.time')
+def test_sync_incrementally_between_full_syncs(
+    mock_time, mock_get, mock_get_changed, mock_transform, mock_collabs, mock_load, mock_touch, mock_cleanup,
+    tmp_path,
+):
+    state = RepoSyncState(str(tmp_path / 'repos.db'))
+    params = {'UPDATE_TAG': 1}
+
+    def _sync(now):
+        mock_time.return_value = now
+        cartography.intel.github.repos.sync(
+            MagicMock(), params, 'test-token', 'https://api.github.com', 'example_org', state, full_sync_interval=100,
+        )
+
+    # The first sync is a full one
+    mock_get.return_value = [
+        _repo('a', '2024-01-02T00:00:00Z', '2024-01-01T00:00:00Z'),
+        _repo('b', '2024-01-01T00:00:00Z', None),
+    ]
+    _sync(1000)
+    assert state.get('example_org') == RepoCursor('2024-01-02T00:00:00Z', '2024-01-01T00:00:00Z', 1000)
+    mock_touch.assert_not_called()
+
+    # Within the interval, only the changed repos are fetched and the others are kept
+    mock_get_changed.return_value = ([_repo('b', '2024-01-01T00:00:00Z', '2024-01-03T00:00:00Z')], 'org-url')
+    _sync(1050)
+    mock_get_changed.assert_called_once_with(
+        'test-token', 'https://api.github.com', 'example_org',
+        RepoCursor('2024-01-02T00:00:00Z', '2024-01-01T00:00:00Z', 1000), True,
+    )
+    mock_touch.assert_called_once_with(mock_load.call_args.args[0], 1, 'org-url')
+    assert state.get('example_org') == RepoCursor('2024-01-02T00:00:00Z', '2024-01-03T00:00:00Z', 1000)
+
+    # Once the interval has elapsed, all repos are fetched again
+    _sync(1100)
+    assert mock_get.call_count == 2
+    assert mock_get_changed.call_count == 1
+    assert mock_touch.call_count == 1
+    assert state.get('example_org').last_full_sync == 1100
+    assert mock_cleanup.call_count == 3
+    state.close()
+
+
+def _repo_with_manifests(name, requirements_oid, setup_cfg_oid=None):
+    repo = GET_REPOS[0]
+    return {
+        **repo,
+        'url': f'https://github.com/example_org/{name}',
+        'requirements': {'id': f'{name}-req', 'oid': requirements_oid},
+        'setupCfg': {'id': f'{name}-cfg', 'oid': setup_cfg_oid} if setup_cfg_oid else None,
+    }
+
+
+@patch('cartography.intel.github.repos.BLOB_TEXTS_BATCH_SIZE', 2)
+@patch('cartography.intel.github.repos.call_github_api')
+def test_get_manifest_texts_downloads_uncached_manifests_once(mock_call_github_api):
+    cache = ManifestCache(':memory:')
+    cache.set('requirements.txt', 'cached', [{'id': 'neo4j', 'name': 'neo4j', 'specifier': None, 'version': None}])
+    repos = [
+        _repo_with_manifests('a', 'shared', 'cfg'),
+        _repo_with_manifests('b', 'shared'),
+        _repo_with_manifests('c', 'cached'),
+        _repo_with_manifests('d', 'other'),
+    ]
+    mock_call_github_api.side_effect = [
+        {'data': {'nodes': [{'text': 'jinja2\n'}, {'text': '[options]\ninstall_requires = lxml\n'}]}},
+        {'data': {'nodes': [None]}},
+    ]
+
+    get_manifest_texts('test-token', 'https://api.github.com', repos, cache)
+
+    # Repos sharing a manifest download it once, and cached manifests are not downloaded
+    assert [json.loads(call.args[1])['ids'] for call in mock_call_github_api.call_args_list] == [
+        ['a-req', 'a-cfg'], ['d-req'],
+    ]
+    assert repos[1]['requirements']['text'] == 'jinja2\n'
+    assert 'text' not in repos[2]['requirements']
+    assert repos[3]['requirements']['text'] is None
+
+    result = transform(repos, {}, {}, cache)
+
+    assert {(req['repo_url'].split('/')[-1], req['id']) for req in result['python_requirements']} == {
+        ('a', 'jinja2'), ('a', 'lxml'), ('b', 'jinja2'), ('c', 'neo4j'),
+    }
+    # Manifests that could not be downloaded are not cached, so that the next sync downloads them again
+    assert cache.get('requirements.txt', 'shared') == [
+        {'id': 'jinja2', 'name': 'jinja2', 'specifier': None, 'version': None},
+    ]
+    assert cache.get('requirements.txt', 'other') is None
+
+
+@patch('cartography.intel.github.repos.call_github_api')
+def test_get_manifest_texts_skips_failed_batches(mock_call_github_api):
+    repos = [_repo_with_manifests('a', 'shared')]
+    mock_call_github_api.return_value = {'errors': [{'message': 'Something went wrong'}], 'data': None}
+
+    get_manifest_texts('test-token', 'https://api.github.com', repos, ManifestCache(':memory:'))
+
+    assert 'text' not in repos[0]['requirements']
+
+
+@pytest.mark.parametrize(
+    'cache_path, query',
+    [
+        (None, cartography.intel.github.repos.GITHUB_ORG_REPOS_PAGINATED_GRAPHQL),
+        ('manifests.db', cartography.intel.github.repos.GITHUB_ORG_REPOS_MANIFEST_OIDS_PAGINATED_GRAPHQL),
+    ],
+)
+@patch('cartography.intel.github.repos.run_cleanup_job')
+@patch('cartography.intel.github.repos.load')
+@patch('cartography.intel.github.repos._get_repo_collaborators_for_multiple_repos', return_value={})
+@patch('cartography.intel.github.repos.get_manifest_texts')
+@patch('cartography.intel.github.repos.fetch_all')
+def test_sync_lists_manifest_texts_without_persistent_cache(
+    mock_fetch_all, mock_get_manifest_texts, mock_collabs, mock_load, mock_cleanup, cache_path, query, tmp_path,
+):
+    cache = ManifestCache(str(tmp_path / cache_path) if cache_path else ':memory:')
+    mock_fetch_all.return_value = (PaginatedGraphqlData(nodes=[], edges=[]), {'url': 'org-url'})
+
+    cartography.intel.github.repos.sync(
+        MagicMock(), {'UPDATE_TAG': 1}, 'test-token', 'https://api.github.com', 'example_org',
+        manifest_cache=cache,
+    )
+
+    # Without a persistent cache, the manifest texts are listed inline instead of being downloaded afterwards
+    assert mock_fetch_all.call_args.args[3] == query
+    cache.close()
+
+
+@patch('cartography.intel.github.repos._parse_python_requirements')
+def test_transform_skips_parsing_cached_manifests(mock_parse):
+    cache = ManifestCache(':memory:')
+    cache.set('requirements.txt', 'cached', [{'id': 'neo4j', 'name': 'neo4j', 'specifier': None, 'version': None}])
+
+    repo = _repo_with_manifests('a', 'cached')
+
+    result = transform([repo], {}, {}, cache)
+
+    mock_parse.assert_not_called()
+    assert result['python_requirements'] == [
+        {'id': 'neo4j', 'name': 'neo4j', 'specifier': None, 'version': None, 'repo_url': repo['url']},
+    ]
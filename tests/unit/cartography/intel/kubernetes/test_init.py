@@ -0,0 +1,65 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+import cartography.intel.kubernetes
+from cartography.intel.kubernetes import KubernetesSyncError
+from cartography.intel.kubernetes import start_k8s_ingestion
+from cartography.intel.kubernetes.util import KubernetesSyncTimeout
+
+
+TEST_UPDATE_TAG = 123456789
+
+
+def _client(name):
+    client = MagicMock()
+    client.name = name
+    return client
+
+
+@patch.object(cartography.intel.kubernetes, 'run_cleanup_job')
+@patch.object(cartography.intel.kubernetes, 'sync_secrets')
+@patch.object(cartography.intel.kubernetes, 'sync_services')
+@patch.object(cartography.intel.kubernetes, 'sync_pods')
+@patch.object(cartography.intel.kubernetes, 'sync_namespaces')
+@patch.object(cartography.intel.kubernetes, 'get_k8s_clients')
+def test_start_k8s_ingestion_isolates_failing_clusters(
+    mock_get_clients, mock_sync_namespaces, mock_sync_pods, mock_sync_services, mock_sync_secrets, mock_cleanup,
+):
+    mock_get_clients.return_value = [_client('a'), _client('b'), _client('c')]
+
+    def _sync_namespaces(session, client, update_tag):
+        if client.name == 'b':
+            raise KubernetesSyncTimeout('Timed out syncing k8s cluster b.')
+        return {'name': client.name}
+
+    mock_sync_namespaces.side_effect = _sync_namespaces
+    config = MagicMock(
+        update_tag=TEST_UPDATE_TAG, k8s_cluster_workers=2, k8s_cluster_timeout=60, k8s_watch_state_path=None,
+    )
+
+    with pytest.raises(KubernetesSyncError, match='Failed to sync 1 of 3 k8s clusters: b'):
+        start_k8s_ingestion(MagicMock(), config)
+
+    assert sorted(call.args[1].name for call in mock_sync_secrets.call_args_list) == ['a', 'c']
+    assert all(client.deadline is not None for client in mock_get_clients.return_value)
+    # The data of the failed cluster must not be cleaned up
+    mock_cleanup.assert_not_called()
+
+
+@patch.object(cartography.intel.kubernetes, 'run_cleanup_job')
+@patch.object(cartography.intel.kubernetes, 'sync_cluster')
+@patch.object(cartography.intel.kubernetes, 'get_k8s_clients')
+def test_start_k8s_ingestion_cleans_up_after_all_clusters(mock_get_clients, mock_sync_cluster, mock_cleanup):
+    mock_get_clients.return_value = [_client('a'), _client('b')]
+    session = MagicMock()
+    config = MagicMock(
+        update_tag=TEST_UPDATE_TAG, k8s_cluster_workers=1, k8s_cluster_timeout=None, k8s_watch_state_path=None,
+    )
+
+    start_k8s_ingestion(session, config)
+
+    assert [call.args[1].name for call in mock_sync_cluster.call_args_list] == ['a', 'b']
+    assert all(call.args[0] is session for call in mock_sync_cluster.call_args_list)
+    mock_cleanup.assert_called_once()
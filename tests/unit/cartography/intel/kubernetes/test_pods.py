@@ -0,0 +1,216 @@
+import copy
+import json
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from unittest.mock import MagicMock
+from unittest.mock import patch
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+import pytest
+from kubernetes.client import ApiClient
+from kubernetes.client import Configuration
+
+from cartography.intel.kubernetes import pods
+from cartography.intel.kubernetes.util import K8sClient
+from cartography.intel.kubernetes.watch_state import WatchState
+
+
+RAW_POD = {
+    "metadata": {
+        "uid": "pod-uid",
+        "name": "my-pod",
+        "namespace": "default",
+        "creationTimestamp": "2021-10-07T04:41:06Z",
+        "labels": {"app": "web"},
+    },
+    "spec": {
+        "nodeName": "my-node",
+        "containers": [
+            {"name": "web", "image": "nginx:1.25"},
+            {"name": "sidecar", "image": "envoy:1.28"},
+        ],
+    },
+    "status": {
+        "phase": "Running",
+        "containerStatuses": [
+            {
+                "name": "web",
+                "imageID": "docker.io/library/nginx@sha256:abc",
+                "ready": True,
+                "started": True,
+                "state": {"running": {"startedAt": "2021-10-07T04:42:06Z"}},
+            },
+            {
+                "name": "sidecar",
+                "imageID": "",
+                "ready": False,
+                "started": False,
+                "state": {"terminated": {"exitCode": 1}},
+            },
+        ],
+    },
+}
+
+
+def test_transform_pod():
+    pod = pods.transform_pod(RAW_POD, {"uid": "cluster-uid"})
+    assert pod["uid"] == "pod-uid"
+    assert pod["status_phase"] == "Running"
+    assert pod["creation_timestamp"] == 1633581666
+    assert pod["deletion_timestamp"] is None
+    assert pod["node"] == "my-node"
+    assert pod["labels"] == {"app": "web"}
+    assert pod["containers"] == [
+        {
+            "name": "web",
+            "image": "nginx:1.25",
+            "uid": "pod-uid-web",
+            "status": {
+                "image_id": "docker.io/library/nginx@sha256:abc",
+                "image_sha": "sha256:abc",
+                "ready": True,
+                "started": True,
+                "state": "running",
+            },
+        },
+        {
+            "name": "sidecar",
+            "image": "envoy:1.28",
+            "uid": "pod-uid-sidecar",
+            "status": {"image_id": "", "image_sha": None, "ready": False, "started": False, "state": "terminated"},
+        },
+    ]
+
+
+@patch.object(pods, "load_pods")
+def test_sync_pods_loads_each_page(mock_load_pods):
+    client = MagicMock()
+    client.core.list_pod_for_all_namespaces.side_effect = [
+        MagicMock(data=json.dumps({"items": [RAW_POD], "metadata": {"continue": "token"}}).encode()),
+        MagicMock(data=json.dumps({"items": [RAW_POD], "metadata": {}}).encode()),
+    ]
+
+    pod_labels = pods.sync_pods(MagicMock(), client, 123, {"uid": "cluster-uid"})
+
+    assert mock_load_pods.call_count == 2
+    assert pod_labels == [{"uid": "pod-uid", "labels": {"app": "web"}}] * 2
+
+
+class FakeApiServer(ThreadingHTTPServer):
+    """
+    Serves the pods of a fake cluster: lists them at the current resourceVersion, and streams the events since a
+    given resourceVersion to watches. Watches from before `oldest_resource_version` fail with 410 Gone.
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeApiHandler)
+        self.pods = {}
+        self.events = []
+        self.resource_version = 1
+        self.oldest_resource_version = 1
+        self.watches = []
+
+    def apply(self, event_type, pod):
+        self.resource_version += 1
+        pod = copy.deepcopy(pod)
+        pod["metadata"]["resourceVersion"] = str(self.resource_version)
+        if event_type == "DELETED":
+            del self.pods[pod["metadata"]["uid"]]
+        else:
+            self.pods[pod["metadata"]["uid"]] = pod
+        self.events.append((self.resource_version, {"type": event_type, "object": pod}))
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        assert url.path == "/api/v1/pods"
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        if query.get("watch", "").lower() != "true":
+            page = {
+                "metadata": {"resourceVersion": str(self.server.resource_version)},
+                "items": list(self.server.pods.values()),
+            }
+            self.wfile.write(json.dumps(page).encode())
+            return
+
+        resource_version = int(query["resourceVersion"])
+        self.server.watches.append(resource_version)
+        if resource_version < self.server.oldest_resource_version:
+            events = [{"type": "ERROR", "object": {"kind": "Status", "code": 410, "message": "too old"}}]
+        else:
+            events = [event for version, event in self.server.events if version > resource_version]
+        for event in events:
+            self.wfile.write(json.dumps(event).encode() + b"\n")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_api_server():
+    server = FakeApiServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _raw_pod(uid, labels):
+    pod = copy.deepcopy(RAW_POD)
+    pod["metadata"]["uid"] = uid
+    pod["metadata"]["labels"] = labels
+    return pod
+
+
+@patch.object(pods, "touch_pods")
+@patch.object(pods, "get_pod_count")
+@patch.object(pods, "load_pods")
+def test_sync_pods_watches_changes(mock_load_pods, mock_get_pod_count, mock_touch_pods, fake_api_server, tmp_path):
+    configuration = Configuration()
+    configuration.host = f"http://127.0.0.1:{fake_api_server.server_port}"
+    client = K8sClient("fake", ApiClient(configuration))
+    watch_state = WatchState(str(tmp_path / "watch.db"))
+    cluster = {"uid": "cluster-uid"}
+
+    def _sync():
+        mock_load_pods.reset_mock()
+        pod_labels = pods.sync_pods(MagicMock(), client, 123, cluster, watch_state, watch_timeout=1)
+        loaded = sorted(pod["uid"] for call in mock_load_pods.call_args_list for pod in call.args[1])
+        return loaded, {pod["uid"]: pod["labels"] for pod in pod_labels}
+
+    # The first sync lists every pod
+    fake_api_server.apply("ADDED", _raw_pod("a", {"app": "web"}))
+    fake_api_server.apply("ADDED", _raw_pod("b", {"app": "db"}))
+    assert _sync() == (["a", "b"], {"a": {"app": "web"}, "b": {"app": "db"}})
+    mock_touch_pods.assert_not_called()
+
+    # The next sync only loads the pods changed since the resourceVersion of that list
+    fake_api_server.apply("MODIFIED", _raw_pod("a", {"app": "api"}))
+    fake_api_server.apply("DELETED", _raw_pod("b", {"app": "db"}))
+    fake_api_server.apply("ADDED", _raw_pod("c", {"app": "cache"}))
+    mock_get_pod_count.return_value = 2
+    assert _sync() == (["a", "c"], {"a": {"app": "api"}, "c": {"app": "cache"}})
+    assert fake_api_server.watches == [3]
+    assert sorted(mock_touch_pods.call_args.args[2]) == ["a", "b", "c"]
+    assert watch_state.get("cluster-uid", "pods") == ("6", {"a": {"app": "api"}, "c": {"app": "cache"}})
+
+    # Once the resourceVersion has expired, the pods are listed again
+    fake_api_server.apply("ADDED", _raw_pod("d", {"app": "queue"}))
+    fake_api_server.oldest_resource_version = 7
+    assert _sync()[0] == ["a", "c", "d"]
+    assert fake_api_server.watches == [3, 6]
+    assert watch_state.get("cluster-uid", "pods")[0] == "7"
+
+    # A graph that does not hold the pods of the watch state is listed again without watching
+    mock_get_pod_count.return_value = 0
+    assert _sync()[0] == ["a", "c", "d"]
+    assert fake_api_server.watches == [3, 6]
+    watch_state.close()
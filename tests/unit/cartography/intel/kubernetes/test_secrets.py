@@ -0,0 +1,51 @@
+import json
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from cartography.intel.kubernetes import secrets
+
+
+def _secret_row(name, secret_type):
+    return {
+        "cells": [name, secret_type, 1, "10d"],
+        "object": {
+            "kind": "PartialObjectMetadata",
+            "apiVersion": "meta.k8s.io/v1",
+            "metadata": {
+                "uid": f"{name}-uid",
+                "name": name,
+                "namespace": "default",
+                "creationTimestamp": "2021-10-07T04:41:06Z",
+                "labels": {"app": name},
+            },
+        },
+    }
+
+
+@patch.object(secrets, "_get_secret_table_api")
+def test_get_secrets_lists_metadata_tables_page_by_page(mock_table_api):
+    columns = [{"name": "Name"}, {"name": "Type"}, {"name": "Data"}, {"name": "Age"}]
+    pages = [
+        {"columnDefinitions": columns, "rows": [_secret_row("a", "Opaque")], "metadata": {"continue": "token"}},
+        {"rows": [_secret_row("b", "kubernetes.io/tls")], "metadata": {}},
+    ]
+    list_secrets = mock_table_api.return_value.list_secret_for_all_namespaces
+    list_secrets.side_effect = [MagicMock(data=json.dumps(page).encode()) for page in pages]
+
+    pages_of_secrets = list(secrets.get_secrets(MagicMock(), {"uid": "cluster-uid"}))
+    assert len(pages_of_secrets) == 2
+    result = [secret for page in pages_of_secrets for secret in page]
+
+    assert [call.kwargs["_continue"] for call in list_secrets.call_args_list] == [None, "token"]
+    assert all(call.kwargs["_preload_content"] is False for call in list_secrets.call_args_list)
+    assert [(secret["name"], secret["type"]) for secret in result] == [("a", "Opaque"), ("b", "kubernetes.io/tls")]
+    assert result[0] == {
+        "uid": "a-uid",
+        "name": "a",
+        "creation_timestamp": 1633581666,
+        "deletion_timestamp": None,
+        "namespace": "default",
+        "cluster_uid": "cluster-uid",
+        "labels": {"app": "a"},
+        "type": "Opaque",
+    }
@@ -0,0 +1,18 @@
+from cartography.intel.kubernetes.services import build_pod_label_index
+from cartography.intel.kubernetes.services import get_selected_pod_ids
+from tests.data.kubernetes.pods import GET_PODS_DATA
+
+
+def test_get_selected_pod_ids():
+    pods = GET_PODS_DATA + [
+        {"uid": "unlabeled-pod", "labels": None},
+        {"uid": "partial-match-pod", "labels": {"key1": "val3"}},
+    ]
+    index = build_pod_label_index(pods)
+
+    assert get_selected_pod_ids({"key1": "val3", "key2": "val4"}, index) == [GET_PODS_DATA[1]["uid"]]
+    assert get_selected_pod_ids({"key1": "val3"}, index) == sorted([GET_PODS_DATA[1]["uid"], "partial-match-pod"])
+    assert get_selected_pod_ids({"key1": "val3", "missing": "label"}, index) == []
+    # Services without a selector don't select any pod
+    assert get_selected_pod_ids({}, index) == []
+    assert get_selected_pod_ids(None, index) == []
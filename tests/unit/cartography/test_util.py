@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 from unittest.mock import Mock
 from unittest.mock import patch
@@ -9,6 +10,7 @@ import cartography.util
 from cartography import util
 from cartography.util import aws_handle_regions
 from cartography.util import batch
+from cartography.util import build_google_api_client
 from cartography.util import run_analysis_and_ensure_deps
 
 
@@ -164,3 +166,18 @@ def test_run_analysis_and_ensure_deps_no_requirements(mock_run_analysis_job: moc
         neo4j_session,
         common_job_parameters,
     )
+
+
+@patch('cartography.util.googleapiclient.discovery.build')
+def test_build_google_api_client_caches_per_thread(mock_build):
+    mock_build.side_effect = lambda *args, **kwargs: Mock()
+    credentials = Mock()
+
+    client = build_google_api_client('compute', 'v1', credentials)
+    assert build_google_api_client('compute', 'v1', credentials) is client
+    assert build_google_api_client('compute', 'v1', Mock()) is not client
+    mock_build.assert_called_with('compute', 'v1', credentials=mock.ANY, cache_discovery=False, static_discovery=True)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(build_google_api_client, 'compute', 'v1', credentials).result() is not client
+    assert mock_build.call_count == 3